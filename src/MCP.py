@@ -28,6 +28,20 @@ _global_server = None
 _global_ui = None
 
 
+def encode_result_response(response):
+    """
+    成功响应按固定格式序列化，result 放在最后，前面带上 result 的字节数：
+    {"jsonrpc": "2.0", "id": <id>, "result_bytes": <n>, "result": <result>}。
+    server.py 据此直接截取 result 的原始 JSON（utils/rpc_response.py），错误响应照常序列化
+    """
+    if "result" not in response:
+        return json.dumps(response)
+    # json.dumps 默认 ensure_ascii，长度即字节数
+    result = json.dumps(response["result"])
+    return '{"jsonrpc": "2.0", "id": %s, "result_bytes": %d, "result": %s}' % (json.dumps(response.get("id")),
+                                                                               len(result), result)
+
+
 class JSONRPCError(Exception):
     def __init__(self, code, message, data=None):
         super(JSONRPCError, self).__init__(message)
@@ -60,7 +74,7 @@ class JSONRPCRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
             request = json.loads(request_data)
             method = request.get("method", "unknown")
             response, method = self._handle_request(request)
-            self._send_json(response, method)
+            self._send_json(encode_result_response(response), method)
         except ValueError:
             self._send_error(-32700, "Invalid JSON")
         except Exception as e:
@@ -90,7 +104,7 @@ class JSONRPCRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
             if not handler:
                 raise JSONRPCError(-32603, "RPC handler not initialized")
 
-            result = handler.handle_request(request["method"], request.get("params", []))
+            result = handler.handle_request(request["method"], request.get("params", []), request.get("fields"))
             response["result"] = result
         except JSONRPCError as e:
             response["error"] = {"code": e.code, "message": e.message}
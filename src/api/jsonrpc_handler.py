@@ -5,6 +5,8 @@ JSON-RPC handler module - processes RPC requests and delegates to business logic
 import traceback
 import inspect
 
+from utils.projection import normalize_fields, project
+
 class JSONRPCError(Exception):
     """Custom JSON-RPC error class"""
     def __init__(self, code, message, data=None):
@@ -15,6 +17,9 @@ class JSONRPCError(Exception):
 
 class JSONRPCHandler(object):
     """Handles JSON-RPC requests and delegates to business logic"""
+
+    # 不打断后台预热的请求（心跳、任务轮询）
+    PASSIVE_METHODS = ("ping", "get_job_status")
     
     def __init__(self, jeb_operations):
         self.jeb_operations = jeb_operations
@@ -27,51 +32,97 @@ class JSONRPCHandler(object):
             "find_field": jeb_operations.find_field,
             "get_app_manifest": jeb_operations.get_app_manifest,
             "get_method_decompiled_code": jeb_operations.get_method_decompiled_code,
+            "get_methods_decompiled_code": jeb_operations.get_methods_decompiled_code,
             "get_class_decompiled_code": jeb_operations.get_class_decompiled_code,
+            "get_decompile_cache_stats": jeb_operations.get_decompile_cache_stats,
+            "export_sources": jeb_operations.export_sources,
+            "get_job_status": jeb_operations.get_job_status,
+            "cancel_job": jeb_operations.cancel_job,
             "get_method_callers": jeb_operations.get_method_callers,
+            "get_method_callees": jeb_operations.get_method_callees,
+            "get_transitive_calls": jeb_operations.get_transitive_calls,
+            "find_call_paths": jeb_operations.find_call_paths,
+            "compute_reachability": jeb_operations.compute_reachability,
+            "get_reachable_classes": jeb_operations.get_reachable_classes,
+            "detect_libraries": jeb_operations.detect_libraries,
+            "add_library_fingerprints": jeb_operations.add_library_fingerprints,
             "get_method_overrides": jeb_operations.get_method_overrides,
+            "find_similar_methods": jeb_operations.find_similar_methods,
             "get_field_callers": jeb_operations.get_field_callers,
+            "get_field_accesses": jeb_operations.get_field_accesses,
             "is_class_renamed": jeb_operations.is_class_renamed,
             "is_method_renamed": jeb_operations.is_method_renamed,
             "is_field_renamed": jeb_operations.is_field_renamed,
             "is_package": jeb_operations.is_package,
+            "list_packages": jeb_operations.list_packages,
             "rename_class_name": jeb_operations.rename_class_name,
             "rename_method_name": jeb_operations.rename_method_name,
             "rename_field_name": jeb_operations.rename_field_name,
             "rename_local_variable": jeb_operations.rename_local_variable,
+            "bulk_rename": jeb_operations.bulk_rename,
+            "replay_rename_journal": jeb_operations.replay_rename_journal,
+            "get_index_info": jeb_operations.get_index_info,
+            "export_index_rows": jeb_operations.export_index_rows,
+            "transfer_renames": jeb_operations.transfer_renames,
             "set_parameter_name": jeb_operations.set_parameter_name,
             "get_current_project_info": jeb_operations.get_current_project_info,
             "get_method_smali": jeb_operations.get_method_smali,
+            "search_strings": jeb_operations.search_strings,
+            "search_constants": jeb_operations.search_constants,
             "get_class_type_tree": jeb_operations.get_class_type_tree,
+            "get_class_subtypes": jeb_operations.get_class_subtypes,
+            "get_class_supertypes": jeb_operations.get_class_supertypes,
             "get_class_superclass": jeb_operations.get_class_superclass,
             "get_class_interfaces": jeb_operations.get_class_interfaces,
             "parse_protobuf_class": jeb_operations.parse_protobuf_class,
+            "extract_all_protos": jeb_operations.extract_all_protos,
             "get_class_methods": jeb_operations.get_class_methods,
             "get_class_fields": jeb_operations.get_class_fields,
+            "get_class_outline": jeb_operations.get_class_outline,
+            "get_class_outlines": jeb_operations.get_class_outlines,
             "load_project": jeb_operations.load_project,
             "has_projects": jeb_operations.has_projects,
             "get_projects": jeb_operations.get_projects,
             "get_class_count": jeb_operations.get_class_count,
             "get_class_by_index": jeb_operations.get_class_by_index,
+            "list_classes": jeb_operations.list_classes,
             "get_live_artifact_ids": jeb_operations.get_live_artifact_ids,
             "switch_active_artifact": jeb_operations.switch_active_artifact,
         }
 
-    def handle_request(self, method, params):
-        """Handle JSON-RPC method calls using direct method mapping"""
+        # 接受 fields 参数的方法只计算被请求的属性
+        self.projecting_methods = set()
+        for name, handler in self.method_handlers.items():
+            code = getattr(handler, "__code__", None)
+            if code is not None and "fields" in code.co_varnames[:code.co_argcount]:
+                self.projecting_methods.add(name)
+
+    def handle_request(self, method, params, fields=None):
+        """
+        Handle JSON-RPC method calls using direct method mapping
+
+        Args:
+            fields: 可选的属性投影，只返回这些属性（见 utils.projection.project）
+        """
         try:
             # 检查方法是否存在
             if method not in self.method_handlers:
                 raise JSONRPCError(-32601, "Method not found: {0}".format(method))
 
+            if method not in self.PASSIVE_METHODS:
+                self.jeb_operations.interrupt_warmup()
+
             # 直接调用方法，使用*params展开参数列表
             handler = self.method_handlers[method]
+            fields = normalize_fields(fields)
             if method == "ping":
                 result = handler(params)
+            elif fields is not None and method in self.projecting_methods:
+                result = handler(*params, fields=fields)
             else:
                 result = handler(*params)
 
-            return result
+            return project(result, fields)
 
         except JSONRPCError:
             # 重新抛出JSON-RPC错误，让上层处理
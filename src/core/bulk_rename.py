@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+"""
+Bulk rename module - validates a batch of renames up front and applies it as one transaction
+"""
+import re
+
+from utils.signature_utils import convert_class_signature
+
+
+KINDS = ("class", "method", "field", "parameter", "local")
+
+IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_$][\w$]*$")
+
+# 反编译文本中方法体作用域内可见的名称：跳过字符串/注释，不含成员访问（a.b）和方法调用（b(...)）
+_LITERAL_OR_COMMENT = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|//[^\n]*|/\*.*?\*/', re.S)
+_SCOPE_NAME = re.compile(r"(?<![\w$.])([A-Za-z_$][\w$]*)(?![\w$])(?!\s*\()")
+
+
+def set_item_name(item, new_name, notify):
+    """重命名类/方法/字段；JEB 版本支持时关闭单项通知，由调用方统一刷新"""
+    if not notify:
+        try:
+            return item.setName(new_name, True, False)
+        except TypeError:
+            pass
+    return item.setName(new_name)
+
+
+def _method_params(method):
+    """'Lcls;->name(II)V' -> '(II)'，用于判断重载冲突"""
+    signature = method.getSignature(True)
+    return signature[signature.index("("):signature.index(")") + 1]
+
+
+class _Op(object):
+    """一条已校验的重命名操作"""
+
+    def __init__(self, position, kind, item, old_name, new_name, index=None):
+        self.position = position
+        self.kind = kind
+        self.item = item
+        self.old_name = old_name
+        self.new_name = new_name
+        self.index = index
+
+
+class BulkRename(object):
+    """
+    Batch of renames checked and applied all-or-nothing.
+
+    check() resolves every entry once and simulates the whole batch on a name
+    index of the touched classes, so conflicts with existing names and with
+    other entries of the batch are reported before anything is changed.
+    Parameter and local names are checked against the method's parameter
+    names and the identifiers in its decompiled body.
+    apply() performs the renames without per-item notifications and, when one
+    of them fails, restores the names already changed in reverse order.
+
+    Entries are dicts with "kind" (class/method/field/parameter/local),
+    "class_signature" and "new_name", plus "name" (method/field name, or the
+    old variable name for locals), "method" (parameter/local) and "index"
+    (parameter). Callers that already hold the class/method/field objects
+    (e.g. transfer_renames) pass them as items, aligned with entries, so
+    overloads are not resolved by name.
+    """
+
+    def __init__(self, dex_unit, entries, items=None):
+        self.dex_unit = dex_unit
+        self.entries = entries
+        self.items = items
+        self.ops = []
+        self.report = [{"entry": i, "status": "pending"} for i in range(len(entries))]
+        self._members = {}
+        self._scopes = {}
+        self._class_names = None
+        self._decompiler = None
+
+    def _fail(self, position, status, error):
+        self.report[position]["status"] = status
+        self.report[position]["error"] = error
+
+    def _member_index(self, clazz):
+        """类成员名称索引：(kind, name, params) -> item，在模拟过程中随操作更新"""
+        key = clazz.getSignature(False)
+        index = self._members.get(key)
+        if index is None:
+            index = {}
+            for method in clazz.getMethods() or []:
+                index[("method", method.getName(True), _method_params(method))] = method
+            for field in clazz.getFields() or []:
+                index[("field", field.getName(True), None)] = field
+            self._members[key] = index
+        return index
+
+    def _find_member(self, clazz, kind, name):
+        items = clazz.getMethods() if kind == "method" else clazz.getFields()
+        for item in items or []:
+            if item.getName(True) == name or item.getName(False) == name:
+                return item
+        return None
+
+    def check(self):
+        """解析并校验所有条目，返回出错条目数"""
+        errors = 0
+        for position, entry in enumerate(self.entries):
+            try:
+                op = self._check_entry(position, entry)
+            except Exception as e:
+                op = None
+                self._fail(position, "invalid", str(e))
+            if op is None:
+                if self.report[position]["status"] == "pending":
+                    self.report[position]["status"] = "unchanged"
+                else:
+                    errors += 1
+                continue
+            self.report[position].update({"kind": op.kind, "old_name": op.old_name, "new_name": op.new_name})
+            self.ops.append(op)
+        return errors
+
+    def _check_entry(self, position, entry):
+        kind = entry.get("kind")
+        if kind not in KINDS:
+            self._fail(position, "invalid", "Unknown kind '%s', expected one of %s" % (kind, ", ".join(KINDS)))
+            return None
+
+        new_name = entry.get("new_name") or ""
+        if kind in ("class", "method", "field"):
+            new_name = new_name.split(".")[-1]
+        if not IDENTIFIER_PATTERN.match(new_name):
+            self._fail(position, "invalid", "Invalid new_name '%s'" % entry.get("new_name"))
+            return None
+
+        item = self.items[position] if self.items is not None else None
+        if item is not None and kind == "class":
+            return self._check_class(position, item, new_name)
+
+        class_signature = entry.get("class_signature") or ""
+        clazz = self.dex_unit.getClass(convert_class_signature(class_signature)) if class_signature else None
+        if clazz is None:
+            self._fail(position, "not_found", "Class not found: %s" % class_signature)
+            return None
+
+        if kind == "class":
+            return self._check_class(position, clazz, new_name)
+        if kind in ("method", "field"):
+            return self._check_member(position, clazz, kind, entry.get("name"), new_name, item)
+
+        method = self._find_member(clazz, "method", entry.get("method"))
+        if method is None:
+            self._fail(position, "not_found", "Method not found: %s" % entry.get("method"))
+            return None
+        if kind == "parameter":
+            index = int(entry.get("index", -1))
+            if index < 0 or index >= len(method.getParameterTypes()):
+                self._fail(position, "invalid", "Parameter index out of range: %d" % index)
+                return None
+            if _parameter_name(method, index) == new_name:
+                return None
+            if not self._claim_variable(position, method, _parameter_name(method, index), new_name):
+                return None
+            return _Op(position, kind, method, None, new_name, index)
+
+        old_name = entry.get("name")
+        if not old_name:
+            self._fail(position, "invalid", "name (the current variable name) is required")
+            return None
+        if old_name == new_name:
+            return None
+        if not self._claim_variable(position, method, old_name, new_name):
+            return None
+        return _Op(position, kind, method, old_name, new_name)
+
+    def _scope(self, method):
+        """
+        方法内已占用的变量名：参数名 + 反编译文本中的局部变量等名称，在模拟过程中随操作更新。
+        方法无法反编译时只包含参数名
+        """
+        key = method.getSignature(False)
+        scope = self._scopes.get(key)
+        if scope is None:
+            scope = set()
+            for index in range(len(method.getParameterTypes())):
+                name = _parameter_name(method, index)
+                if name:
+                    scope.add(name)
+            try:
+                decomp = self._decomp()
+                signature = method.getSignature(True)
+                if decomp.decompileMethod(signature):
+                    text = _LITERAL_OR_COMMENT.sub(" ", decomp.getDecompiledMethodText(signature) or "")
+                    # 跳过方法声明（方法名、修饰符），参数名已在上面加入
+                    scope.update(_SCOPE_NAME.findall(text.split("{", 1)[-1]))
+            except Exception:
+                pass
+            self._scopes[key] = scope
+        return scope
+
+    def _claim_variable(self, position, method, old_name, new_name):
+        """参数/局部变量的新名称与方法内其他变量（含本批次中的改名）冲突时报告 conflict"""
+        scope = self._scope(method)
+        if new_name in scope:
+            self._fail(position, "conflict", "Variable '%s' already exists in %s" % (new_name, method.getSignature(True)))
+            return False
+        scope.discard(old_name)
+        scope.add(new_name)
+        return True
+
+    def _check_class(self, position, clazz, new_name):
+        old_name = clazz.getName(True)
+        if old_name == new_name:
+            return None
+
+        if self._class_names is None:
+            self._class_names = {}
+            for other in self.dex_unit.getClasses():
+                if other is not None:
+                    self._class_names[other.getSignature(True)] = other
+        current = clazz.getSignature(True)
+        path = current[1:-1]
+        package = path.rsplit("/", 1)[0] + "/" if "/" in path else ""
+        outer = path[len(package):].rsplit("$", 1)[0] + "$" if "$" in path[len(package):] else ""
+        target = "L%s%s%s;" % (package, outer, new_name)
+        occupant = self._class_names.get(target)
+        if occupant is not None and occupant.getIndex() != clazz.getIndex():
+            self._fail(position, "conflict", "Class %s already exists" % target)
+            return None
+        self._class_names.pop(current, None)
+        self._class_names[target] = clazz
+        return _Op(position, "class", clazz, old_name, new_name)
+
+    def _check_member(self, position, clazz, kind, name, new_name, item=None):
+        if item is None:
+            item = self._find_member(clazz, kind, name)
+        if item is None:
+            self._fail(position, "not_found", "%s not found: %s" % (kind.capitalize(), name))
+            return None
+        old_name = item.getName(True)
+        if old_name == new_name:
+            return None
+
+        index = self._member_index(clazz)
+        params = _method_params(item) if kind == "method" else None
+        target = (kind, new_name, params)
+        occupant = index.get(target)
+        if occupant is not None and occupant.getIndex() != item.getIndex():
+            self._fail(position, "conflict", "%s '%s' already exists in %s" % (
+                kind.capitalize(), new_name + (params or ""), clazz.getSignature(True)))
+            return None
+        previous = index.get((kind, old_name, params))
+        if previous is not None and previous.getIndex() == item.getIndex():
+            del index[(kind, old_name, params)]
+        index[target] = item
+        return _Op(position, kind, item, old_name, new_name)
+
+    def _decomp(self):
+        if self._decompiler is None:
+            self._decompiler = self.dex_unit.getDecompiler()
+            if not self._decompiler:
+                raise Exception("Cannot acquire decompiler for unit")
+        return self._decompiler
+
+    def _apply_op(self, op, new_name):
+        if op.kind in ("class", "method", "field"):
+            return set_item_name(op.item, new_name, False)
+        if op.kind == "parameter":
+            return op.item.setParameterName(op.index, new_name, True, False)
+        old_name = op.new_name if new_name == op.old_name else op.old_name
+        return self._decomp().setIdentifierName(op.item.getSignature(False), old_name, new_name)
+
+    def apply(self):
+        """
+        按顺序执行已校验的操作，任一失败则逆序恢复已执行的操作
+
+        Returns:
+            bool: 全部成功
+        """
+        applied = []
+        failed = None
+        for op in self.ops:
+            try:
+                if op.kind == "parameter":
+                    op.old_name = _parameter_name(op.item, op.index)
+                ok = self._apply_op(op, op.new_name)
+                error = None if ok else "JEB rejected the new name"
+            except Exception as e:
+                ok, error = False, str(e)
+            if not ok:
+                failed = op
+                self._fail(op.position, "failed", error)
+                break
+            applied.append(op)
+            self.report[op.position]["status"] = "applied"
+
+        if failed is None:
+            return True
+
+        for op in reversed(applied):
+            try:
+                if op.kind == "parameter":
+                    op.item.setParameterName(op.index, op.old_name, False, False)
+                else:
+                    self._apply_op(op, op.old_name)
+                self.report[op.position]["status"] = "rolled_back"
+            except Exception as e:
+                self._fail(op.position, "rollback_failed", str(e))
+        for op in self.ops:
+            if self.report[op.position]["status"] == "pending":
+                self.report[op.position]["status"] = "skipped"
+        return False
+
+    def journal_records(self):
+        """已应用操作的重命名日志记录（按原始签名定位）"""
+        records = []
+        for op in self.ops:
+            if self.report[op.position]["status"] != "applied":
+                continue
+            record = {"kind": op.kind, "target": op.item.getSignature(False), "new_name": op.new_name}
+            if op.kind == "parameter":
+                record["index"] = op.index
+            elif op.kind == "local":
+                record["name"] = op.old_name
+            records.append(record)
+        return records
+
+    def counts(self):
+        result = {}
+        for row in self.report:
+            result[row["status"]] = result.get(row["status"], 0) + 1
+        return result
+
+
+def _parameter_name(method, index):
+    """当前参数名，JEB 版本不提供时返回 None（回滚时恢复为默认名）"""
+    try:
+        return method.getParameterName(index)
+    except Exception:
+        return None
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Call graph module - whole-program call graph built once from invoke-* instructions
+"""
+from array import array
+from collections import deque
+
+from core.index_registry import iter_code_methods, pool_index
+from core.type_hierarchy import split_method_signature
+
+
+class CallGraph(object):
+    """
+    Call graph over DEX method indexes stored as CSR adjacency arrays.
+
+    Node ids are method pool indexes, so they stay valid across renames.
+    invoke-virtual/invoke-interface edges are expanded with class hierarchy
+    analysis: every override declared in a subtype of the referenced class
+    becomes a DISPATCH edge next to the DIRECT edge to the resolved target.
+    """
+
+    NAME = "call_graph"
+
+    EDGE_DIRECT = 0
+    EDGE_DISPATCH = 1
+
+    VIRTUAL_MNEMONICS = ("invoke-virtual", "invoke-interface")
+
+    def __init__(self, node_count):
+        self.node_count = node_count
+        self.edge_count = 0
+        self.out_offsets = array('i', [0] * (node_count + 1))
+        self.out_targets = array('i')
+        self.out_sites = array('i')
+        self.out_kinds = array('b')
+        self.in_offsets = array('i', [0] * (node_count + 1))
+        self.in_sources = array('i')
+        self.in_sites = array('i')
+        self.in_kinds = array('b')
+
+    @classmethod
+    def build(cls, dex_unit, hierarchy):
+        """遍历所有 invoke-* 指令构建调用图，hierarchy 为 TypeHierarchy"""
+        resolver = _DispatchResolver(dex_unit, hierarchy)
+        callers, callees, sites, kinds = array('i'), array('i'), array('i'), array('b')
+
+        for method, instructions in iter_code_methods(dex_unit):
+            caller = method.getIndex()
+            for ins in instructions:
+                if ins is None:
+                    continue
+                mnemonic = ins.getMnemonic()
+                if not mnemonic.startswith("invoke-") or mnemonic.startswith("invoke-custom"):
+                    continue
+                target_index = pool_index(ins)
+                if target_index is None:
+                    continue
+                virtual = mnemonic.split("/")[0] in cls.VIRTUAL_MNEMONICS
+                offset = ins.getOffset()
+                for callee, kind in resolver.targets(target_index, virtual):
+                    callers.append(caller)
+                    callees.append(callee)
+                    sites.append(offset)
+                    kinds.append(kind)
+
+        graph = cls(resolver.node_count)
+        graph.edge_count = len(callers)
+        graph.out_targets, graph.out_sites, graph.out_kinds = graph._fill_csr(
+            graph.out_offsets, callers, callees, sites, kinds)
+        graph.in_sources, graph.in_sites, graph.in_kinds = graph._fill_csr(
+            graph.in_offsets, callees, callers, sites, kinds)
+        return graph
+
+    def _fill_csr(self, offsets, keys, values, sites, kinds):
+        """按 keys 分组写入 CSR 数组，返回 (values, sites, kinds)"""
+        for key in keys:
+            offsets[key + 1] += 1
+        for i in range(self.node_count):
+            offsets[i + 1] += offsets[i]
+
+        edge_count = len(keys)
+        out_values = array('i', [0] * edge_count)
+        out_sites = array('i', [0] * edge_count)
+        out_kinds = array('b', [0] * edge_count)
+        cursor = array('i', offsets[:-1])
+        for i in range(edge_count):
+            key = keys[i]
+            pos = cursor[key]
+            cursor[key] = pos + 1
+            out_values[pos] = values[i]
+            out_sites[pos] = sites[i]
+            out_kinds[pos] = kinds[i]
+        return out_values, out_sites, out_kinds
+
+    def _valid(self, node):
+        return 0 <= node < self.node_count
+
+    def callees(self, node):
+        """返回 [(callee, site_offset, kind)]"""
+        if not self._valid(node):
+            return []
+        start, end = self.out_offsets[node], self.out_offsets[node + 1]
+        return [(self.out_targets[i], self.out_sites[i], self.out_kinds[i]) for i in range(start, end)]
+
+    def callers(self, node):
+        """返回 [(caller, site_offset, kind)]"""
+        if not self._valid(node):
+            return []
+        start, end = self.in_offsets[node], self.in_offsets[node + 1]
+        return [(self.in_sources[i], self.in_sites[i], self.in_kinds[i]) for i in range(start, end)]
+
+    def neighbors(self, node, forward=True):
+        """不带调用点信息的相邻节点（迭代器）"""
+        if not self._valid(node):
+            return
+        if forward:
+            offsets, values = self.out_offsets, self.out_targets
+        else:
+            offsets, values = self.in_offsets, self.in_sources
+        for i in range(offsets[node], offsets[node + 1]):
+            yield values[i]
+
+    def transitive(self, node, forward=True, max_depth=3, max_nodes=500):
+        """
+        广度优先遍历传递调用者/被调用者
+
+        Returns:
+            ([(node, depth, parent)], truncated) 不含起点本身
+        """
+        visited = set([node])
+        result = []
+        queue = deque([(node, 0)])
+        while queue:
+            current, depth = queue.popleft()
+            if depth >= max_depth:
+                continue
+            for nxt in self.neighbors(current, forward):
+                if nxt in visited:
+                    continue
+                visited.add(nxt)
+                result.append((nxt, depth + 1, current))
+                if len(result) >= max_nodes:
+                    return result, True
+                queue.append((nxt, depth + 1))
+        return result, False
+
+
+class _DispatchResolver(object):
+    """基于类层次结构（CHA）把方法引用解析为可能的调用目标"""
+
+    def __init__(self, dex_unit, hierarchy):
+        self.dex_unit = dex_unit
+        self.hierarchy = hierarchy
+        self.node_count = len(dex_unit.getMethods())
+        self._cache = {}
+
+    def targets(self, method_index, virtual):
+        """返回 [(callee, kind)]"""
+        key = (method_index, virtual)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        ref = self.dex_unit.getMethod(method_index)
+        if ref is None:
+            result = []
+        else:
+            class_sig, sub_sig = split_method_signature(ref.getSignature(False))
+            resolved = self.hierarchy.resolve_method(class_sig, sub_sig)
+            direct = resolved if resolved is not None else method_index
+            result = [(direct, CallGraph.EDGE_DIRECT)]
+            if virtual:
+                for override in self.hierarchy.overriding_methods(class_sig, sub_sig):
+                    if override != direct:
+                        result.append((override, CallGraph.EDGE_DISPATCH))
+        self._cache[key] = result
+        return result
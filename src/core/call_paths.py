@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Call path module - finds call chains between two methods on the precomputed call graph
+"""
+
+
+def _expand(graph, frontier, distances, forward):
+    """将 frontier 扩展一层，返回新的 frontier"""
+    next_frontier = []
+    for node in frontier:
+        depth = distances[node] + 1
+        for nxt in graph.neighbors(node, forward):
+            if nxt not in distances:
+                distances[nxt] = depth
+                next_frontier.append(nxt)
+    return next_frontier
+
+
+def _unique_neighbors(graph, node):
+    """去重后的被调用者（同一目标可能有多个调用点）"""
+    seen = set()
+    for nxt in graph.neighbors(node, True):
+        if nxt not in seen:
+            seen.add(nxt)
+            yield nxt
+
+
+def find_call_paths(graph, source, sink, max_depth=6, max_paths=20):
+    """
+    查找 source 到 sink 之间长度不超过 max_depth 的简单调用路径
+
+    从两端交替做广度优先扩展（每次扩展较小的一侧），直到两侧半径之和达到
+    max_depth。满足长度限制的路径上，任一节点要么在正向半径内，要么已知到
+    sink 的距离，据此对深度优先枚举剪枝。路径按长度从短到长返回。
+
+    Returns:
+        (paths, truncated)，paths 为方法索引列表的列表
+    """
+    if source == sink:
+        return [[source]], False
+
+    dist_from_source = {source: 0}
+    dist_to_sink = {sink: 0}
+    forward_frontier, backward_frontier = [source], [sink]
+    forward_radius = backward_radius = 0
+    shortest = None
+
+    while forward_radius + backward_radius < max_depth and forward_frontier and backward_frontier:
+        if len(forward_frontier) <= len(backward_frontier):
+            forward_frontier = _expand(graph, forward_frontier, dist_from_source, True)
+            forward_radius += 1
+            added, other = forward_frontier, dist_to_sink
+        else:
+            backward_frontier = _expand(graph, backward_frontier, dist_to_sink, False)
+            backward_radius += 1
+            added, other = backward_frontier, dist_from_source
+        for node in added:
+            if node in other:
+                length = dist_from_source[node] + dist_to_sink[node]
+                if shortest is None or length < shortest:
+                    shortest = length
+
+    if shortest is None:
+        return [], False
+
+    # 不在反向距离表中的节点到 sink 的距离至少为 backward_radius + 1；
+    # 反向已穷尽时则不可达
+    if backward_frontier:
+        unknown_bound = backward_radius + 1
+    else:
+        unknown_bound = max_depth + 1
+
+    paths = []
+    for length in range(shortest, max_depth + 1):
+        if _enumerate(graph, source, sink, length, dist_to_sink, unknown_bound, max_paths, paths):
+            return paths, True
+    return paths, False
+
+
+def _enumerate(graph, source, sink, length, dist_to_sink, unknown_bound, max_paths, paths):
+    """枚举长度恰为 length 的简单路径，达到 max_paths 时返回 True"""
+    path = [source]
+    on_path = set([source])
+    stack = [_unique_neighbors(graph, source)]
+    while stack:
+        advanced = False
+        for nxt in stack[-1]:
+            if nxt in on_path:
+                continue
+            depth = len(path)
+            if nxt == sink:
+                if depth == length:
+                    paths.append(path + [sink])
+                    if len(paths) >= max_paths:
+                        return True
+                continue
+            if depth + dist_to_sink.get(nxt, unknown_bound) > length:
+                continue
+            path.append(nxt)
+            on_path.add(nxt)
+            stack.append(_unique_neighbors(graph, nxt))
+            advanced = True
+            break
+        if not advanced:
+            stack.pop()
+            on_path.discard(path.pop())
+    return False
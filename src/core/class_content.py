@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""
+Class content module - hashes a class's bytecode and the names it displays, for artifact-independent caching
+"""
+import hashlib
+import threading
+
+from com.pnfsoftware.jeb.core.units.code.android.dex import IDalvikInstruction, IDexValue
+
+
+def _ref_kind(mnemonic):
+    if mnemonic.startswith("const-string"):
+        return "s"
+    if mnemonic.startswith("invoke-") and not mnemonic.startswith("invoke-custom"):
+        return "m"
+    if mnemonic[:4] in ("iget", "iput", "sget", "sput"):
+        return "f"
+    return "t"
+
+
+class ClassContentHash(object):
+    """
+    Content address of a class's decompiled output.
+
+    The digest covers everything the decompiler prints for the class and its
+    nested classes: current names of the class, its members and every type,
+    method and field it references, flags, instructions with resolved
+    operands, switch and array payloads, try/catch ranges, static field
+    values, parameter names, journaled local variable renames, annotations
+    (including the Signature generics and string elements such as Retrofit
+    paths) and debug info (source file, line table, local variable names).
+    It does not depend on the artifact, so an identical class (e.g. the same
+    SDK version) in another APK gets the same digest.
+
+    Digests are kept until the name generation changes.
+    """
+
+    NAME = "class_content"
+
+    def __init__(self, originals):
+        self.nested = {}
+        for signature in originals:
+            position = signature.find("$")
+            while position > 0:
+                self.nested.setdefault(signature[:position] + ";", []).append(signature)
+                position = signature.find("$", position + 1)
+        self.generation = None
+        self._digests = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, dex_unit):
+        return cls([clazz.getSignature(False) for clazz in dex_unit.getClasses() if clazz is not None])
+
+    def digest(self, dex_unit, clazz, generation, local_renames):
+        """
+        Args:
+            local_renames: 原始方法签名 -> [(原变量名, 新变量名)]，来自重命名日志
+
+        Returns:
+            str: 十六进制摘要
+        """
+        class_signature = clazz.getSignature(False)
+        with self._lock:
+            if generation != self.generation:
+                self._digests.clear()
+                self.generation = generation
+            cached = self._digests.get(class_signature)
+        if cached is not None:
+            return cached
+
+        sha = hashlib.sha1()
+        resolver = _Resolver(dex_unit)
+        classes = [clazz] + [dex_unit.getClass(sig) for sig in sorted(self.nested.get(class_signature, ()))]
+        for item in classes:
+            if item is not None:
+                for part in self._class_parts(item, resolver, local_renames):
+                    sha.update(part.encode("utf-8"))
+                    sha.update(b"\x1f")
+        value = sha.hexdigest()
+        with self._lock:
+            if generation == self.generation:
+                self._digests[class_signature] = value
+        return value
+
+    def _class_parts(self, clazz, resolver, local_renames):
+        yield u"class %s %d %s" % (clazz.getSignature(True), clazz.getGenericFlags(),
+                                   clazz.getSupertypeSignature(True))
+        yield u",".join(clazz.getInterfaceSignatures(True) or [])
+        yield u"source %s" % _source_file(clazz, resolver)
+        annotations = _Annotations(clazz, resolver)
+        yield u"@ %s" % annotations.of_class()
+        for field in clazz.getFields() or []:
+            if field is None:
+                continue
+            yield u"field %s %d %s" % (field.getSignature(True), field.getGenericFlags(), _static_value(field))
+            yield u"@ %s" % annotations.of_field(field)
+        for method in clazz.getMethods() or []:
+            if method is None:
+                continue
+            yield u"method %s %d" % (method.getSignature(True), method.getGenericFlags())
+            yield u"@ %s" % annotations.of_method(method)
+            yield u",".join(_parameter_names(method))
+            for original, new_name in local_renames.get(method.getSignature(False), ()):
+                yield u"local %s=%s" % (original, new_name)
+            if not method.isInternal():
+                continue
+            for ins in method.getInstructions() or []:
+                if ins is not None:
+                    yield resolver.instruction(ins)
+            for handler in _exception_items(method, resolver):
+                yield handler
+            for line in _debug_items(method, resolver):
+                yield line
+
+
+class _Resolver(object):
+    """把指令操作数中的常量池索引解析为当前显示名称"""
+
+    def __init__(self, dex_unit):
+        self.dex_unit = dex_unit
+        self._cache = {}
+
+    def pool(self, kind, index):
+        key = (kind, index)
+        if key in self._cache:
+            return self._cache[key]
+        value = None
+        if kind == "s":
+            item = self.dex_unit.getString(index)
+            value = item.getValue() if item else None
+        elif kind == "m":
+            item = self.dex_unit.getMethod(index)
+            value = item.getSignature(True) if item else None
+        elif kind == "f":
+            item = self.dex_unit.getField(index)
+            value = item.getSignature(True) if item else None
+        else:
+            item = self.dex_unit.getType(index)
+            value = item.getSignature(True) if item else None
+        value = u"?" if value is None else value
+        self._cache[key] = value
+        return value
+
+    def instruction(self, ins):
+        mnemonic = ins.getMnemonic()
+        parts = [mnemonic]
+        for operand in ins.getOperands() or []:
+            if operand is None:
+                continue
+            if operand.getType() == IDalvikInstruction.TYPE_IDX:
+                parts.append(self.pool(_ref_kind(mnemonic), operand.getValue()))
+            else:
+                parts.append(u"%d:%d" % (operand.getType(), operand.getValue()))
+        if mnemonic.endswith("switch"):
+            parts.append(_switch_payload(ins))
+        elif mnemonic.startswith("fill-array-data"):
+            parts.append(_array_payload(ins))
+        return u" ".join(parts)
+
+
+def _switch_payload(ins):
+    try:
+        data = ins.getSwitchData()
+        return u",".join(u"%d>%d" % (element[0], element[1]) for element in data.getElements())
+    except Exception:
+        return u""
+
+
+def _array_payload(ins):
+    try:
+        data = ins.getArrayData()
+        return u",".join(u".".join(str(b) for b in element) for element in data.getElements())
+    except Exception:
+        return u""
+
+
+def _static_value(field):
+    try:
+        value = field.getStaticInitializer()
+        return u"" if value is None else u"%s" % value
+    except Exception:
+        return u""
+
+
+def _parameter_names(method):
+    names = []
+    try:
+        for index in range(len(method.getParameterTypes())):
+            names.append(method.getParameterName(index) or u"")
+    except Exception:
+        pass
+    return names
+
+
+def _exception_items(method, resolver):
+    try:
+        items = method.getData().getCodeItem().getExceptionItems()
+    except Exception:
+        return
+    for item in items or []:
+        handlers = []
+        for handler in item.getHandlers() or []:
+            type_index = handler.getTypeIndex()
+            handlers.append(u"%s@%d" % (resolver.pool("t", type_index) if type_index >= 0 else u"*",
+                                        handler.getAddress()))
+        yield u"try %d+%d %s" % (item.getTryAddress(), item.getTryInstructionCount(), u",".join(handlers))
+
+
+class _Annotations(object):
+    """类的注解目录，按成员索引查找；值中的字符串、类型和成员引用解析为当前名称"""
+
+    def __init__(self, clazz, resolver):
+        self.resolver = resolver
+        self.directory = None
+        self.fields = {}
+        self.methods = {}
+        self.parameters = {}
+        # 取不到注解或调试信息时让摘要失败（不使用内容键），而不是算出不含它们的摘要
+        self.directory = clazz.getAnnotationsDirectory()
+        if self.directory is None:
+            return
+        for entry in self.directory.getFieldsAnnotations() or []:
+            self.fields[entry.getFieldIndex()] = entry.getAnnotationItems()
+        for entry in self.directory.getMethodsAnnotations() or []:
+            self.methods[entry.getMethodIndex()] = entry.getAnnotationItems()
+        for entry in self.directory.getParametersAnnotations() or []:
+            self.parameters[entry.getMethodIndex()] = entry.getAnnotationItems()
+
+    def of_class(self):
+        if self.directory is None:
+            return u""
+        return self._items(self.directory.getClassAnnotations())
+
+    def of_field(self, field):
+        return self._items(self.fields.get(field.getIndex()))
+
+    def of_method(self, method):
+        text = self._items(self.methods.get(method.getIndex()))
+        parameters = self.parameters.get(method.getIndex())
+        if parameters:
+            text += u" | " + u";".join(self._items(items) for items in parameters)
+        return text
+
+    def _items(self, items):
+        parts = []
+        for item in items or []:
+            if item is not None:
+                parts.append(u"%d:%s" % (item.getVisibility(), self._annotation(item.getAnnotation())))
+        return u",".join(parts)
+
+    def _annotation(self, annotation):
+        if annotation is None:
+            return u"?"
+        elements = []
+        for element in annotation.getElements() or []:
+            elements.append(u"%s=%s" % (self.resolver.pool("s", element.getNameIndex()),
+                                        self._value(element.getValue())))
+        return u"%s(%s)" % (self.resolver.pool("t", annotation.getTypeIndex()), u",".join(elements))
+
+    def _value(self, value):
+        if value is None:
+            return u"?"
+        kind = value.getType()
+        if kind == IDexValue.VALUE_STRING:
+            return u'"%s"' % self.resolver.pool("s", value.getStringIndex())
+        if kind == IDexValue.VALUE_TYPE:
+            return self.resolver.pool("t", value.getTypeIndex())
+        if kind in (IDexValue.VALUE_FIELD, IDexValue.VALUE_ENUM):
+            index = value.getFieldIndex() if kind == IDexValue.VALUE_FIELD else value.getEnumIndex()
+            return self.resolver.pool("f", index)
+        if kind == IDexValue.VALUE_METHOD:
+            return self.resolver.pool("m", value.getMethodIndex())
+        if kind == IDexValue.VALUE_ARRAY:
+            return u"[%s]" % u",".join(self._value(item) for item in value.getArray() or [])
+        if kind == IDexValue.VALUE_ANNOTATION:
+            return self._annotation(value.getAnnotation())
+        return u"%d:%s" % (kind, value)
+
+
+def _source_file(clazz, resolver):
+    index = clazz.getSourceStringIndex()
+    return resolver.pool("s", index) if index >= 0 else u""
+
+
+def _debug_items(method, resolver):
+    """行号表和调试信息中的局部变量名（反编译器据此命名变量、标注行号）"""
+    info = method.getData().getCodeItem().getDebugInfo()
+    if info is None:
+        return
+    for address, line in enumerate(info.getDebugLines() or []):
+        if line is None:
+            continue
+        variables = []
+        for variable in line.getVariables() or []:
+            name_index = variable.getNameIndex()
+            variables.append(u"v%d=%s:%s" % (variable.getRegister(),
+                                             resolver.pool("s", name_index) if name_index >= 0 else u"",
+                                             resolver.pool("t", variable.getTypeIndex())
+                                             if variable.getTypeIndex() >= 0 else u""))
+        yield u"line %d %d %s" % (address, line.getLineNumber(), u",".join(variables))
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+Class document module - decompiled class text with the span of every method, for slicing out methods
+"""
+import re
+import textwrap
+
+
+_TYPE_HEADER = re.compile(r"\b(?:class|interface|enum)\s+([A-Za-z_$][\w$]*)")
+_ANNOTATION = re.compile(r"@[\w.]+(?:\s*\((?:[^()]|\([^()]*\))*\))?")
+_METHOD_HEADER = re.compile(r"([A-Za-z_$][\w$]*)\s*\(([^)]*)\)")
+
+_PRIMITIVES = {"Z": "boolean", "B": "byte", "C": "char", "S": "short", "I": "int",
+               "J": "long", "F": "float", "D": "double", "V": "void"}
+
+
+class MethodSpan(object):
+    """类型体中一个方法（或静态初始化块）在类文本中的位置"""
+
+    def __init__(self, type_path, start, end, name, params):
+        self.type_path = type_path
+        self.start = start
+        self.end = end
+        self.name = name
+        self.params = params
+
+
+def _skip_literal(text, i):
+    """i 指向注释或字符串/字符字面量的开头时返回其结束位置，否则返回 i"""
+    c = text[i]
+    if c == "/" and text.startswith("//", i):
+        end = text.find("\n", i)
+        return len(text) if end < 0 else end
+    if c == "/" and text.startswith("/*", i):
+        end = text.find("*/", i + 2)
+        return len(text) if end < 0 else end + 2
+    if c in "\"'":
+        j = i + 1
+        while j < len(text) and text[j] != c:
+            j += 2 if text[j] == "\\" else 1
+        return j + 1
+    return i
+
+
+def _param_types(params_text):
+    """'final String s, Map<K, V> m, int... xs' -> ['String', 'Map', 'int[]']"""
+    params, depth, current = [], 0, []
+    for c in params_text:
+        if c == "<":
+            depth += 1
+        elif c == ">":
+            depth -= 1
+        elif c == "," and depth == 0:
+            params.append("".join(current))
+            current = []
+            continue
+        if depth == 0 and c != ">":
+            current.append(c)
+    params.append("".join(current))
+
+    types = []
+    for param in params:
+        param = _ANNOTATION.sub("", param).replace("...", "[] ").strip()
+        if not param:
+            continue
+        tokens = param.replace("[]", " [] ").split()
+        # 去掉参数名和修饰符，保留类型名与数组维度
+        tokens = [t for t in tokens[:-1] if t not in ("final",)]
+        if not tokens:
+            continue
+        base = tokens[0].split(".")[-1]
+        types.append(base + "[]" * tokens.count("[]"))
+    return types
+
+
+def parse_method_spans(text):
+    """
+    扫描反编译出的 Java 文本，返回各类型体中直接声明的方法的 MethodSpan。
+
+    跳过注释和字面量，只在类型体这一层识别成员：以 '{' 结束且头部含 '(' 的成员是方法
+    （构造方法同样处理），'static {' 记为 <clinit>；枚举常量列表和方法体内部（匿名类、lambda）不做解析。
+    """
+    spans = []
+    # 栈元素：["type", 类型路径, 是否处于枚举常量区] 或 ["code", 方法信息或 None]
+    stack = []
+    member_start = 0
+    i = 0
+    n = len(text)
+    while i < n:
+        j = _skip_literal(text, i)
+        if j != i:
+            i = j
+            continue
+        c = text[i]
+        in_type = bool(stack) and stack[-1][0] == "type"
+        if c == "{":
+            if not stack or (in_type and not stack[-1][2]):
+                header = _ANNOTATION.sub("", text[member_start:i])
+                type_match = _TYPE_HEADER.search(header)
+                if type_match and "(" not in header[:type_match.start()]:
+                    parent = stack[-1][1] if stack else ()
+                    is_enum = re.search(r"\benum\b", header[:type_match.end()]) is not None
+                    stack.append(["type", parent + (type_match.group(1),), is_enum])
+                elif stack:
+                    method_match = _METHOD_HEADER.search(header)
+                    # 带初始化表达式的字段（匿名类、lambda）不是方法
+                    if method_match and "=" not in header[:method_match.start()]:
+                        info = (member_start, method_match.group(1), _param_types(method_match.group(2)))
+                    elif re.match(r"\s*static\s*$", header):
+                        info = (member_start, "<clinit>", [])
+                    else:
+                        info = None
+                    stack.append(["code", info, stack[-1][1]])
+                else:
+                    stack.append(["code", None, ()])
+            else:
+                stack.append(["code", None, ()])
+            member_start = i + 1
+        elif c == "}":
+            if stack:
+                entry = stack.pop()
+                if entry[0] == "code" and entry[1] is not None:
+                    start, name, params = entry[1]
+                    spans.append(MethodSpan(entry[2], start, i + 1, name, params))
+            if not stack or stack[-1][0] == "type":
+                member_start = i + 1
+        elif c == ";" and not stack:
+            member_start = i + 1
+        elif c == ";" and in_type:
+            if stack[-1][2]:
+                stack[-1][2] = False
+            else:
+                header = _ANNOTATION.sub("", text[member_start:i])
+                method_match = _METHOD_HEADER.search(header)
+                # 抽象/native 方法：头部含参数列表且不是带初始化表达式的字段
+                if method_match and "=" not in header[:method_match.start()]:
+                    spans.append(MethodSpan(stack[-1][1], member_start, i + 1, method_match.group(1),
+                                            _param_types(method_match.group(2))))
+            member_start = i + 1
+        i += 1
+    return spans
+
+
+def descriptor_simple_types(method_signature):
+    """'Lcom/a/B;->m(ILjava/lang/String;[Lcom/a/B$C;)V' -> ['int', 'String', 'C[]']"""
+    params = method_signature[method_signature.index("(") + 1:method_signature.index(")")]
+    types, i = [], 0
+    while i < len(params):
+        dims = 0
+        while params[i] == "[":
+            dims += 1
+            i += 1
+        if params[i] == "L":
+            end = params.index(";", i)
+            name = re.split(r"[/$]", params[i + 1:end])[-1]
+            i = end + 1
+        else:
+            name = _PRIMITIVES.get(params[i], params[i])
+            i += 1
+        types.append(name + "[]" * dims)
+    return types
+
+
+class ClassDocument(object):
+    """
+    Decompiled text of one class plus its method spans, parsed on first use.
+
+    Methods are located by display name, then by parameter count and simple
+    parameter type names to tell overloads apart. Methods the decompiler
+    does not print on their own (synthetic, lambdas, anonymous classes)
+    are not found, and callers fall back to decompiling the method.
+    """
+
+    MAX_DOCUMENTS = 64
+
+    def __init__(self, class_signature, text):
+        self.class_signature = class_signature
+        self.text = text
+        self._spans = None
+
+    def _type_path(self):
+        name = self.class_signature[1:-1].rsplit("/", 1)[-1]
+        return tuple(name.split("$"))
+
+    def find_span(self, method):
+        if self._spans is None:
+            self._spans = parse_method_spans(self.text)
+        path = self._type_path()
+        own = [span for span in self._spans if span.type_path and path[-len(span.type_path):] == span.type_path]
+
+        name = method.getName(True)
+        if name == "<init>":
+            name = path[-1]
+        candidates = [span for span in own if span.name == name]
+        if len(candidates) > 1:
+            types = descriptor_simple_types(method.getSignature(True))
+            candidates = [span for span in candidates if len(span.params) == len(types)]
+            if len(candidates) > 1:
+                exact = [span for span in candidates if span.params == types]
+                candidates = exact or candidates
+        return candidates[0] if len(candidates) == 1 else None
+
+    def method_text(self, method):
+        """方法源码（去掉类体缩进），找不到时返回 None"""
+        span = self.find_span(method)
+        if span is None:
+            return None
+        start = span.start
+        while start < span.end and self.text[start] in " \t\r\n":
+            start += 1
+        # 方法独占一行时从行首截取，保留首行缩进以便整体去缩进
+        line_start = self.text.rfind("\n", 0, start) + 1
+        if self.text[line_start:start].strip():
+            line_start = start
+        return textwrap.dedent(self.text[line_start:span.end])
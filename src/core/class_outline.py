@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Class outline module - compact class shape (supertypes, member signatures, inner classes) from DEX metadata
+"""
+from com.pnfsoftware.jeb.core.units.code import ICodeItem
+
+
+MAX_OUTLINE_CLASSES = 200
+
+_ACCESS = (
+    (ICodeItem.FLAG_PUBLIC, "public"),
+    (ICodeItem.FLAG_PROTECTED, "protected"),
+    (ICodeItem.FLAG_PRIVATE, "private"),
+    (ICodeItem.FLAG_ABSTRACT, "abstract"),
+    (ICodeItem.FLAG_STATIC, "static"),
+    (ICodeItem.FLAG_FINAL, "final"),
+)
+
+# 按 Java 修饰符的书写顺序输出。Dalvik 访问标志按成员种类复用位：
+# volatile/bridge 同为 0x40，transient/varargs 同为 0x80，因此类、字段、方法各用一张表
+CLASS_MODIFIERS = _ACCESS + (
+    (ICodeItem.FLAG_SYNTHETIC, "synthetic"),
+    (ICodeItem.FLAG_ANNOTATION, "@interface"),
+    (ICodeItem.FLAG_INTERFACE, "interface"),
+    (ICodeItem.FLAG_ENUM, "enum"),
+)
+
+FIELD_MODIFIERS = _ACCESS + (
+    (ICodeItem.FLAG_TRANSIENT, "transient"),
+    (ICodeItem.FLAG_VOLATILE, "volatile"),
+    (ICodeItem.FLAG_SYNTHETIC, "synthetic"),
+    (ICodeItem.FLAG_ENUM, "enum"),
+)
+
+METHOD_MODIFIERS = _ACCESS + (
+    (ICodeItem.FLAG_SYNCHRONIZED, "synchronized"),
+    (ICodeItem.FLAG_NATIVE, "native"),
+    (ICodeItem.FLAG_STRICT, "strictfp"),
+    (ICodeItem.FLAG_SYNTHETIC, "synthetic"),
+    (ICodeItem.FLAG_BRIDGE, "bridge"),
+    (ICodeItem.FLAG_VARARGS, "varargs"),
+)
+
+
+def modifiers(flags, table=CLASS_MODIFIERS):
+    """getGenericFlags() -> 'public static final'，table 按成员种类选择"""
+    return " ".join(name for bit, name in table if flags & bit)
+
+
+def _member(modifier_text, descriptor):
+    return modifier_text + " " + descriptor if modifier_text else descriptor
+
+
+class ClassOutline(object):
+    """
+    Signature-level view of classes, read from DEX metadata without decompiling.
+
+    Members are one line each: fields as '<modifiers> name:Type' and methods as
+    '<modifiers> name(Params)Ret #<instruction count>' (no count for methods
+    without code). Names are current names; inner classes are the directly
+    nested classes, found by original signature prefix.
+    """
+
+    NAME = "class_outline"
+
+    def __init__(self, originals):
+        self.inner = {}
+        for signature in originals:
+            position = signature.rfind("$")
+            if position > 0:
+                self.inner.setdefault(signature[:position] + ";", []).append(signature)
+
+    @classmethod
+    def build(cls, dex_unit):
+        return cls([clazz.getSignature(False) for clazz in dex_unit.getClasses() if clazz is not None])
+
+    def outline(self, dex_unit, clazz):
+        fields = []
+        for field in clazz.getFields() or []:
+            if field is None:
+                continue
+            descriptor = field.getSignature(True).split("->", 1)[-1]
+            fields.append(_member(modifiers(field.getGenericFlags(), FIELD_MODIFIERS), descriptor))
+
+        methods = []
+        for method in clazz.getMethods() or []:
+            if method is None:
+                continue
+            line = _member(modifiers(method.getGenericFlags(), METHOD_MODIFIERS),
+                           method.getSignature(True).split("->", 1)[-1])
+            code = method.getInstructions() if method.isInternal() else None
+            if code:
+                line += " #%d" % len(code)
+            methods.append(line)
+
+        inner = []
+        for original in sorted(self.inner.get(clazz.getSignature(False), ())):
+            nested = dex_unit.getClass(original)
+            inner.append(nested.getSignature(True) if nested is not None else original)
+
+        outline = {
+            "class": clazz.getSignature(True),
+            "modifiers": modifiers(clazz.getGenericFlags(), CLASS_MODIFIERS),
+            "supertype": clazz.getSupertypeSignature(True),
+            "interfaces": list(clazz.getInterfaceSignatures(True) or []),
+            "fields": fields,
+            "methods": methods,
+            "inner_classes": inner,
+        }
+        if clazz.getSignature(False) != clazz.getSignature(True):
+            outline["original_class"] = clazz.getSignature(False)
+        return outline
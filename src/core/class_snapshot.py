@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Class snapshot module - cached class list with filtered, sorted and cursor-paged views
+"""
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+
+
+SORT_KEYS = ("index", "original", "name")
+
+
+class ClassSnapshot(object):
+    """
+    Signatures and flags of every class, read once per name generation.
+
+    A cursor encodes the sort key of the last returned class rather than a
+    position, so paging resumes after that class even when renames or filters
+    shift positions. Class indexes and original signatures never change;
+    with sort="name" a class renamed across the cursor may be skipped or
+    returned twice.
+    """
+
+    NAME = "class_snapshot"
+    MAX_VIEWS = 8
+
+    def __init__(self, classes):
+        self.classes = classes
+        self.indexes = [clazz.getIndex() for clazz in classes]
+        self.original = [clazz.getSignature(False) for clazz in classes]
+        self.current = []
+        self.renamed = []
+        self.generation = None
+        self._views = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, dex_unit):
+        return cls([clazz for clazz in dex_unit.getClasses() if clazz is not None])
+
+    def __len__(self):
+        return len(self.classes)
+
+    def refresh(self, generation):
+        """名称版本变化后重新读取当前签名和重命名标记"""
+        with self._lock:
+            if generation == self.generation:
+                return
+            self.current = [clazz.getSignature(True) for clazz in self.classes]
+            self.renamed = [bool(clazz.isRenamed()) for clazz in self.classes]
+            self.generation = generation
+            self._views.clear()
+
+    def sort_key(self, position, sort):
+        if sort == "index":
+            return self.indexes[position]
+        if sort == "original":
+            return self.original[position]
+        return self.current[position]
+
+    def view(self, package_prefix=None, renamed_only=False, sort="index"):
+        """
+        Returns:
+            ([position], [sort key]) 满足过滤条件、按 sort 排序的类
+        """
+        key = (package_prefix, renamed_only, sort)
+        with self._lock:
+            cached = self._views.get(key)
+            if cached is not None:
+                del self._views[key]
+                self._views[key] = cached
+                return cached
+
+            positions = [i for i in range(len(self.classes))
+                         if (not package_prefix or self.current[i].startswith(package_prefix))
+                         and (not renamed_only or self.renamed[i])]
+            positions.sort(key=lambda i: self.sort_key(i, sort))
+            result = (positions, [self.sort_key(i, sort) for i in positions])
+            self._views[key] = result
+            while len(self._views) > self.MAX_VIEWS:
+                self._views.popitem(last=False)
+            return result
+
+    def entry(self, position):
+        return {
+            "index": self.indexes[position],
+            "signature": self.current[position],
+            "original_signature": self.original[position],
+            "renamed": self.renamed[position],
+        }
+
+
+def encode_cursor(sort, key):
+    return "%s:%s" % (sort, key)
+
+
+def decode_cursor(cursor, sort):
+    """返回游标中的排序键，排序方式不匹配或格式错误时抛出 ValueError"""
+    prefix, _, value = cursor.partition(":")
+    if prefix != sort or not value:
+        raise ValueError("cursor was not issued for sort='%s'" % sort)
+    return int(value) if sort == "index" else value
+
+
+def start_after(keys, key):
+    """排序键列表中第一个大于 key 的位置"""
+    return bisect_right(keys, key)
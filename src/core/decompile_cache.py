@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Decompile cache module - compressed on-disk store of decompiled classes, shared across JEB restarts
+"""
+import hashlib
+import os
+import threading
+import zlib
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".jebmcp", "decompiled")
+DEFAULT_MAX_MB = 512
+
+# 按内容寻址的条目不属于某个 APK，统一放在这个分片目录下
+CONTENT_SHARD = "content"
+
+
+def cache_dir():
+    """缓存目录，可用环境变量 JEBMCP_CACHE_DIR 覆盖"""
+    return os.environ.get("JEBMCP_CACHE_DIR") or DEFAULT_CACHE_DIR
+
+
+def content_key(content_digest):
+    """按类内容摘要（ClassContentHash）寻址的缓存键，跨 artifact 共享"""
+    return (CONTENT_SHARD, content_digest, "")
+
+
+def cache_max_bytes():
+    """缓存容量上限，可用环境变量 JEBMCP_CACHE_MAX_MB 覆盖"""
+    try:
+        return int(os.environ.get("JEBMCP_CACHE_MAX_MB") or DEFAULT_MAX_MB) << 20
+    except ValueError:
+        return DEFAULT_MAX_MB << 20
+
+
+class DecompileCache(object):
+    """
+    Decompiled class text keyed by (APK SHA-256, rename state, class signature),
+    or by content_key() for output shared between artifacts.
+
+    Entries are zlib-compressed files named after the key digest, sharded by
+    APK hash. The file mtime doubles as the LRU clock: hits touch it, and
+    once the store grows past max_bytes the least recently used files are
+    removed until it is back under EVICT_RATIO of the cap. The size index is
+    rebuilt from a directory scan on first use, so the cap holds across
+    restarts.
+    """
+
+    EVICT_RATIO = 0.9
+    LEVEL = 6
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._sizes = None
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        name = hashlib.sha1(u"\x1f".join(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key[0][:16], name + ".z")
+
+    def _load_index(self):
+        if self._sizes is not None:
+            return
+        self._sizes = {}
+        self._total = 0
+        if not os.path.isdir(self.directory):
+            return
+        for root, _, files in os.walk(self.directory):
+            for file_name in files:
+                if not file_name.endswith(".z"):
+                    continue
+                path = os.path.join(root, file_name)
+                try:
+                    size = os.path.getsize(path)
+                except OSError:
+                    continue
+                self._sizes[path] = size
+                self._total += size
+
+    def get(self, key):
+        """命中时返回文本并刷新 mtime，未命中或文件损坏返回 None"""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            text = zlib.decompress(data).decode("utf-8")
+        except (IOError, OSError, zlib.error, UnicodeDecodeError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        self.hits += 1
+        return text
+
+    def put(self, key, text):
+        data = zlib.compress(text.encode("utf-8"), self.LEVEL)
+        path = self._path(key)
+        with self._lock:
+            self._load_index()
+            parent = os.path.dirname(path)
+            if not os.path.isdir(parent):
+                os.makedirs(parent)
+            tmp_path = "%s.%d.tmp" % (path, threading.current_thread().ident or 0)
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            if os.path.exists(path):
+                os.remove(path)
+            os.rename(tmp_path, path)
+            self._total += len(data) - self._sizes.get(path, 0)
+            self._sizes[path] = len(data)
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """按 mtime 从旧到新删除，直到低于容量上限的 EVICT_RATIO"""
+        entries = []
+        for path, size in list(self._sizes.items()):
+            try:
+                entries.append((os.path.getmtime(path), path, size))
+            except OSError:
+                self._total -= size
+                self._sizes.pop(path, None)
+        entries.sort()
+        target = int(self.max_bytes * self.EVICT_RATIO)
+        for _, path, size in entries:
+            if self._total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self._total -= size
+            del self._sizes[path]
+
+    def stats(self):
+        with self._lock:
+            self._load_index()
+            return {
+                "directory": self.directory,
+                "entries": len(self._sizes),
+                "size_bytes": self._total,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
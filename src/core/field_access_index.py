@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Field access index module - maps each field to the methods reading and writing it
+"""
+from core.index_registry import iter_code_methods, pool_index
+
+
+class FieldAccessIndex(object):
+    """One-pass index of iget*/iput*/sget*/sput* instructions keyed by resolved field index"""
+
+    NAME = "field_accesses"
+
+    READ_PREFIXES = ("iget", "sget")
+    WRITE_PREFIXES = ("iput", "sput")
+
+    def __init__(self):
+        # field_index -> [(method_index, offset), ...]
+        self.reads = {}
+        self.writes = {}
+
+    @classmethod
+    def build(cls, dex_unit):
+        """遍历所有字段访问指令，按字段定义归类读写位置"""
+        index = cls()
+        resolver = _FieldResolver(dex_unit)
+        for method, instructions in iter_code_methods(dex_unit):
+            method_index = method.getIndex()
+            for ins in instructions:
+                if ins is None:
+                    continue
+                mnemonic = ins.getMnemonic()
+                prefix = mnemonic[:4]
+                if prefix in cls.READ_PREFIXES:
+                    target = index.reads
+                elif prefix in cls.WRITE_PREFIXES:
+                    target = index.writes
+                else:
+                    continue
+                field_index = pool_index(ins)
+                if field_index is None:
+                    continue
+                field_index = resolver.resolve(field_index)
+                target.setdefault(field_index, []).append((method_index, ins.getOffset()))
+        return index
+
+    def readers(self, field_index):
+        return self.reads.get(field_index, [])
+
+    def writers(self, field_index):
+        return self.writes.get(field_index, [])
+
+
+class _FieldResolver(object):
+    """将通过子类引用的字段（LSub;->f:I）解析到声明它的类"""
+
+    def __init__(self, dex_unit):
+        self.dex_unit = dex_unit
+        self.superclass = {}
+        self.declared = {}
+        self._cache = {}
+        for clazz in dex_unit.getClasses():
+            class_sig = clazz.getSignature(False)
+            self.superclass[class_sig] = clazz.getSupertypeSignature(False)
+            fields = {}
+            for field in clazz.getFields() or []:
+                fields[field.getSignature(False).partition("->")[2]] = field.getIndex()
+            self.declared[class_sig] = fields
+
+    def resolve(self, field_index):
+        cached = self._cache.get(field_index)
+        if cached is not None:
+            return cached
+        resolved = field_index
+        ref = self.dex_unit.getField(field_index)
+        if ref is not None:
+            class_sig, _, sub_sig = ref.getSignature(False).partition("->")
+            while class_sig in self.declared:
+                found = self.declared[class_sig].get(sub_sig)
+                if found is not None:
+                    resolved = found
+                    break
+                class_sig = self.superclass.get(class_sig)
+        self._cache[field_index] = resolved
+        return resolved
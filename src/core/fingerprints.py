@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+Structural fingerprint module - name-independent hashes of classes and methods
+"""
+import hashlib
+
+from com.pnfsoftware.jeb.core.units.code import ICodeItem
+
+from core.index_registry import pool_index
+
+
+# 跨版本/混淆后仍然稳定的方法标志
+STABLE_METHOD_FLAGS = ICodeItem.FLAG_STATIC | ICodeItem.FLAG_ABSTRACT | ICodeItem.FLAG_NATIVE | ICodeItem.FLAG_CONSTRUCTOR
+STABLE_CLASS_FLAGS = ICodeItem.FLAG_INTERFACE | ICodeItem.FLAG_ABSTRACT | ICodeItem.FLAG_ENUM | ICodeItem.FLAG_ANNOTATION
+
+INTERNAL_TYPE = "L?;"
+
+# 指纹算法版本，写入库文件；算法变化后旧库文件的哈希不再可比
+FINGERPRINT_VERSION = 2
+
+# 平台（JDK/Android 框架）类型：不会被打包进 APK 也不会被混淆，保留原名；其余类型一律替换为占位符。
+# 不按“是否在本 DEX 中定义”区分，否则同一个库单独打包与随 App 打包（依赖是否一起打进来）时指纹不同
+PLATFORM_PREFIXES = ("Ljava/", "Ljavax/", "Landroid/", "Ldalvik/", "Lorg/json/", "Lorg/w3c/", "Lorg/xml/",
+                     "Lorg/apache/http/")
+BUNDLED_PREFIXES = ("Landroid/support/", "Landroid/arch/")
+
+
+def is_platform_type(sig):
+    return sig.startswith(PLATFORM_PREFIXES) and not sig.startswith(BUNDLED_PREFIXES)
+
+
+def digest(parts):
+    """稳定的短哈希（跨进程一致，可写入指纹库）"""
+    return hashlib.sha1(u"\x1f".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def normalize_opcode(mnemonic):
+    """去掉寄存器宽度/range 等编码后缀：const/4 -> const，invoke-virtual/range -> invoke-virtual"""
+    return mnemonic.split("/")[0]
+
+
+class _Normalizer(object):
+    """把非平台类型（App 与第三方库）替换为占位符，平台（框架/JDK）类型保留原名"""
+
+    def __init__(self):
+        self._masked = {}
+
+    def masked(self, sig):
+        value = self._masked.get(sig)
+        if value is None:
+            value = self._masked[sig] = sig.startswith("L") and not is_platform_type(sig)
+        return value
+
+    def type(self, sig):
+        if not sig:
+            return ""
+        dims = len(sig) - len(sig.lstrip("["))
+        base = sig[dims:]
+        if self.masked(base):
+            base = INTERNAL_TYPE
+        return "[" * dims + base
+
+    def proto(self, method_signature):
+        """'Lcls;->name(Lcom/a;I)V' -> '(L?;I)V'"""
+        proto = method_signature[method_signature.index("("):]
+        params, ret = proto[1:].split(")", 1)
+        types, i = [], 0
+        while i < len(params):
+            j = i
+            while params[j] == "[":
+                j += 1
+            if params[j] == "L":
+                j = params.index(";", j)
+            types.append(self.type(params[i:j + 1]))
+            i = j + 1
+        return "(%s)%s" % ("".join(types), self.type(ret))
+
+    def member_ref(self, signature):
+        """平台成员引用保留完整签名，其余引用只保留形状"""
+        owner, rest = signature.split("->", 1)
+        if not self.masked(owner):
+            return signature
+        if "(" in rest:
+            return INTERNAL_TYPE + "->" + self.proto(signature)
+        return INTERNAL_TYPE + "->:" + self.type(rest.split(":", 1)[1])
+
+
+class StructuralFingerprints(object):
+    """
+    Name-independent fingerprints of every internal class and method.
+
+    Every non-platform type (app and bundled library code, whether or not it
+    is defined in this DEX) is replaced by a placeholder while platform
+    types, string constants, platform API calls and opcode sequences are
+    kept, so the hashes survive renaming and re-obfuscation and a library
+    hashes the same alone and bundled with different dependencies. Each
+    item has a strict hash (all features) and a loose hash (shape only) for
+    a second matching tier.
+    """
+
+    NAME = "structural_fingerprints"
+
+    def __init__(self):
+        self.method_class = {}
+        self.method_strict = {}
+        self.method_loose = {}
+        self.method_size = {}
+        self.class_strict = {}
+        self.class_loose = {}
+        self.class_methods = {}
+        self.class_fields = {}
+
+    @classmethod
+    def build(cls, dex_unit):
+        fp = cls()
+        classes = [clazz for clazz in dex_unit.getClasses() if clazz is not None]
+        norm = _Normalizer()
+        refs = _RefCache(dex_unit, norm)
+
+        for clazz in classes:
+            class_sig = clazz.getSignature(False)
+            strict_hashes, loose_hashes, indexes = [], [], []
+            for method in clazz.getMethods() or []:
+                if method is None:
+                    continue
+                index = method.getIndex()
+                strict, loose, size = fp._method_hashes(method, norm, refs)
+                fp.method_class[index] = class_sig
+                fp.method_strict[index] = strict
+                fp.method_loose[index] = loose
+                fp.method_size[index] = size
+                strict_hashes.append(strict)
+                loose_hashes.append(loose)
+                indexes.append(index)
+
+            fields = []
+            for field in clazz.getFields() or []:
+                if field is None:
+                    continue
+                field_type = norm.type(field.getSignature(False).split(":", 1)[1])
+                flags = field.getGenericFlags() & ICodeItem.FLAG_STATIC
+                fields.append((field.getIndex(), field_type, flags))
+
+            # 层次位置只取平台父类/接口名；继承深度取决于哪些父类被一起打包，不参与哈希
+            shape = [
+                str(clazz.getGenericFlags() & STABLE_CLASS_FLAGS),
+                norm.type(clazz.getSupertypeSignature(False)),
+                ",".join(sorted(norm.type(sig) for sig in clazz.getInterfaceSignatures(False) or [])),
+            ]
+            field_types = ",".join(sorted("%s:%d" % (t, f) for _, t, f in fields))
+            fp.class_strict[class_sig] = digest(shape + [field_types] + sorted(strict_hashes))
+            fp.class_loose[class_sig] = digest(shape + [str(len(fields))] + sorted(loose_hashes))
+            fp.class_methods[class_sig] = indexes
+            fp.class_fields[class_sig] = fields
+        return fp
+
+    def _method_hashes(self, method, norm, refs):
+        signature = method.getSignature(False)
+        head = [str(method.getGenericFlags() & STABLE_METHOD_FLAGS), norm.proto(signature)]
+        opcodes, strings, refs_used = [], [], []
+        for ins in (method.getInstructions() if method.isInternal() else None) or []:
+            if ins is None:
+                continue
+            mnemonic = ins.getMnemonic()
+            opcodes.append(normalize_opcode(mnemonic))
+            ref = refs.resolve(mnemonic, ins)
+            if ref is None:
+                continue
+            if mnemonic.startswith("const-string"):
+                strings.append(ref)
+            else:
+                refs_used.append(ref)
+        opcode_text = " ".join(opcodes)
+        strict = digest(head + [opcode_text, u"\x1e".join(sorted(strings)), u"\x1e".join(refs_used)])
+        loose = digest(head + [opcode_text])
+        return strict, loose, len(opcodes)
+
+
+class _RefCache(object):
+    """常量池引用的规范化结果缓存（字符串、方法/字段引用、类型）"""
+
+    def __init__(self, dex_unit, norm):
+        self.dex_unit = dex_unit
+        self.norm = norm
+        self._cache = {}
+
+    def resolve(self, mnemonic, ins):
+        if mnemonic.startswith("const-string"):
+            kind = "s"
+        elif mnemonic.startswith("invoke-") and not mnemonic.startswith("invoke-custom"):
+            kind = "m"
+        elif mnemonic[:4] in ("iget", "iput", "sget", "sput"):
+            kind = "f"
+        elif mnemonic.startswith(("const-class", "new-instance", "check-cast", "instance-of", "new-array")):
+            kind = "t"
+        else:
+            return None
+        index = pool_index(ins)
+        if index is None:
+            return None
+        key = (kind, index)
+        if key in self._cache:
+            return self._cache[key]
+
+        value = None
+        if kind == "s":
+            item = self.dex_unit.getString(index)
+            value = item.getValue() if item else None
+        elif kind == "m":
+            item = self.dex_unit.getMethod(index)
+            value = self.norm.member_ref(item.getSignature(False)) if item else None
+        elif kind == "f":
+            item = self.dex_unit.getField(index)
+            value = self.norm.member_ref(item.getSignature(False)) if item else None
+        else:
+            item = self.dex_unit.getType(index)
+            value = self.norm.type(item.getSignature(False)) if item else None
+        self._cache[key] = value
+        return value
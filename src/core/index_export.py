@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Index export module - flattens symbols and bytecode indexes into rows for the server-side index store
+"""
+
+
+# 行格式变化时递增，服务端据此丢弃旧的持久化索引
+SCHEMA_VERSION = 1
+
+# 依赖当前名称的种类，重命名状态变化后需要重新导出
+NAME_KINDS = ("classes", "methods", "fields")
+INDEX_KINDS = ("calls", "field_accesses", "strings", "constants")
+KINDS = NAME_KINDS + INDEX_KINDS
+
+MAX_EXPORT_ROWS = 20000
+
+
+def symbol_rows(items):
+    """[index, 原始签名, 当前签名]"""
+    rows = []
+    for item in items or []:
+        if item is not None:
+            rows.append([item.getIndex(), item.getSignature(False), item.getSignature(True)])
+    return rows
+
+
+def call_rows(graph):
+    """[caller, callee, offset, kind]，kind 为 CallGraph.EDGE_*"""
+    rows = []
+    for caller in range(graph.node_count):
+        for callee, offset, kind in graph.callees(caller):
+            rows.append([caller, callee, offset, kind])
+    return rows
+
+
+def field_access_rows(index):
+    """[field, method, offset, write]"""
+    rows = []
+    for write, accesses in ((0, index.reads), (1, index.writes)):
+        for field_index, refs in accesses.items():
+            for method_index, offset in refs:
+                rows.append([field_index, method_index, offset, write])
+    return rows
+
+
+def literal_rows(literals):
+    """[value, method, offset]"""
+    rows = []
+    for value, refs in literals.items():
+        for method_index, offset in refs:
+            rows.append([value, method_index, offset])
+    return rows
+
+
+class IndexExport(object):
+    """
+    Rows of one export kind, built once per export and served page by page.
+
+    The rows are dropped once the last page has been served, so the exported
+    copies of the call graph, field-access and literal indexes do not stay in
+    memory after sync_index_store. Name kinds are also rebuilt when the name
+    generation changes.
+    """
+
+    def __init__(self, kind, rows, generation=None):
+        self.kind = kind
+        self.rows = rows
+        self.generation = generation
+
+    def page(self, offset, limit):
+        offset = max(int(offset or 0), 0)
+        limit = max(1, min(int(limit or MAX_EXPORT_ROWS), MAX_EXPORT_ROWS))
+        rows = self.rows[offset:offset + limit]
+        return rows, {
+            "total": len(self.rows),
+            "offset": offset,
+            "limit": limit,
+            "has_more": offset + len(rows) < len(self.rows),
+        }
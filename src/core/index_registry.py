@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Index registry module - caches per-artifact indexes built from DEX bytecode
+"""
+import threading
+import time
+
+from com.pnfsoftware.jeb.core.events import J
+from com.pnfsoftware.jeb.core.units.code.android.dex import IDalvikInstruction
+from com.pnfsoftware.jeb.util.events import IEventListener
+
+
+def iter_code_methods(dex_unit):
+    """遍历 DEX 中所有带字节码的内部方法，返回 (method, instructions)"""
+    for method in dex_unit.getMethods():
+        if method is None or not method.isInternal():
+            continue
+        instructions = method.getInstructions()
+        if not instructions:
+            continue
+        yield method, instructions
+
+
+def pool_index(ins):
+    """返回指令中常量池索引操作数（string/type/field/method）的值，没有则返回 None"""
+    for operand in ins.getOperands() or []:
+        if operand is not None and operand.getType() == IDalvikInstruction.TYPE_IDX:
+            return operand.getValue()
+    return None
+
+
+class _UnitChangeListener(IEventListener):
+    """监听 DEX unit 的变更事件（重命名等），递增该 unit 的名称版本号"""
+
+    def __init__(self, registry, unit_key):
+        self.registry = registry
+        self.unit_key = unit_key
+
+    def onEvent(self, e):
+        if e.getType() == J.UnitChange:
+            self.registry._bump(self.unit_key)
+
+
+class IndexRegistry(object):
+    """
+    Builds each index once per artifact and keeps it until invalidated.
+
+    The registry lock only guards the dicts. Builds run under a per-key lock,
+    so concurrent requests for one index wait for a single build while other
+    indexes and generation() stay available.
+    """
+
+    def __init__(self):
+        self._indexes = {}
+        self._build_times = {}
+        self._generations = {}
+        self._listeners = {}
+        # (unit, 索引名) -> 构建锁 / 失效次数（构建期间被 invalidate 的结果不发布）
+        self._build_locks = {}
+        self._epochs = {}
+        self._lock = threading.RLock()
+
+    def _unit_key(self, dex_unit):
+        return dex_unit.getUid()
+
+    def _bump(self, unit_key):
+        with self._lock:
+            self._generations[unit_key] = self._generations.get(unit_key, 0) + 1
+
+    def generation(self, dex_unit):
+        """
+        当前名称版本号：unit 发生重命名等变更后递增，
+        依赖显示名称的缓存（格式化输出等）据此判断是否失效
+        """
+        unit_key = self._unit_key(dex_unit)
+        with self._lock:
+            if unit_key not in self._listeners:
+                listener = _UnitChangeListener(self, unit_key)
+                dex_unit.addListener(listener)
+                self._listeners[unit_key] = listener
+            return self._generations.get(unit_key, 0)
+
+    def bump_generation(self, dex_unit):
+        """主动递增名称版本号（本插件执行重命名后调用）"""
+        self._bump(self._unit_key(dex_unit))
+
+    def get(self, dex_unit, name, factory):
+        """获取索引，不存在时调用 factory(dex_unit) 构建"""
+        key = (self._unit_key(dex_unit), name)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                return index
+            build_lock = self._build_locks.get(key)
+            if build_lock is None:
+                build_lock = self._build_locks[key] = threading.Lock()
+
+        with build_lock:
+            with self._lock:
+                index = self._indexes.get(key)
+                if index is not None:
+                    return index
+                epoch = self._epochs.get(key, 0)
+            start = time.time()
+            index = factory(dex_unit)
+            with self._lock:
+                if self._epochs.get(key, 0) == epoch:
+                    self._build_times[key] = int((time.time() - start) * 1000)
+                    self._indexes[key] = index
+            return index
+
+    def build_time_ms(self, dex_unit, name):
+        """返回索引的构建耗时（毫秒），未构建时返回 None"""
+        return self._build_times.get((self._unit_key(dex_unit), name))
+
+    def invalidate(self, dex_unit=None, name=None):
+        """丢弃缓存的索引，可按 artifact 和索引名过滤"""
+        with self._lock:
+            unit_key = self._unit_key(dex_unit) if dex_unit is not None else None
+            for key in set(self._indexes) | set(self._build_locks):
+                if unit_key is not None and key[0] != unit_key:
+                    continue
+                if name is not None and key[1] != name:
+                    continue
+                self._indexes.pop(key, None)
+                self._build_times.pop(key, None)
+                self._epochs[key] = self._epochs.get(key, 0) + 1
@@ -4,11 +4,13 @@ JEB operations module - handles all business logic for APK/DEX operations
 """
 import hashlib
 import json
+import re
+import threading
 from com.pnfsoftware.jeb.core.units.code import ICodeItem
 from com.pnfsoftware.jeb.core.units.code.android import IApkUnit, IDexUnit
 from com.pnfsoftware.jeb.core.util import DecompilerHelper
 from com.pnfsoftware.jeb.core.output.text import TextDocumentUtil
-from com.pnfsoftware.jeb.core.actions import ActionXrefsData, Actions, ActionContext, ActionOverridesData
+from com.pnfsoftware.jeb.core.actions import ActionXrefsData, Actions, ActionContext
 
 # Import signature utilities using absolute path for JEB compatibility
 import sys
@@ -21,14 +23,55 @@ src_dir = os.path.dirname(current_dir)
 if src_dir not in sys.path:
     sys.path.insert(0, src_dir)
 
-from utils.signature_utils import convert_class_signature
+from utils.signature_utils import convert_class_signature, convert_package_prefix
 from utils.protoParser import ProtoParser
+from utils.paging import paginate
+from utils.projection import select, record_fields
+from core.index_registry import IndexRegistry
+from core.literal_index import LiteralIndex
+from core.type_hierarchy import TypeHierarchy, split_method_signature
+from core.call_graph import CallGraph
+from core.call_paths import find_call_paths
+from core.reachability import Reachability
+from core.field_access_index import FieldAccessIndex
+from core.smali_export import SmaliCache, instruction_row, STRUCTURED_COLUMNS
+from core.jobs import JobManager
+from core.source_export import SourceExportJob
+from core.proto_export import ProtoExtractJob, DEFAULT_MESSAGE_BASE
+from core.package_tree import PackageTree, format_package_node
+from core.bulk_rename import BulkRename
+from core.rename_journal import RenameJournal, journal_dir, replay_records
+from core.fingerprints import StructuralFingerprints
+from core.version_match import VersionMatch
+from core.similarity_index import SimilarityIndex, MIN_OPCODES
+from core.library_db import LibraryDatabase, LibraryTags, library_dir, LIBRARY_NAME_PATTERN
+from core.decompile_cache import DecompileCache, cache_dir, cache_max_bytes, content_key
+from core.class_content import ClassContentHash
+from core.index_export import (IndexExport, KINDS as EXPORT_KINDS, NAME_KINDS, SCHEMA_VERSION,
+                               symbol_rows, call_rows, field_access_rows, literal_rows)
+from core.warmup import WarmupJob, warmup_classes
+from core.class_document import ClassDocument
+from core.class_outline import ClassOutline, MAX_OUTLINE_CLASSES
+from core.class_snapshot import ClassSnapshot, SORT_KEYS, encode_cursor, decode_cursor, start_after
 class JebOperations(object):
     """Handles all JEB-specific operations for APK/DEX analysis"""
     
     def __init__(self, project_manager, ctx=None):
         self.project_manager = project_manager
         self.ctx = ctx
+        self.index_registry = IndexRegistry()
+        self.smali_cache = SmaliCache()
+        self.class_documents = SmaliCache(ClassDocument.MAX_DOCUMENTS)
+        self.job_manager = JobManager()
+        # 所有重命名路径（单项、批量、迁移、日志重放）共用，批量操作的检查与执行之间不会插入其他重命名
+        self.rename_lock = threading.RLock()
+        self.rename_journals = {}
+        self.decompile_cache = DecompileCache(cache_dir(), cache_max_bytes())
+        self._synced_generations = {}
+        self._local_renames = {}
+        # 因 unit 与重命名日志不一致而未使用 APK 键的缓存查询次数
+        self._apk_key_skipped = 0
+        self._warmup_job = None
 
     def _extract_last_segment(self, new_name):
         if "." in new_name:
@@ -40,13 +83,17 @@ class JebOperations(object):
         apk_unit, err = self.project_manager.get_current_apk_unit()
         if err: return err
         
+        text = self._manifest_text(apk_unit)
+        if text is None:
+            return {"success": False, "error": "No manifest found in the APK unit"}
+        return {"success": True, "manifest": text}
+
+    def _manifest_text(self, apk_unit):
         man = apk_unit.getManifest()
         if man is None:
-            return {"success": False, "error": "No manifest found in the APK unit"}
-        
+            return None
         doc = man.getFormatter().getPresentation(0).getDocument()
-        text = TextDocumentUtil.getText(doc)
-        return {"success": True, "manifest": text}
+        return TextDocumentUtil.getText(doc)
     
     def get_method_decompiled_code(self, class_signature, method_name):
         """Get the decompiled code of the given method in the currently loaded APK project"""
@@ -58,16 +105,111 @@ class JebOperations(object):
         method = self._find_method(dexUnit, class_signature, method_name)
         if method is None:
             return {"success": False, "error": "Method not found: %s" % method_name}
-        
-        decomp = DecompilerHelper.getDecompiler(dexUnit)
+
+        clazz = dexUnit.getClass(convert_class_signature(class_signature))
+        text, err = self._decompile_method(dexUnit, clazz, method)
+        if err: return err
+        return {"success": True, "decompiled_code": text, "method_signature": method.getSignature(True)}
+
+    def get_methods_decompiled_code(self, class_signature, methods):
+        """
+        Get the decompiled code of several methods of one class, sliced from a single class decompilation
+
+        Args:
+            class_signature (str): The class signature
+            methods (list): Method names (all overloads) or full method signatures (one overload)
+
+        Returns:
+            dict: Per-request results in input order; methods that cannot be found carry an error
+        """
+        if not class_signature:
+            return {"success": False, "error": "Class signature is required"}
+        if not methods:
+            return {"success": False, "error": "At least one method is required"}
+
+        try:
+            dexUnit, err = self.project_manager.get_current_dex_unit()
+            if err: return err
+
+            clazz = dexUnit.getClass(convert_class_signature(class_signature))
+            if clazz is None:
+                return {"success": False, "error": "Class not found: %s" % class_signature}
+
+            class_methods = [m for m in (clazz.getMethods() or []) if m is not None]
+            results = []
+            for requested in methods:
+                if "(" in requested:
+                    matched = [m for m in class_methods
+                               if requested in (m.getSignature(True), m.getSignature(False))]
+                else:
+                    matched = [m for m in class_methods
+                               if requested in (m.getName(True), m.getName(False))]
+                if not matched:
+                    results.append({"method": requested, "success": False,
+                                    "error": "Method not found: %s" % requested})
+                    continue
+                for method in matched:
+                    text, err = self._decompile_method(dexUnit, clazz, method)
+                    entry = {"method": requested, "method_signature": method.getSignature(True)}
+                    if err:
+                        entry.update(err)
+                    else:
+                        entry.update({"success": True, "decompiled_code": text})
+                    results.append(entry)
+
+            return {
+                "success": True,
+                "class_signature": clazz.getSignature(True),
+                "methods": results,
+                "found": sum(1 for entry in results if entry["success"])
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": (
+                    "An unexpected error occurred: {exc}.\n"
+                    "You may try updating JEB or this plugin to the latest version to fix potential API changes."
+                ).format(exc=str(e)),
+                "traceback": traceback.format_exc()
+            }
+
+    def _class_document(self, dex_unit, clazz):
+        """内存中的类文档（整类反编译文本与方法位置），名称版本变化后重建"""
+        generation = self.index_registry.generation(dex_unit)
+        key = (dex_unit.getUid(), clazz.getSignature(False))
+        document = self.class_documents.get(key, generation)
+        if document is None:
+            text, cached, err = self._decompile_class(dex_unit, clazz)
+            if err or not text:
+                return None
+            document = ClassDocument(clazz.getSignature(True), text)
+            self.class_documents.put(key, generation, document)
+        return document
+
+    def _decompile_method(self, dex_unit, clazz, method):
+        """
+        优先从类文档中截取方法源码，找不到方法位置时（合成方法、lambda 等）单独反编译该方法
+
+        Returns:
+            (text, err)
+        """
+        if clazz is not None:
+            try:
+                document = self._class_document(dex_unit, clazz)
+                text = document.method_text(method) if document else None
+                if text is not None:
+                    return text, None
+            except Exception as e:
+                print("[JebOperations] Warning: failed to slice method from class document: %s" % str(e))
+
+        decomp = DecompilerHelper.getDecompiler(dex_unit)
         if not decomp:
-            return {"success": False, "error": "Cannot acquire decompiler for unit"}
+            return None, {"success": False, "error": "Cannot acquire decompiler for unit"}
 
         if not decomp.decompileMethod(method.getSignature(True)):
-            return {"success": False, "error": "Failed decompiling method"}
+            return None, {"success": False, "error": "Failed decompiling method"}
 
-        text = decomp.getDecompiledMethodText(method.getSignature(True))
-        return {"success": True, "decompiled_code": text, "method_signature": method.getSignature(True)}
+        return decomp.getDecompiledMethodText(method.getSignature(True)), None
 
     def _find_method(self, dex_unit, class_signature, method_name):
         """Find a method in the dex unit by class signature and method name"""
@@ -105,7 +247,11 @@ class JebOperations(object):
         return None
 
     def get_class_decompiled_code(self, class_signature):
-        """Get the decompiled code of a class in the current APK project"""
+        """Get the decompiled code of a class in the current APK project
+
+        Results are cached on disk by class content (shared across artifacts and projects) and, for APKs
+        opened with load_project, also by APK hash and rename journal state.
+        """
         if not class_signature:
             return {"success": False, "error": "Class signature is required"}
 
@@ -117,16 +263,245 @@ class JebOperations(object):
         if clazz is None:
             return {"success": False, "error": "Class not found: %s" % class_signature}
         
-        decomp = DecompilerHelper.getDecompiler(dexUnit)
+        text, cached, err = self._decompile_class(dexUnit, clazz)
+        if err: return err
+        result = {"success": True, "decompiled_code": text, "class_signature": clazz.getSignature(True)}
+        if cached:
+            result["cached"] = True
+        return result
+
+    def _decompile_class(self, dex_unit, clazz, apk_hash=None):
+        """
+        反编译整个类，先查持久化缓存
+
+        Returns:
+            (text, cached, err)
+        """
+        cache_keys = self._decompile_cache_keys(dex_unit, clazz, apk_hash)
+        for position, cache_key in enumerate(cache_keys):
+            text = self.decompile_cache.get(cache_key)
+            if text is None:
+                continue
+            # 内容寻址命中（如其他 APK 中相同的 SDK 类）时，也登记到本 APK 的键下
+            for other_key in cache_keys[:position]:
+                self._store_decompiled(other_key, text)
+            return text, True, None
+
+        decomp = DecompilerHelper.getDecompiler(dex_unit)
         if not decomp:
-            return {"success": False, "error": "Cannot acquire decompiler for unit"}
+            return None, False, {"success": False, "error": "Cannot acquire decompiler for unit"}
 
         if not decomp.decompileClass(clazz.getSignature(True)):
-            return {"success": False, "error": "Failed decompiling class"}
+            return None, False, {"success": False, "error": "Failed decompiling class"}
 
         text = decomp.getDecompiledClassText(clazz.getSignature(True))
-        return {"success": True, "decompiled_code": text, "class_signature": clazz.getSignature(True)}
+        if text:
+            for cache_key in cache_keys:
+                self._store_decompiled(cache_key, text)
+        return text, False, None
+
+    def _decompile_cache_keys(self, dex_unit, clazz, apk_hash=None):
+        """
+        持久化反编译缓存的键：先按 (APK 哈希, 重命名状态, 原始类签名)，再按类内容摘要（跨 APK、跨工程共享）。
+
+        内容摘要本身包含类及其引用的当前名称，只有局部变量名取自重命名日志，因此内容键总是可用。
+        APK 键的重命名状态取自重命名日志，unit 可能带有日志之外的改名（界面中打开、从 .jdb2 恢复）时不使用 APK 键
+        """
+        try:
+            if apk_hash is None:
+                apk_hash, err = self.project_manager.get_current_artifact_hash()
+                if err: return []
+            generation = self.index_registry.generation(dex_unit)
+            journal = self._get_journal(apk_hash)
+            state = journal.state()
+        except Exception as e:
+            print("[JebOperations] Warning: decompile cache unavailable: %s" % str(e))
+            return []
+
+        keys = []
+        if self._renames_synced(dex_unit, generation):
+            keys.append((apk_hash, state, clazz.getSignature(False)))
+        else:
+            self._apk_key_skipped += 1
+        try:
+            local_renames = self._local_renames.get(apk_hash)
+            if local_renames is None or local_renames[0] != state:
+                by_method = {}
+                for record in journal.load():
+                    if record.get("kind") == "local":
+                        by_method.setdefault(record["target"], []).append((record["name"], record["new_name"]))
+                local_renames = self._local_renames[apk_hash] = (state, by_method)
+            hasher = self.index_registry.get(dex_unit, ClassContentHash.NAME, ClassContentHash.build)
+            keys.append(content_key(hasher.digest(dex_unit, clazz, generation, local_renames[1])))
+        except Exception as e:
+            print("[JebOperations] Warning: failed to hash class content: %s" % str(e))
+        return keys
+
+    def _store_decompiled(self, cache_key, text):
+        try:
+            self.decompile_cache.put(cache_key, text)
+        except Exception as e:
+            print("[JebOperations] Warning: failed to cache decompiled class: %s" % str(e))
+
+    def _renames_synced(self, dex_unit, generation=None):
+        """
+        unit 的名称是否仍与重命名日志一致。只有本插件打开并重放过日志（或确认日志为空）的 unit
+        才可能一致；其余 unit（界面中打开、从 .jdb2 恢复）可能带有日志之外的改名，一律视为不一致
+        """
+        if generation is None:
+            generation = self.index_registry.generation(dex_unit)
+        return self._synced_generations.get(dex_unit.getUid()) == generation
+
+    def _mark_renames_synced(self, dex_unit):
+        """unit 当前的名称状态与重命名日志一致"""
+        self._synced_generations[dex_unit.getUid()] = self.index_registry.generation(dex_unit)
+
+    def get_decompile_cache_stats(self):
+        """Get size and hit statistics of the on-disk decompilation cache"""
+        try:
+            result = {"success": True}
+            result.update(self.decompile_cache.stats())
+            result["apk_key_skipped"] = self._apk_key_skipped
+            if self._apk_key_skipped:
+                result["apk_key_note"] = (
+                    "Artifacts opened in the JEB UI or restored from a .jdb2 may carry renames outside the "
+                    "rename journal, so their lookups only use the content-addressed key. Open the APK with "
+                    "load_project to use the per-APK key as well.")
+            return result
+        except Exception as e:
+            return {
+                "success": False,
+                "error": (
+                    "An unexpected error occurred: {exc}.\n"
+                    "You may try updating JEB or this plugin to the latest version to fix potential API changes."
+                ).format(exc=str(e)),
+                "traceback": traceback.format_exc()
+            }
     
+    def _get_type_hierarchy(self, dex_unit):
+        return self.index_registry.get(dex_unit, TypeHierarchy.NAME, TypeHierarchy.build)
+
+    def _get_call_graph(self, dex_unit):
+        def build(unit):
+            return CallGraph.build(unit, self._get_type_hierarchy(unit))
+        return self.index_registry.get(dex_unit, CallGraph.NAME, build)
+
+    def _format_call_edges(self, dex_unit, edges, site_owner=None):
+        """将 (method_index, site_offset, kind) 转为可读结构；site_owner 为调用点所在方法"""
+        result = []
+        for method_index, site, kind in edges:
+            method = dex_unit.getMethod(method_index)
+            signature = method.getSignature(True) if method else "<unknown>"
+            owner = site_owner if site_owner is not None else signature
+            result.append({
+                "method": signature,
+                "address": "%s+%Xh" % (owner, site),
+                "dispatch": kind == CallGraph.EDGE_DISPATCH
+            })
+        return result
+
+    def _select_classes(self, dex_unit, package_filter="", reachable_only=False, top_level_only=True,
+                        skip_libraries=False):
+        """
+        按包名前缀、可达性和第三方库标记筛选类，返回 ([(original_signature, current_signature)], err)
+
+        top_level_only 时跳过内部类（外部类反编译时已包含）
+        """
+        reach = None
+        if reachable_only:
+            reach, err = self._get_reachability(dex_unit)
+            if err: return None, err
+        libraries = self._get_library_tags(dex_unit) if skip_libraries else None
+
+        prefix = convert_package_prefix(package_filter)
+        selected = []
+        for clazz in dex_unit.getClasses():
+            original = clazz.getSignature(False)
+            current = clazz.getSignature(True)
+            if top_level_only and "$" in original and dex_unit.getClass(original.split("$")[0] + ";") is not None:
+                continue
+            if prefix and not (current.startswith(prefix) or original.startswith(prefix)):
+                continue
+            if reach is not None and not reach.contains_class(original):
+                continue
+            if libraries is not None and libraries.contains_class(original):
+                continue
+            selected.append((original, current))
+        return selected, None
+
+    def export_sources(self, output_dir, package_filter="", reachable_only=False, threads=2, timeout_s=60, resume=True,
+                       skip_libraries=False):
+        """Start a background job decompiling classes to .java files under output_dir
+
+        Args:
+            output_dir (str): Directory receiving the .java tree and the progress file
+            package_filter (str): Only export classes under this package, e.g. "com.example"
+            reachable_only (bool): Only export classes reachable from manifest entry points
+            threads (int): Number of classes decompiled in parallel
+            timeout_s (int): Per-class decompilation timeout in seconds
+            resume (bool): Skip classes already exported by a previous run into the same directory
+            skip_libraries (bool): Skip classes detected as known third-party libraries
+
+        Returns:
+            dict: Job id and number of selected classes; poll get_job_status for progress
+        """
+        if not output_dir:
+            return {"success": False, "error": "output_dir is required"}
+
+        try:
+            dexUnit, err = self.project_manager.get_current_dex_unit()
+            if err: return err
+
+            output_dir = os.path.abspath(output_dir)
+            for job in self.job_manager.running(SourceExportJob.KIND):
+                if job.output_dir == output_dir:
+                    return {"success": False, "error": "Export job %s is already writing to %s" % (job.job_id, output_dir)}
+
+            decomp = DecompilerHelper.getDecompiler(dexUnit)
+            if not decomp:
+                return {"success": False, "error": "Cannot acquire decompiler for unit"}
+
+            classes, err = self._select_classes(dexUnit, package_filter, reachable_only, skip_libraries=skip_libraries)
+            if err: return err
+
+            job = self.job_manager.submit(SourceExportJob, decomp, output_dir, classes,
+                                          threads=threads, timeout_s=timeout_s, resume=resume)
+            return {
+                "success": True,
+                "job_id": job.job_id,
+                "class_count": len(classes),
+                "output_dir": output_dir,
+                "message": "Export started, poll get_job_status for progress"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": (
+                    "An unexpected error occurred: {exc}.\n"
+                    "You may try updating JEB or this plugin to the latest version to fix potential API changes."
+                ).format(exc=str(e)),
+                "traceback": traceback.format_exc()
+            }
+
+    def get_job_status(self, job_id=None):
+        """Get the status of a background job, or of all jobs when job_id is empty"""
+        if not job_id:
+            return {"success": True, "jobs": self.job_manager.list()}
+        job = self.job_manager.get(job_id)
+        if job is None:
+            return {"success": False, "error": "Job not found: %s" % job_id}
+        result = {"success": True}
+        result.update(job.status())
+        return result
+
+    def cancel_job(self, job_id):
+        """Request cancellation of a running background job"""
+        job = self.job_manager.get(job_id)
+        if job is None:
+            return {"success": False, "error": "Job not found: %s" % job_id}
+        job.cancel()
+        return {"success": True, "job_id": job_id, "state": job.state}
+
     def get_method_callers(self, class_signature, method_name):
         """Get the callers of the given method in the currently loaded APK project"""
         if not class_signature or not method_name:
@@ -139,15 +514,155 @@ class JebOperations(object):
         method = self._find_method(dexUnit, class_signature, method_name)
         if method is None:
             return {"success": False, "error": "Method not found: %s" % method_name}
-        
-        action_xrefs_data = ActionXrefsData()
-        action_context = ActionContext(dexUnit, Actions.QUERY_XREFS, method.getItemId(), None)
-        ret = []
-        if dexUnit.prepareExecution(action_context, action_xrefs_data):
-            for i in range(action_xrefs_data.getAddresses().size()):
-                ret.append((action_xrefs_data.getAddresses()[i], action_xrefs_data.getDetails()[i]))
-        return {"success": True, "method_signature": method.getSignature(True), "callers": ret}
+
+        graph = self._get_call_graph(dexUnit)
+        edges = self._format_call_edges(dexUnit, graph.callers(method.getIndex()))
+        return {
+            "success": True,
+            "method_signature": method.getSignature(True),
+            # 保持原 xref 查询的 [调用点地址, 说明] 结构，结构化记录放在 caller_methods
+            "callers": [(edge["address"], "dispatch" if edge["dispatch"] else "invoke") for edge in edges],
+            "caller_methods": edges
+        }
+
+    def get_method_callees(self, class_signature, method_name):
+        """Get the methods called by the given method, including virtual-dispatch targets"""
+        if not class_signature or not method_name:
+            return {"success": False, "error": "Both class_signature and method_name are required"}
+
+        dexUnit, err = self.project_manager.get_current_dex_unit()
+        if err: return err
+
+        method = self._find_method(dexUnit, class_signature, method_name)
+        if method is None:
+            return {"success": False, "error": "Method not found: %s" % method_name}
+
+        graph = self._get_call_graph(dexUnit)
+        signature = method.getSignature(True)
+        callees = self._format_call_edges(dexUnit, graph.callees(method.getIndex()), site_owner=signature)
+        return {"success": True, "method_signature": signature, "callees": callees}
+
+    def get_transitive_calls(self, class_signature, method_name, direction="callers", max_depth=3, max_nodes=500):
+        """Get transitive callers or callees of a method up to max_depth levels"""
+        if not class_signature or not method_name:
+            return {"success": False, "error": "Both class_signature and method_name are required"}
+        if direction not in ("callers", "callees"):
+            return {"success": False, "error": "direction must be 'callers' or 'callees'"}
+
+        try:
+            dexUnit, err = self.project_manager.get_current_dex_unit()
+            if err: return err
+
+            method = self._find_method(dexUnit, class_signature, method_name)
+            if method is None:
+                return {"success": False, "error": "Method not found: %s" % method_name}
+
+            graph = self._get_call_graph(dexUnit)
+            nodes, truncated = graph.transitive(
+                method.getIndex(), forward=(direction == "callees"),
+                max_depth=max(int(max_depth), 1), max_nodes=max(int(max_nodes), 1))
+
+            signatures = {}
+            def signature_of(method_index):
+                if method_index not in signatures:
+                    m = dexUnit.getMethod(method_index)
+                    signatures[method_index] = m.getSignature(True) if m else "<unknown>"
+                return signatures[method_index]
+
+            return {
+                "success": True,
+                "method_signature": method.getSignature(True),
+                "direction": direction,
+                "max_depth": max_depth,
+                "count": len(nodes),
+                "truncated": truncated,
+                "methods": [{
+                    "method": signature_of(node),
+                    "depth": depth,
+                    "via": signature_of(parent)
+                } for node, depth, parent in nodes]
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": (
+                    "An unexpected error occurred: {exc}.\n"
+                    "You may try updating JEB or this plugin to the latest version to fix potential API changes."
+                ).format(exc=str(e)),
+                "traceback": traceback.format_exc()
+            }
     
+    def _resolve_method(self, dex_unit, method_signature):
+        """按完整方法签名查找方法，也接受 'Lcom/a/B;->name' 形式（取第一个同名方法）"""
+        if not method_signature:
+            return None
+        method = dex_unit.getMethod(method_signature)
+        if method is None and "->" in method_signature and "(" not in method_signature:
+            class_signature, _, method_name = method_signature.partition("->")
+            method = self._find_method(dex_unit, class_signature, method_name)
+        return method
+
+    def find_call_paths(self, source_signature, sink_signature, max_depth=6, max_paths=20):
+        """Find call chains from source method to sink method on the precomputed call graph"""
+        if not source_signature or not sink_signature:
+            return {"success": False, "error": "Both source and sink method signatures are required"}
+
+        try:
+            dexUnit, err = self.project_manager.get_current_dex_unit()
+            if err: return err
+
+            source = self._resolve_method(dexUnit, source_signature)
+            if source is None:
+                return {"success": False, "error": "Method not found: %s" % source_signature}
+            sink = self._resolve_method(dexUnit, sink_signature)
+            if sink is None:
+                return {"success": False, "error": "Method not found: %s" % sink_signature}
+
+            graph = self._get_call_graph(dexUnit)
+            paths, truncated = find_call_paths(
+                graph, source.getIndex(), sink.getIndex(),
+                max_depth=max(int(max_depth), 1), max_paths=max(int(max_paths), 1))
+
+            signatures = {}
+            def signature_of(method_index):
+                if method_index not in signatures:
+                    m = dexUnit.getMethod(method_index)
+                    signatures[method_index] = m.getSignature(True) if m else "<unknown>"
+                return signatures[method_index]
+
+            result_paths = []
+            for path in paths:
+                dispatch = False
+                for caller, callee in zip(path, path[1:]):
+                    kinds = [kind for target, _, kind in graph.callees(caller) if target == callee]
+                    if kinds and min(kinds) == CallGraph.EDGE_DISPATCH:
+                        dispatch = True
+                        break
+                result_paths.append({
+                    "length": len(path) - 1,
+                    "via_dispatch": dispatch,
+                    "methods": [signature_of(m) for m in path]
+                })
+
+            return {
+                "success": True,
+                "source": source.getSignature(True),
+                "sink": sink.getSignature(True),
+                "max_depth": max_depth,
+                "count": len(result_paths),
+                "truncated": truncated,
+                "paths": result_paths
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": (
+                    "An unexpected error occurred: {exc}.\n"
+                    "You may try updating JEB or this plugin to the latest version to fix potential API changes."
+                ).format(exc=str(e)),
+                "traceback": traceback.format_exc()
+            }
+
     def get_field_callers(self, class_signature, field_name):
         """Get the callers/references of the given field in the currently loaded APK project"""
         if not class_signature or not field_name:
@@ -178,143 +693,291 @@ class JebOperations(object):
             "field_xrefs": field_xrefs
         }
     
-    def get_method_overrides(self, method_signature):
-        """Get the overrides of the given method in the currently loaded APK project"""
-        if not method_signature:
-            return {"success": False, "error": "method_signature is required"}
-        
-        dexUnit, err = self.project_manager.get_current_dex_unit()
-        if err: return err
-        
-        ret = []
-        method = dexUnit.getMethod(method_signature)
-        if method is None:
-            return {"success": False, "error": "Method not found: %s" % method_signature}
-        
-        data = ActionOverridesData()
-        action_context = ActionContext(dexUnit, Actions.QUERY_OVERRIDES, method.getItemId(), None)
-        if dexUnit.prepareExecution(action_context, data):
-            for i in range(data.getAddresses().size()):
-                ret.append((data.getAddresses()[i], data.getDetails()[i]))
-        return {"success": True, "method_signature": method_signature, "overrides": ret}
-    
-    def rename_class_name(self, class_name, new_name, ignore):
-        """Set the name of a class in the current APK project"""
-        if not class_name or not new_name:
-            return {"success": False, "error": "Boat class_name and new_name is required"}
-        
-        try:            
+    def _resolve_field(self, dex_unit, field_signature):
+        """按完整字段签名查找字段，也接受 'Lcom/a/B;->name' 形式"""
+        if not field_signature:
+            return None
+        field = dex_unit.getField(field_signature)
+        if field is None and "->" in field_signature:
+            class_signature, _, field_name = field_signature.partition("->")
+            field = self._find_field(dex_unit, class_signature, field_name.split(":")[0])
+        return field
+
+    def get_field_accesses(self, field_signatures, kind="both"):
+        """Get the methods reading and/or writing each of the given fields
+
+        Args:
+            field_signatures (str|list): Field signature(s), e.g. "Lcom/a/B;->name" or "Lcom/a/B;->name:I"
+            kind (str): "read", "write" or "both"
+
+        Returns:
+            dict: Per-field readers/writers with instruction offsets
+        """
+        if not field_signatures:
+            return {"success": False, "error": "At least one field signature is required"}
+        if kind not in ("read", "write", "both"):
+            return {"success": False, "error": "kind must be 'read', 'write' or 'both'"}
+        if not isinstance(field_signatures, (list, tuple)):
+            field_signatures = [field_signatures]
+
+        try:
             dexUnit, err = self.project_manager.get_current_dex_unit()
             if err: return err
-            
-            # Normalize class signature for JNI format
-            dex_class = dexUnit.getClass(convert_class_signature(class_name))
-            if dex_class is None:
-                return {"success": False, "error": "Class not found: %s" % class_name}
-            
-            old_name = dex_class.getName(True)
-            new_name = self._extract_last_segment(new_name)
-
-            if old_name == new_name:
-                return {"success": True, "message": "Class name already set to %s" % new_name}
 
-            if not dex_class.setName(new_name):
-                return  {"success": False, "error": "Failed to set class name: %s" % new_name}
-            
-            return {
-                "success": True, 
-                "new_class_name": new_name,
-                "message": "Renaming succeeded"
-            }
+            index = self.index_registry.get(dexUnit, FieldAccessIndex.NAME, FieldAccessIndex.build)
+            fields = []
+            for field_signature in field_signatures:
+                field = self._resolve_field(dexUnit, field_signature)
+                if field is None:
+                    fields.append({"field": field_signature, "error": "Field not found"})
+                    continue
+                entry = {"field": field.getSignature(True)}
+                if kind in ("read", "both"):
+                    reads = index.readers(field.getIndex())
+                    entry["read_count"] = len(reads)
+                    entry["reads"] = self._format_code_refs(dexUnit, reads)
+                if kind in ("write", "both"):
+                    writes = index.writers(field.getIndex())
+                    entry["write_count"] = len(writes)
+                    entry["writes"] = self._format_code_refs(dexUnit, writes)
+                fields.append(entry)
+
+            return {"success": True, "kind": kind, "fields": fields}
         except Exception as e:
             return {
                 "success": False,
                 "error": (
-                    "Failed to set class name for '%s': %s. "
-                    "You may try updating JEB or this plugin to the latest version to resolve potential API changes."
-                    % (class_name, str(e))
-                ),
+                    "An unexpected error occurred: {exc}.\n"
+                    "You may try updating JEB or this plugin to the latest version to fix potential API changes."
+                ).format(exc=str(e)),
                 "traceback": traceback.format_exc()
             }
-    
-    def rename_method_name(self, class_name, method_name, new_name, ignore):
-        """Set the name of a method in the specified class"""
-        if not class_name or not method_name:
-            return {"success": False, "error": "Both class signature and method name are required"}
+
+    def get_method_overrides(self, method_signature, offset=0, limit=100):
+        """Get the methods overriding the given method (paged) and the methods it overrides
+
+        Returns:
+            dict: overrides as [method signature, details] pairs like the former xref query, plus overridden
+        """
+        if not method_signature:
+            return {"success": False, "error": "method_signature is required"}
 
         try:
             dexUnit, err = self.project_manager.get_current_dex_unit()
             if err: return err
 
-            # Find method by name in the class
-            finded_method = self._find_method(dexUnit, class_name, method_name)
-            if not finded_method:
-                return {"success": False, "error": "Method not found: %s" % method_name}
-            
-            old_name = finded_method.getName(True)
-            new_name = self._extract_last_segment(new_name)
-
-            if old_name == new_name:
-                return {"success": True, "message": "Method name already set to %s" % new_name}
+            method = self._resolve_method(dexUnit, method_signature)
+            if method is None:
+                return {"success": False, "error": "Method not found: %s" % method_signature}
 
-            if not finded_method.setName(new_name):
-                return {"success": False, "error": "Rename failed for method '%s' in class %s" % (method_name, class_name)}
+            hierarchy = self._get_type_hierarchy(dexUnit)
+            class_sig, sub_sig = split_method_signature(method.getSignature(False))
+            def signature_of(method_index):
+                return dexUnit.getMethod(method_index).getSignature(True)
 
-            return {
+            page, page_info = paginate(hierarchy.overriding_methods(class_sig, sub_sig), offset, limit)
+            result = {
                 "success": True,
-                "class_name": class_name,
-                "new_method_name": new_name,
-                "message": "Renaming succeeded"
+                "method_signature": method_signature,
+                "resolved_signature": method.getSignature(True),
+                "overrides": [(signature_of(i), "override") for i in page],
+                "overridden": [signature_of(i) for i in hierarchy.overridden_methods(class_sig, sub_sig)]
             }
-
+            result.update(page_info)
+            return result
         except Exception as e:
             return {
                 "success": False,
                 "error": (
-                    "Failed to rename method '%s' in class '%s': %s. "
+                    "An unexpected error occurred: {exc}.\n"
                     "You may try updating JEB or this plugin to the latest version to fix potential API changes."
-                    % (method_name, class_name, str(e))
-                ),
+                ).format(exc=str(e)),
                 "traceback": traceback.format_exc()
             }
-    
-    def rename_field_name(self, class_name, field_name, new_name, ignore):
-        """Set the name of a field in the specified class"""
-        if not class_name or not field_name:
-            return {"success": False, "error": "Both class signature and field name are required"}
 
-        if new_name is None:
-            return {"success": False, "error": "New name is required"}
-        
-        try:
-            dexUnit, err = self.project_manager.get_current_dex_unit()
-            if err: return err
-            
-            # Normalize class signature for JNI format
-            clazz = dexUnit.getClass(convert_class_signature(class_name))
-            if clazz is None:
-                return {"success": False, "error": "Class not found: %s" % class_name}
-            
-            # Find field by name in the class
-            finded_field = self._find_field(dexUnit, class_name, field_name)
-            if not finded_field:
-                return {"success": False, "error": "Field not found: %s" % field_name}
+    def find_similar_methods(self, method_signature, threshold=0.7, limit=20):
+        """Find methods whose opcode n-grams resemble the given method (MinHash/LSH index)
 
-            old_name = finded_field.getName(True)
-            new_name = self._extract_last_segment(new_name)
+        Args:
+            method_signature (str): Full method signature, or 'Lcom/a/B;->name' for the first method of that name
+            threshold (float): Minimum estimated Jaccard similarity, 0..1
+            limit (int): Maximum number of results
 
-            if old_name == new_name:
-                return {"success": True, "message": "Field name already set to %s" % new_name}
+        Returns:
+            dict: Similar methods sorted by similarity
+        """
+        if not method_signature:
+            return {"success": False, "error": "method_signature is required"}
 
-            if not finded_field.setName(new_name):
-                return {"success": False, "error": "Rename failed for field '%s' in class %s" % (field_name, class_name)}
-            
+        try:
+            dexUnit, err = self.project_manager.get_current_dex_unit()
+            if err: return err
+
+            method = self._resolve_method(dexUnit, method_signature)
+            if method is None:
+                return {"success": False, "error": "Method not found: %s" % method_signature}
+
+            index = self.index_registry.get(dexUnit, SimilarityIndex.NAME, SimilarityIndex.build)
+            matches = index.query(method, min(max(float(threshold), 0.0), 1.0))
+            if matches is None:
+                return {"success": False, "error": "Method has fewer than %d instructions to compare" % MIN_OPCODES}
+
+            limit = max(int(limit), 1)
+            results = []
+            for method_index, similarity in matches[:limit]:
+                other = dexUnit.getMethod(method_index)
+                results.append({
+                    "method": other.getSignature(True) if other else "<unknown>",
+                    "similarity": round(similarity, 4),
+                    "instructions": index.sizes.get(method_index, 0)
+                })
             return {
                 "success": True,
-                "class_name": class_name,
-                "new_field_name": new_name,
-                "message": "Field found successfully"
+                "method_signature": method.getSignature(True),
+                "threshold": threshold,
+                "total": len(matches),
+                "truncated": len(matches) > limit,
+                "methods": results
             }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": (
+                    "An unexpected error occurred: {exc}.\n"
+                    "You may try updating JEB or this plugin to the latest version to fix potential API changes."
+                ).format(exc=str(e)),
+                "traceback": traceback.format_exc()
+            }
+    
+    def rename_class_name(self, class_name, new_name, ignore):
+        """Set the name of a class in the current APK project"""
+        if not class_name or not new_name:
+            return {"success": False, "error": "Boat class_name and new_name is required"}
+        
+        try:            
+            dexUnit, err = self.project_manager.get_current_dex_unit()
+            if err: return err
+
+            with self.rename_lock:
+                synced = self._renames_synced(dexUnit)
+                # Normalize class signature for JNI format
+                dex_class = dexUnit.getClass(convert_class_signature(class_name))
+                if dex_class is None:
+                    return {"success": False, "error": "Class not found: %s" % class_name}
+
+                old_name = dex_class.getName(True)
+                new_name = self._extract_last_segment(new_name)
+
+                if old_name == new_name:
+                    return {"success": True, "message": "Class name already set to %s" % new_name}
+
+                if not dex_class.setName(new_name):
+                    return  {"success": False, "error": "Failed to set class name: %s" % new_name}
+                self.index_registry.bump_generation(dexUnit)
+                self._journal_renames([{"kind": "class", "target": dex_class.getSignature(False), "new_name": new_name}], synced=synced)
+
+                return {
+                    "success": True, 
+                    "new_class_name": new_name,
+                    "message": "Renaming succeeded"
+                }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": (
+                    "Failed to set class name for '%s': %s. "
+                    "You may try updating JEB or this plugin to the latest version to resolve potential API changes."
+                    % (class_name, str(e))
+                ),
+                "traceback": traceback.format_exc()
+            }
+    
+    def rename_method_name(self, class_name, method_name, new_name, ignore):
+        """Set the name of a method in the specified class"""
+        if not class_name or not method_name:
+            return {"success": False, "error": "Both class signature and method name are required"}
+
+        try:
+            dexUnit, err = self.project_manager.get_current_dex_unit()
+            if err: return err
+
+            with self.rename_lock:
+                synced = self._renames_synced(dexUnit)
+                # Find method by name in the class
+                finded_method = self._find_method(dexUnit, class_name, method_name)
+                if not finded_method:
+                    return {"success": False, "error": "Method not found: %s" % method_name}
+
+                old_name = finded_method.getName(True)
+                new_name = self._extract_last_segment(new_name)
+
+                if old_name == new_name:
+                    return {"success": True, "message": "Method name already set to %s" % new_name}
+
+                if not finded_method.setName(new_name):
+                    return {"success": False, "error": "Rename failed for method '%s' in class %s" % (method_name, class_name)}
+                self.index_registry.bump_generation(dexUnit)
+                self._journal_renames([{"kind": "method", "target": finded_method.getSignature(False), "new_name": new_name}], synced=synced)
+
+                return {
+                    "success": True,
+                    "class_name": class_name,
+                    "new_method_name": new_name,
+                    "message": "Renaming succeeded"
+                }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": (
+                    "Failed to rename method '%s' in class '%s': %s. "
+                    "You may try updating JEB or this plugin to the latest version to fix potential API changes."
+                    % (method_name, class_name, str(e))
+                ),
+                "traceback": traceback.format_exc()
+            }
+    
+    def rename_field_name(self, class_name, field_name, new_name, ignore):
+        """Set the name of a field in the specified class"""
+        if not class_name or not field_name:
+            return {"success": False, "error": "Both class signature and field name are required"}
+
+        if new_name is None:
+            return {"success": False, "error": "New name is required"}
+        
+        try:
+            dexUnit, err = self.project_manager.get_current_dex_unit()
+            if err: return err
+
+            with self.rename_lock:
+                synced = self._renames_synced(dexUnit)
+                # Normalize class signature for JNI format
+                clazz = dexUnit.getClass(convert_class_signature(class_name))
+                if clazz is None:
+                    return {"success": False, "error": "Class not found: %s" % class_name}
+
+                # Find field by name in the class
+                finded_field = self._find_field(dexUnit, class_name, field_name)
+                if not finded_field:
+                    return {"success": False, "error": "Field not found: %s" % field_name}
+
+                old_name = finded_field.getName(True)
+                new_name = self._extract_last_segment(new_name)
+
+                if old_name == new_name:
+                    return {"success": True, "message": "Field name already set to %s" % new_name}
+
+                if not finded_field.setName(new_name):
+                    return {"success": False, "error": "Rename failed for field '%s' in class %s" % (field_name, class_name)}
+                self.index_registry.bump_generation(dexUnit)
+                self._journal_renames([{"kind": "field", "target": finded_field.getSignature(False), "new_name": new_name}], synced=synced)
+
+                return {
+                    "success": True,
+                    "class_name": class_name,
+                    "new_field_name": new_name,
+                    "message": "Field found successfully"
+                }
             
         except Exception as e:
             return {
@@ -339,52 +1002,319 @@ class JebOperations(object):
             dexUnit, err = self.project_manager.get_current_dex_unit()
             if err: return err
 
-            # Find method by name in the class
-            found_method = self._find_method(dexUnit, class_name, method_name)
-            if not found_method:
-                return {"success": False, "error": "Method not found: %s" % method_name}
+            with self.rename_lock:
+                synced = self._renames_synced(dexUnit)
+                # Find method by name in the class
+                found_method = self._find_method(dexUnit, class_name, method_name)
+                if not found_method:
+                    return {"success": False, "error": "Method not found: %s" % method_name}
 
-            # Get decompiler
-            decomp = dexUnit.getDecompiler()
-            if not decomp:
-                return {"success": False, "error": "Cannot acquire decompiler for unit"}
+                # Get decompiler
+                decomp = dexUnit.getDecompiler()
+                if not decomp:
+                    return {"success": False, "error": "Cannot acquire decompiler for unit"}
 
-            # Rename local variable using setIdentifierName
-            # Parameters: method signature (original), old variable name, new variable name
-            success = decomp.setIdentifierName(found_method.getSignature(False), old_var_name, new_var_name)
+                # Rename local variable using setIdentifierName
+                # Parameters: method signature (original), old variable name, new variable name
+                success = decomp.setIdentifierName(found_method.getSignature(False), old_var_name, new_var_name)
+
+                if not success:
+                    return {
+                        "success": False,
+                        "error": (
+                            "Rename failed for variable '%s' in method '%s' of class '%s'. "
+                            "Please check if the variable name exists in the method."
+                            % (old_var_name, method_name, class_name)
+                        )
+                    }
+                self.index_registry.bump_generation(dexUnit)
+                self._journal_renames([{"kind": "local", "target": found_method.getSignature(False),
+                                        "name": old_var_name, "new_name": new_var_name}], synced=synced)
 
-            if not success:
                 return {
-                    "success": False,
-                    "error": (
-                        "Rename failed for variable '%s' in method '%s' of class '%s'. "
-                        "Please check if the variable name exists in the method."
-                        % (old_var_name, method_name, class_name)
-                    )
+                    "success": True,
+                    "class_name": class_name,
+                    "method_name": method_name,
+                    "old_var_name": old_var_name,
+                    "new_var_name": new_var_name,
+                    "message": "Local variable renamed successfully"
                 }
 
+        except Exception as e:
+            return {
+                "success": False,
+                "error": (
+                    "Failed to rename local variable '%s' to '%s' in method '%s' of class '%s': %s. "
+                    "You may try updating JEB or this plugin to the latest version to fix potential API changes."
+                    % (old_var_name, new_var_name, method_name, class_name, str(e))
+                ),
+                "traceback": traceback.format_exc()
+            }
+
+    def bulk_rename(self, entries, dry_run=False, atomic=True):
+        """Rename many classes, methods, fields, parameters and local variables in one transaction
+
+        Args:
+            entries (list): Rename entries, see BulkRename for the keys of each kind
+            dry_run (bool): Only resolve and check the entries
+            atomic (bool): Apply nothing when any entry fails the check; otherwise apply the valid ones
+
+        Returns:
+            dict: Status counts and a per-entry report (applied/unchanged/conflict/not_found/invalid/failed/rolled_back/skipped)
+        """
+        if not isinstance(entries, list) or not entries:
+            return {"success": False, "error": "entries must be a non-empty list"}
+
+        try:
+            dexUnit, err = self.project_manager.get_current_dex_unit()
+            if err: return err
+
+            with self.rename_lock:
+                synced = self._renames_synced(dexUnit)
+                batch = BulkRename(dexUnit, entries)
+                errors = batch.check()
+                if dry_run or (errors and atomic):
+                    for op in batch.ops:
+                        batch.report[op.position]["status"] = "ok" if dry_run else "skipped"
+                    return {
+                        "success": not errors,
+                        "dry_run": bool(dry_run),
+                        "counts": batch.counts(),
+                        "entries": batch.report
+                    }
+
+                applied = batch.apply()
+                if batch.ops:
+                    self.index_registry.bump_generation(dexUnit)
+                    # 逐项重命名时关闭了通知，最后统一刷新一次
+                    dexUnit.notifyGenericChange()
+                    self._journal_renames(batch.journal_records(), dex_unit=dexUnit, synced=synced)
+
             return {
+                "success": applied and not errors,
+                "counts": batch.counts(),
+                "entries": batch.report
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": (
+                    "An unexpected error occurred: {exc}.\n"
+                    "You may try updating JEB or this plugin to the latest version to fix potential API changes."
+                ).format(exc=str(e)),
+                "traceback": traceback.format_exc()
+            }
+
+    def _get_fingerprints(self, dex_unit):
+        return self.index_registry.get(dex_unit, StructuralFingerprints.NAME, StructuralFingerprints.build)
+
+    def _get_library_tags(self, dex_unit, min_ratio=0.5):
+        """第三方库标记，首次使用时按默认阈值检测"""
+        def build(unit):
+            return LibraryTags.detect(self._get_fingerprints(unit), LibraryDatabase.load(library_dir()), min_ratio)
+        return self.index_registry.get(dex_unit, LibraryTags.NAME, build)
+
+    def detect_libraries(self, min_ratio=0.5, offset=0, limit=100):
+        """Match the classes of the current artifact against the library fingerprint database
+
+        Args:
+            min_ratio (float): Share of a class's methods (and of a package's classes) that must match one library
+
+        Returns:
+            dict: Known libraries, tag counts and a paged list of library packages
+        """
+        try:
+            dexUnit, err = self.project_manager.get_current_dex_unit()
+            if err: return err
+
+            db = LibraryDatabase.load(library_dir())
+            self.index_registry.invalidate(dexUnit, LibraryTags.NAME)
+            tags = self._get_library_tags(dexUnit, float(min_ratio))
+
+            packages = [dict(package=package.replace("/", "."), **info)
+                        for package, info in sorted(tags.packages.items())]
+            page, page_info = paginate(packages, offset, limit)
+            result = {
                 "success": True,
-                "class_name": class_name,
-                "method_name": method_name,
-                "old_var_name": old_var_name,
-                "new_var_name": new_var_name,
-                "message": "Local variable renamed successfully"
+                "database": library_dir(),
+                "known_libraries": db.libraries,
+                "packages": page
+            }
+            result.update(tags.summary())
+            result.update(page_info)
+            return result
+        except Exception as e:
+            return {
+                "success": False,
+                "error": (
+                    "An unexpected error occurred: {exc}.\n"
+                    "You may try updating JEB or this plugin to the latest version to fix potential API changes."
+                ).format(exc=str(e)),
+                "traceback": traceback.format_exc()
             }
 
+    def add_library_fingerprints(self, name, package_prefix):
+        """Fingerprint the classes under package_prefix of the current artifact and add them to the library database
+
+        Load an unobfuscated build of the library (jar/dex/apk) in JEB first, make it the active artifact,
+        then call this with the library's root package.
+        """
+        if not name or not LIBRARY_NAME_PATTERN.match(name):
+            return {"success": False, "error": "name must only contain letters, digits, '.', '_' or '-'"}
+        if not package_prefix:
+            return {"success": False, "error": "package_prefix is required"}
+
+        try:
+            dexUnit, err = self.project_manager.get_current_dex_unit()
+            if err: return err
+
+            prefix = convert_package_prefix(package_prefix)
+            fingerprints = self._get_fingerprints(dexUnit)
+            classes = [sig for sig in fingerprints.class_strict if sig.startswith(prefix)]
+            if not classes:
+                return {"success": False, "error": "No classes under %s" % package_prefix}
+
+            db = LibraryDatabase(library_dir())
+            path, class_count, method_count = db.export_fingerprints(name, package_prefix, fingerprints, classes)
+            # 库文件变化后，所有 artifact 的库标记都需要重新检测
+            self.index_registry.invalidate(name=LibraryTags.NAME)
+            return {
+                "success": True,
+                "path": path,
+                "class_hashes": class_count,
+                "method_hashes": method_count
+            }
         except Exception as e:
             return {
                 "success": False,
                 "error": (
-                    "Failed to rename local variable '%s' to '%s' in method '%s' of class '%s': %s. "
+                    "An unexpected error occurred: {exc}.\n"
                     "You may try updating JEB or this plugin to the latest version to fix potential API changes."
-                    % (old_var_name, new_var_name, method_name, class_name, str(e))
-                ),
+                ).format(exc=str(e)),
+                "traceback": traceback.format_exc()
+            }
+
+    def transfer_renames(self, source_artifact_id, target_artifact_id="", min_confidence=0.8, dry_run=False,
+                         offset=0, limit=100):
+        """Carry class, method and field renames from an older build over to a newer one
+
+        Args:
+            source_artifact_id (str): Artifact holding the renames (the old build)
+            target_artifact_id (str): Artifact to rename (the new build), defaults to the active artifact
+            min_confidence (float): Only transfer matches at or above this confidence
+            dry_run (bool): Only report the renames that would be applied
+
+        Returns:
+            dict: Match statistics and a paged list of transfers with confidence and status
+        """
+        try:
+            source = self.project_manager.get_artifact_by_id(source_artifact_id)
+            if source is None:
+                return {"success": False, "error": "Artifact not found: %s" % source_artifact_id}
+            if target_artifact_id:
+                target = self.project_manager.get_artifact_by_id(target_artifact_id)
+                if target is None:
+                    return {"success": False, "error": "Artifact not found: %s" % target_artifact_id}
+            else:
+                target, err = self.project_manager.get_current_artifact()
+                if err: return err
+
+            oldDex, err = self.project_manager.get_artifact_dex_unit(source)
+            if err: return err
+            newDex, err = self.project_manager.get_artifact_dex_unit(target)
+            if err: return err
+            if oldDex.getUid() == newDex.getUid():
+                return {"success": False, "error": "Source and target artifacts are the same"}
+
+            old_fp = self._get_fingerprints(oldDex)
+            new_fp = self._get_fingerprints(newDex)
+            match = self.index_registry.get(newDex, "version_match:%s" % oldDex.getUid(),
+                                            lambda unit: VersionMatch.build(old_fp, new_fp))
+
+            transfers = []
+            for kind, pairs, old_lookup, new_lookup in (
+                    ("class", match.classes, oldDex.getClass, newDex.getClass),
+                    ("method", match.methods, oldDex.getMethod, newDex.getMethod),
+                    ("field", match.fields, oldDex.getField, newDex.getField)):
+                for new_key, (old_key, confidence) in pairs.items():
+                    if confidence < min_confidence:
+                        continue
+                    old_item = old_lookup(old_key)
+                    if old_item is None or not old_item.isRenamed():
+                        continue
+                    new_item = new_lookup(new_key)
+                    if new_item is None or new_item.getName(True) == old_item.getName(True):
+                        continue
+                    transfers.append((kind, old_item, new_item, confidence))
+            transfers.sort(key=lambda t: -t[3])
+
+            # 与 bulk_rename 相同的事务：先整体校验（与现有名称、与本批其他条目的冲突），
+            # 再逐项应用，失败时逆序回滚；未通过校验的条目跳过
+            entries = [{"kind": kind, "class_signature": new_item.getSignature(False).split("->", 1)[0],
+                        "name": new_item.getName(False), "new_name": old_item.getName(True)}
+                       for kind, old_item, new_item, _ in transfers]
+            records = []
+            with self.rename_lock:
+                synced = self._renames_synced(newDex)
+                batch = BulkRename(newDex, entries, [new_item for _, _, new_item, _ in transfers])
+                batch.check()
+                if not dry_run and batch.ops:
+                    batch.apply()
+                    records = batch.journal_records()
+                    self.index_registry.bump_generation(newDex)
+                    newDex.notifyGenericChange()
+            if records:
+                self._journal_renames(records, self.project_manager.get_artifact_hash(target), newDex, synced)
+
+            report = []
+            for (kind, old_item, new_item, confidence), check in zip(transfers, batch.report):
+                row = {
+                    "kind": kind,
+                    "source": old_item.getSignature(True),
+                    "target": new_item.getSignature(True),
+                    "new_name": old_item.getName(True),
+                    "confidence": confidence,
+                    "status": "matched" if check["status"] == "pending" else check["status"]
+                }
+                if "error" in check:
+                    row["error"] = check["error"]
+                report.append(row)
+
+            page, page_info = paginate(report, offset, limit)
+            result = {
+                "success": True,
+                "dry_run": bool(dry_run),
+                "match": match.summary(),
+                "applied": len(records),
+                "failed": sum(1 for row in report if row["status"] not in ("matched", "applied", "unchanged")),
+                "counts": batch.counts(),
+                "transfers": page
+            }
+            result.update(page_info)
+            return result
+        except Exception as e:
+            return {
+                "success": False,
+                "error": (
+                    "An unexpected error occurred: {exc}.\n"
+                    "You may try updating JEB or this plugin to the latest version to fix potential API changes."
+                ).format(exc=str(e)),
                 "traceback": traceback.format_exc()
             }
 
-    def get_method_smali(self, class_signature, method_name):
-        """Get all Smali instructions for a specific method in the given class"""
+    def get_method_smali(self, class_signature, method_name, structured=False, start=0, count=0):
+        """Get Smali instructions for a specific method in the given class
+
+        Args:
+            class_signature (str): The class signature
+            method_name (str): The method name
+            structured (bool): Return [offset, mnemonic, operands] rows instead of text lines
+            start (int): Index of the first instruction to return
+            count (int): Number of instructions to return, 0 for all
+
+        Returns:
+            dict: Instructions of the selected range and the total instruction count
+        """
         if not class_signature or not method_name:
             return {"success": False, "error": "Both class signature and method name are required"}
         
@@ -396,14 +1326,317 @@ class JebOperations(object):
             if found_method is None:
                 return {"success": False, "error": "Method not found: %s" % method_name}
 
-            smali_instructions = [ins.format(None) for ins in (found_method.getInstructions() or []) if ins]
-            return {
+            generation = self.index_registry.generation(dexUnit)
+            cache_key = (dexUnit.getUid(), found_method.getIndex(), bool(structured))
+            rows = self.smali_cache.get(cache_key, generation)
+            if rows is None:
+                instructions = [ins for ins in (found_method.getInstructions() or []) if ins]
+                if structured:
+                    rows = [instruction_row(dexUnit, ins) for ins in instructions]
+                else:
+                    rows = [ins.format(None) for ins in instructions]
+                self.smali_cache.put(cache_key, generation, rows)
+
+            start = max(int(start or 0), 0)
+            end = start + int(count) if count else len(rows)
+            result = {
                 "success": True,
                 "class_signature": class_signature,
                 "method_name": method_name,
-                "smali_instructions": smali_instructions,
+                "instruction_count": len(rows),
+                "start": start,
                 "message": "Smali instructions retrieved successfully"
             }
+            if structured:
+                result["columns"] = STRUCTURED_COLUMNS
+                result["instructions"] = rows[start:end]
+            else:
+                result["smali_instructions"] = rows[start:end]
+            return result
+        except Exception as e:
+            return {
+                "success": False,
+                "error": (
+                    "An unexpected error occurred: {exc}.\n"
+                    "You may try updating JEB or this plugin to the latest version to fix potential API changes."
+                ).format(exc=str(e)),
+                "traceback": traceback.format_exc()
+            }
+    def _format_code_refs(self, dex_unit, refs):
+        """将 (method_index, offset) 列表转为可读的引用位置"""
+        result = []
+        for method_index, offset in refs:
+            method = dex_unit.getMethod(method_index)
+            result.append({
+                "method": method.getSignature(True) if method else "<unknown>",
+                "offset": offset
+            })
+        return result
+
+    def _get_reachability(self, dex_unit):
+        """获取入口可达性分析结果，返回 (reachability, err)"""
+        apk_unit, err = self.project_manager.get_current_apk_unit()
+        if err: return None, err
+        if apk_unit is None:
+            return None, {"success": False, "error": "Entry-point reachability requires an APK artifact with a manifest"}
+
+        def build(unit):
+            return Reachability.build(unit, apk_unit, self._get_call_graph(unit))
+        return self.index_registry.get(dex_unit, Reachability.NAME, build), None
+
+    def _filter_refs(self, matches, keep):
+        """只保留 keep(method_index) 为真的方法中的引用，去掉没有剩余引用的条目"""
+        filtered = []
+        for value, refs in matches:
+            refs = [ref for ref in refs if keep(ref[0])]
+            if refs:
+                filtered.append((value, refs))
+        return filtered
+
+    def compute_reachability(self, rebuild=False):
+        """Compute methods/classes reachable from the manifest entry points and return counts"""
+        try:
+            dexUnit, err = self.project_manager.get_current_dex_unit()
+            if err: return err
+
+            if rebuild:
+                self.index_registry.invalidate(dexUnit, Reachability.NAME)
+            reach, err = self._get_reachability(dexUnit)
+            if err: return err
+
+            result = {"success": True}
+            result.update(reach.summary())
+            result["entry_points"] = [self._effective_class_signature(dexUnit, sig) for sig in reach.entry_classes]
+            result["build_time_ms"] = self.index_registry.build_time_ms(dexUnit, Reachability.NAME)
+            return result
+        except Exception as e:
+            return {
+                "success": False,
+                "error": (
+                    "An unexpected error occurred: {exc}.\n"
+                    "You may try updating JEB or this plugin to the latest version to fix potential API changes."
+                ).format(exc=str(e)),
+                "traceback": traceback.format_exc()
+            }
+
+    def get_reachable_classes(self, package_prefix="", offset=0, limit=100):
+        """List classes reachable from the manifest entry points, optionally under a package prefix"""
+        try:
+            dexUnit, err = self.project_manager.get_current_dex_unit()
+            if err: return err
+
+            reach, err = self._get_reachability(dexUnit)
+            if err: return err
+
+            classes = sorted(self._effective_class_signature(dexUnit, sig) for sig in reach.classes)
+            if package_prefix:
+                prefix = convert_package_prefix(package_prefix)
+                classes = [sig for sig in classes if sig.startswith(prefix)]
+
+            page, page_info = paginate(classes, offset, limit)
+            result = {"success": True, "classes": page}
+            result.update(page_info)
+            return result
+        except Exception as e:
+            return {
+                "success": False,
+                "error": (
+                    "An unexpected error occurred: {exc}.\n"
+                    "You may try updating JEB or this plugin to the latest version to fix potential API changes."
+                ).format(exc=str(e)),
+                "traceback": traceback.format_exc()
+            }
+
+    def _effective_class_signature(self, dex_unit, class_signature):
+        """原始类签名转为当前（可能已重命名的）签名"""
+        clazz = dex_unit.getClass(class_signature)
+        return clazz.getSignature(True) if clazz else class_signature
+
+    def search_strings(self, query, regex=False, offset=0, limit=100, reachable_only=False, skip_libraries=False):
+        """Search const-string literals by substring or regex, with the methods using them"""
+        if query is None or query == "":
+            return {"success": False, "error": "query is required"}
+
+        try:
+            dexUnit, err = self.project_manager.get_current_dex_unit()
+            if err: return err
+
+            index = self.index_registry.get(dexUnit, LiteralIndex.NAME, LiteralIndex.build)
+            try:
+                matches = index.match_strings(query, regex)
+            except re.error as e:
+                return {"success": False, "error": "Invalid regex '%s': %s" % (query, str(e))}
+
+            if reachable_only:
+                reach, err = self._get_reachability(dexUnit)
+                if err: return err
+                matches = self._filter_refs(matches, reach.contains_method)
+            if skip_libraries:
+                libraries = self._get_library_tags(dexUnit)
+                matches = self._filter_refs(matches, lambda method_index: not libraries.contains_method(method_index))
+
+            page, page_info = paginate(matches, offset, limit)
+            strings = [{
+                "value": value,
+                "xref_count": len(refs),
+                "xrefs": self._format_code_refs(dexUnit, refs)
+            } for value, refs in page]
+
+            result = {"success": True, "query": query, "strings": strings}
+            result.update(page_info)
+            return result
+        except Exception as e:
+            return {
+                "success": False,
+                "error": (
+                    "An unexpected error occurred: {exc}.\n"
+                    "You may try updating JEB or this plugin to the latest version to fix potential API changes."
+                ).format(exc=str(e)),
+                "traceback": traceback.format_exc()
+            }
+
+    def search_constants(self, query, regex=False, offset=0, limit=100, reachable_only=False, skip_libraries=False):
+        """Search numeric literals (const/16, const, const-wide...) with the methods using them"""
+        if query is None or query == "":
+            return {"success": False, "error": "query is required"}
+
+        try:
+            dexUnit, err = self.project_manager.get_current_dex_unit()
+            if err: return err
+
+            index = self.index_registry.get(dexUnit, LiteralIndex.NAME, LiteralIndex.build)
+            try:
+                matches = index.match_constants(query, regex)
+            except re.error as e:
+                return {"success": False, "error": "Invalid regex '%s': %s" % (query, str(e))}
+
+            if reachable_only:
+                reach, err = self._get_reachability(dexUnit)
+                if err: return err
+                matches = self._filter_refs(matches, reach.contains_method)
+            if skip_libraries:
+                libraries = self._get_library_tags(dexUnit)
+                matches = self._filter_refs(matches, lambda method_index: not libraries.contains_method(method_index))
+
+            page, page_info = paginate(matches, offset, limit)
+            constants = [{
+                "value": value,
+                "hex": index.hex(value),
+                "xref_count": len(refs),
+                "xrefs": self._format_code_refs(dexUnit, refs)
+            } for value, refs in page]
+
+            result = {"success": True, "query": query, "constants": constants}
+            result.update(page_info)
+            return result
+        except Exception as e:
+            return {
+                "success": False,
+                "error": (
+                    "An unexpected error occurred: {exc}.\n"
+                    "You may try updating JEB or this plugin to the latest version to fix potential API changes."
+                ).format(exc=str(e)),
+                "traceback": traceback.format_exc()
+            }
+
+    def get_class_type_tree(self, class_signature, max_node_count):
+        """Get the type tree for a given class signature
+        
+        Args:
+            class_signature (str): The class signature to analyze
+            max_node_count (int): Maximum node count to traverse
+            
+        Returns:
+            dict: Success status and type tree data
+        """
+        dexUnit, err = self.project_manager.get_current_dex_unit()
+        if err: return err
+        
+        try:
+            # Find code node
+            code_node = dexUnit.getTypeHierarchy(convert_class_signature(class_signature), max_node_count, False)
+            if code_node is None:
+                return {"success": False, "error": "Class Node not found: %s" % class_signature}
+
+            # Build type tree
+            type_tree = self._build_type_tree(code_node)
+            
+            return {
+                "success": True,
+                "type_tree": type_tree
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": "Failed to get type tree: %s" % str(e)
+            }
+    
+    def _format_type_entries(self, dex_unit, hierarchy, entries):
+        """将 (signature, depth, via) 转为扁平结构"""
+        return [{
+            "signature": self._effective_class_signature(dex_unit, sig),
+            "depth": depth,
+            "via": self._effective_class_signature(dex_unit, via),
+            "interface": hierarchy.is_interface(sig),
+            "internal": hierarchy.is_internal(sig)
+        } for sig, depth, via in entries]
+
+    def get_class_subtypes(self, class_signature, implementors_only=False, offset=0, limit=100):
+        """Get all transitive subclasses/implementors of a class or interface as a flat, paged list"""
+        if not class_signature:
+            return {"success": False, "error": "Class signature is required"}
+
+        try:
+            dexUnit, err = self.project_manager.get_current_dex_unit()
+            if err: return err
+
+            clazz = dexUnit.getClass(convert_class_signature(class_signature))
+            class_sig = clazz.getSignature(False) if clazz else convert_class_signature(class_signature)
+
+            hierarchy = self._get_type_hierarchy(dexUnit)
+            if implementors_only:
+                entries = hierarchy.implementors(class_sig)
+            else:
+                entries = hierarchy.subtypes_of(class_sig)
+
+            page, page_info = paginate(entries, offset, limit)
+            result = {
+                "success": True,
+                "class_signature": self._effective_class_signature(dexUnit, class_sig),
+                "subtypes": self._format_type_entries(dexUnit, hierarchy, page)
+            }
+            result.update(page_info)
+            return result
+        except Exception as e:
+            return {
+                "success": False,
+                "error": (
+                    "An unexpected error occurred: {exc}.\n"
+                    "You may try updating JEB or this plugin to the latest version to fix potential API changes."
+                ).format(exc=str(e)),
+                "traceback": traceback.format_exc()
+            }
+
+    def get_class_supertypes(self, class_signature):
+        """Get all transitive superclasses and interfaces of a class as a flat list"""
+        if not class_signature:
+            return {"success": False, "error": "Class signature is required"}
+
+        try:
+            dexUnit, err = self.project_manager.get_current_dex_unit()
+            if err: return err
+
+            clazz = dexUnit.getClass(convert_class_signature(class_signature))
+            if clazz is None:
+                return {"success": False, "error": "Class not found: %s" % class_signature}
+
+            hierarchy = self._get_type_hierarchy(dexUnit)
+            return {
+                "success": True,
+                "class_signature": clazz.getSignature(True),
+                "supertypes": self._format_type_entries(dexUnit, hierarchy, hierarchy.supertypes(clazz.getSignature(False)))
+            }
         except Exception as e:
             return {
                 "success": False,
@@ -413,39 +1646,7 @@ class JebOperations(object):
                 ).format(exc=str(e)),
                 "traceback": traceback.format_exc()
             }
-    def get_class_type_tree(self, class_signature, max_node_count):
-        """Get the type tree for a given class signature
-        
-        Args:
-            class_signature (str): The class signature to analyze
-            max_node_count (int): Maximum node count to traverse
-            
-        Returns:
-            dict: Success status and type tree data
-        """
-        dexUnit, err = self.project_manager.get_current_dex_unit()
-        if err: return err
-        
-        try:
-            # Find code node
-            code_node = dexUnit.getTypeHierarchy(convert_class_signature(class_signature), max_node_count, False)
-            if code_node is None:
-                return {"success": False, "error": "Class Node not found: %s" % class_signature}
 
-            # Build type tree
-            type_tree = self._build_type_tree(code_node)
-            
-            return {
-                "success": True,
-                "type_tree": type_tree
-            }
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "error": "Failed to get type tree: %s" % str(e)
-            }
-    
     def _build_type_tree(self, node):
         """递归构建 dict 结构"""
         if node is None:
@@ -563,6 +1764,16 @@ class JebOperations(object):
                 "traceback": traceback.format_exc()
             }
 
+    def _get_proto_parser(self, dex_unit):
+        """每个 artifact 复用一个 ProtoParser，名称版本变化时清空已解析消息"""
+        parser = self.index_registry.get(dex_unit, "proto_parser", ProtoParser)
+        generation = self.index_registry.generation(dex_unit)
+        with parser.lock:
+            if getattr(parser, "generation", None) != generation:
+                parser.clear_cache()
+                parser.generation = generation
+        return parser
+
     def parse_protobuf_class(self, class_signature):
         """解析指定类的protobuf定义"""
         if not class_signature:
@@ -572,8 +1783,7 @@ class JebOperations(object):
             dexUnit, err = self.project_manager.get_current_dex_unit()
             if err: return err
 
-            # 创建protobuf解析器
-            parser = ProtoParser(dexUnit)
+            parser = self._get_proto_parser(dexUnit)
             result = parser.parse_class(class_signature)
 
             return result
@@ -588,11 +1798,64 @@ class JebOperations(object):
                 "traceback": traceback.format_exc()
             }
 
-    def get_class_methods(self, class_signature):
+    def extract_all_protos(self, output_dir, base_class=DEFAULT_MESSAGE_BASE, package_filter=""):
+        """Start a background job extracting every protobuf-lite message into per-package .proto files
+
+        Args:
+            output_dir (str): Directory receiving one <package>.proto bundle per Java package
+            base_class (str): Message base class, override it when protobuf-lite itself is obfuscated
+            package_filter (str): Only extract messages under this package
+
+        Returns:
+            dict: Job id and number of message classes; poll get_job_status for progress
+        """
+        if not output_dir:
+            return {"success": False, "error": "output_dir is required"}
+
+        try:
+            dexUnit, err = self.project_manager.get_current_dex_unit()
+            if err: return err
+
+            base = dexUnit.getClass(convert_class_signature(base_class))
+            base_sig = base.getSignature(False) if base else convert_class_signature(base_class)
+            prefix = convert_package_prefix(package_filter)
+
+            hierarchy = self._get_type_hierarchy(dexUnit)
+            message_classes = []
+            for sig, _, _ in hierarchy.implementors(base_sig):
+                clazz = dexUnit.getClass(sig)
+                if clazz is None or sig.startswith("Lcom/google/protobuf/"):
+                    continue
+                if prefix and not clazz.getSignature(True).startswith(prefix):
+                    continue
+                message_classes.append(clazz)
+            if not message_classes:
+                return {"success": False, "error": "No message classes extending %s found" % base_class}
+
+            job = self.job_manager.submit(ProtoExtractJob, self._get_proto_parser(dexUnit), os.path.abspath(output_dir), message_classes)
+            return {
+                "success": True,
+                "job_id": job.job_id,
+                "message_count": len(message_classes),
+                "output_dir": job.output_dir,
+                "message": "Extraction started, poll get_job_status for progress"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": (
+                    "An unexpected error occurred: {exc}.\n"
+                    "You may try updating JEB or this plugin to the latest version to fix potential API changes."
+                ).format(exc=str(e)),
+                "traceback": traceback.format_exc()
+            }
+
+    def get_class_methods(self, class_signature, fields=None):
         """Get all methods of a given class
 
         Args:
             class_signature (str): The class signature to analyze
+            fields (set): Method attributes to compute, None for all
 
         Returns:
             dict: Contains methods information or error details
@@ -605,23 +1868,16 @@ class JebOperations(object):
             if dex_class is None:
                 return {"success": False, "error": "Class not found: %s" % class_signature}
 
+            method_fields = record_fields(fields, "methods")
             methods = []
             for method in dex_class.getMethods():
-                method_info = {
-                    "name": method.getName(),
-                    "signature": method.getSignature(True),
-                    "return_type": method.getReturnType().getSignature() if method.getReturnType() else "void",
-                    "parameters": [],
-                    "access_flags": GenericFlagParser.parse_flags(method.getGenericFlags())
-                }
-                
-                # Get parameter types
-                param_types = method.getParameterTypes()
-                if param_types:
-                    for param_type in param_types:
-                        method_info["parameters"].append(param_type.getSignature(True))
-                
-                methods.append(method_info)
+                methods.append(select((
+                    ("name", lambda: method.getName()),
+                    ("signature", lambda: method.getSignature(True)),
+                    ("return_type", lambda: method.getReturnType().getSignature() if method.getReturnType() else "void"),
+                    ("parameters", lambda: [t.getSignature(True) for t in (method.getParameterTypes() or [])]),
+                    ("access_flags", lambda: GenericFlagParser.parse_flags(method.getGenericFlags())),
+                ), method_fields))
 
             return {
                 "success": True,
@@ -640,11 +1896,12 @@ class JebOperations(object):
                 "traceback": traceback.format_exc()
             }
 
-    def get_class_fields(self, class_signature):
+    def get_class_fields(self, class_signature, fields=None):
         """Get all fields of a given class
 
         Args:
             class_signature (str): The class signature to analyze
+            fields (set): Field attributes to compute, None for all
 
         Returns:
             dict: Contains fields information or error details
@@ -657,32 +1914,30 @@ class JebOperations(object):
             if dex_class is None:
                 return {"success": False, "error": "Class not found: %s" % class_signature}
 
-            fields = []
-            for field in dex_class.getFields():
-                field_info = {
-                    "name": field.getName(),
-                    "signature": field.getSignature(True),
-                    "type": field.getFieldType().getSignature(True) if field.getFieldType() else "unknown",
-                    "access_flags": GenericFlagParser.parse_flags(field.getGenericFlags())
-                }
-                
+            def initial_value(field):
                 # Get initial value if available
                 try:
-                    initial_value = field.getInitialValue()
-                    if initial_value is not None:
-                        field_info["initial_value"] = str(initial_value)
-                    else:
-                        field_info["initial_value"] = None
+                    value = field.getInitialValue()
+                    return str(value) if value is not None else None
                 except:
-                    field_info["initial_value"] = None
-                
-                fields.append(field_info)
+                    return None
+
+            field_fields = record_fields(fields, "fields")
+            field_infos = []
+            for field in dex_class.getFields():
+                field_infos.append(select((
+                    ("name", lambda: field.getName()),
+                    ("signature", lambda: field.getSignature(True)),
+                    ("type", lambda: field.getFieldType().getSignature(True) if field.getFieldType() else "unknown"),
+                    ("access_flags", lambda: GenericFlagParser.parse_flags(field.getGenericFlags())),
+                    ("initial_value", lambda: initial_value(field)),
+                ), field_fields))
 
             return {
                 "success": True,
                 "class_signature": class_signature,
-                "fields": fields,
-                "field_count": len(fields)
+                "fields": field_infos,
+                "field_count": len(field_infos)
             }
             
         except Exception as e:
@@ -695,17 +1950,316 @@ class JebOperations(object):
                 "traceback": traceback.format_exc()
             }
 
-    def load_project(self, file_path):
+    def get_class_outline(self, class_signature):
+        """Get the outline of a class (supertypes, field and method signatures, inner classes) without decompiling
+
+        Args:
+            class_signature (str): The class signature
+
+        Returns:
+            dict: The class outline
+        """
+        if not class_signature:
+            return {"success": False, "error": "Class signature is required"}
+
+        result = self.get_class_outlines([class_signature])
+        if not result.get("success"):
+            return result
+        outline = result["classes"][0]
+        if "error" in outline:
+            return {"success": False, "error": "Class not found: %s" % class_signature}
+        response = {"success": True}
+        response.update(outline)
+        return response
+
+    def get_class_outlines(self, class_signatures):
+        """Get the outlines of several classes in one call
+
+        Args:
+            class_signatures (str|list): Class signature(s), at most MAX_OUTLINE_CLASSES
+
+        Returns:
+            dict: Outlines in input order; classes that cannot be found carry an error
+        """
+        if not class_signatures:
+            return {"success": False, "error": "At least one class signature is required"}
+        if not isinstance(class_signatures, (list, tuple)):
+            class_signatures = [class_signatures]
+        if len(class_signatures) > MAX_OUTLINE_CLASSES:
+            return {"success": False, "error": "At most %d classes per call" % MAX_OUTLINE_CLASSES}
+
+        try:
+            dexUnit, err = self.project_manager.get_current_dex_unit()
+            if err: return err
+
+            outliner = self.index_registry.get(dexUnit, ClassOutline.NAME, ClassOutline.build)
+            classes = []
+            for class_signature in class_signatures:
+                clazz = dexUnit.getClass(convert_class_signature(class_signature))
+                if clazz is None:
+                    classes.append({"class": class_signature, "error": "Class not found"})
+                    continue
+                classes.append(outliner.outline(dexUnit, clazz))
+
+            return {"success": True, "classes": classes}
+        except Exception as e:
+            return {
+                "success": False,
+                "error": (
+                    "An unexpected error occurred: {exc}.\n"
+                    "You may try updating JEB or this plugin to the latest version to fix potential API changes."
+                ).format(exc=str(e)),
+                "traceback": traceback.format_exc()
+            }
+
+    def load_project(self, file_path, replay_renames=True, warmup=True):
         """Open a new project from file path
         
         Args:
             file_path (str): Path to the APK/DEX file to open
+            replay_renames (bool): Re-apply the renames journaled for this APK
+            warmup (bool): Decompile the manifest entry classes in the background
             
         Returns:
             dict: Success status and project information
         """
-        return self.project_manager.load_project(file_path)
+        # 已在 JEB 中打开的 artifact 或 .jdb2 工程可能带有日志之外的改名
+        fresh = not file_path.lower().endswith(".jdb2")
+        try:
+            fresh = fresh and self.project_manager.find_live_artifact(os.path.basename(file_path)) is None
+        except Exception:
+            fresh = False
+        result = self.project_manager.load_project(file_path)
+        if not result.get("success") or not (replay_renames or warmup):
+            return result
+
+        artifact = None
+        try:
+            artifact = self.project_manager.find_live_artifact(os.path.basename(file_path))
+            if artifact is not None and replay_renames:
+                apk_hash = self.project_manager.get_artifact_hash(artifact)
+                result["rename_journal"] = self._replay_journal(artifact.getMainUnit().getDex(), apk_hash, fresh)
+        except Exception as e:
+            result["rename_journal"] = {"success": False, "error": "Failed to replay renames: %s" % str(e)}
+        if artifact is not None and warmup:
+            result["warmup_job_id"] = self._start_warmup(artifact)
+        return result
+
+    def _start_warmup(self, artifact):
+        """
+        后台以最低优先级反编译 Application、启动 Activity 和导出组件，返回任务 id；
+        非 APK 或 manifest 无法解析时返回 None
+        """
+        self.interrupt_warmup()
+        try:
+            apk_unit = artifact.getMainUnit()
+            if apk_unit is None or apk_unit.getFormatType() != "apk":
+                return None
+            dex_unit, err = self.project_manager.get_artifact_dex_unit(artifact)
+            if err: return None
+            text = self._manifest_text(apk_unit)
+            if not text:
+                return None
+            classes = warmup_classes(text, apk_unit.getPackageName())
+        except Exception as e:
+            print("[JebOperations] Warning: warm-up skipped: %s" % str(e))
+            return None
+
+        def decompile(class_signature):
+            clazz = dex_unit.getClass(class_signature)
+            if clazz is None:
+                raise Exception("Class not found: %s" % class_signature)
+            apk_hash = self.project_manager.get_artifact_hash(artifact)
+            text, cached, err = self._decompile_class(dex_unit, clazz, apk_hash)
+            if err:
+                raise Exception(err["error"])
+            return cached
+
+        self._warmup_job = self.job_manager.submit(WarmupJob, decompile, classes)
+        return self._warmup_job.job_id
+
+    def interrupt_warmup(self):
+        """有真实请求到达时调用：取消正在进行的预热，让出反编译器"""
+        job = self._warmup_job
+        if job is not None and not job.finished:
+            job.cancel()
+
+    def _get_journal(self, apk_hash):
+        journal = self.rename_journals.get(apk_hash)
+        if journal is None:
+            journal = self.rename_journals[apk_hash] = RenameJournal(journal_dir(), apk_hash)
+        return journal
+
+    def _journal_renames(self, records, apk_hash=None, dex_unit=None, synced=False):
+        """
+        记录成功的重命名（默认记到当前 artifact）；写日志失败不影响重命名结果。
+        synced 为改名前 unit 是否与日志一致，只有原本一致时记录后才仍然一致
+        """
+        try:
+            if dex_unit is None:
+                dex_unit, err = self.project_manager.get_current_dex_unit()
+                if err: return
+            if records:
+                if apk_hash is None:
+                    apk_hash, err = self.project_manager.get_current_artifact_hash()
+                    if err: return
+                self._get_journal(apk_hash).append(records)
+            if synced:
+                self._mark_renames_synced(dex_unit)
+        except Exception as e:
+            print("[JebOperations] Warning: failed to journal renames: %s" % str(e))
+
+    def _replay_journal(self, dex_unit, apk_hash, fresh=False):
+        """
+        把 APK 的重命名日志（快照 + 增量）一次性应用到 dex_unit。
+        fresh 表示 unit 刚由本插件从 APK 创建、没有其他改名；否则重放后仅在原本一致时保持一致
+        """
+        journal = self._get_journal(apk_hash)
+        with self.rename_lock:
+            synced = fresh or self._renames_synced(dex_unit)
+            records = journal.load()
+            if not records:
+                if synced:
+                    self._mark_renames_synced(dex_unit)
+                return {"success": True, "apk_sha256": apk_hash, "record_count": 0, "applied": 0}
+            applied, failures = replay_records(dex_unit, records)
+            self.index_registry.bump_generation(dex_unit)
+            dex_unit.notifyGenericChange()
+            if synced:
+                self._mark_renames_synced(dex_unit)
+        return {
+            "success": not failures,
+            "apk_sha256": apk_hash,
+            "record_count": len(records),
+            "applied": applied,
+            "failed": len(failures),
+            "failures": failures[:100]
+        }
+
+    def replay_rename_journal(self):
+        """Replay the rename journal of the current artifact, e.g. after reopening the APK without a saved database"""
+        try:
+            dexUnit, err = self.project_manager.get_current_dex_unit()
+            if err: return err
+            apk_hash, err = self.project_manager.get_current_artifact_hash()
+            if err: return err
+            return self._replay_journal(dexUnit, apk_hash)
+        except Exception as e:
+            return {
+                "success": False,
+                "error": (
+                    "An unexpected error occurred: {exc}.\n"
+                    "You may try updating JEB or this plugin to the latest version to fix potential API changes."
+                ).format(exc=str(e)),
+                "traceback": traceback.format_exc()
+            }
+    
     
+    def _rename_state(self, dex_unit, apk_hash):
+        """持久化用的重命名状态；日志之外的改名会附加名称版本号，保证与日志状态不同"""
+        state = self._get_journal(apk_hash).state()
+        generation = self.index_registry.generation(dex_unit)
+        if not self._renames_synced(dex_unit, generation):
+            state = "%s+g%d" % (state, generation)
+        return state
+
+    def get_index_info(self):
+        """Identify the current artifact for the server-side index store
+
+        Returns:
+            dict: APK SHA-256, rename state, export schema version and the exportable kinds
+        """
+        try:
+            dexUnit, err = self.project_manager.get_current_dex_unit()
+            if err: return err
+            apk_hash, err = self.project_manager.get_current_artifact_hash()
+            if err: return err
+            return {
+                "success": True,
+                "apk_sha256": apk_hash,
+                "rename_state": self._rename_state(dexUnit, apk_hash),
+                "schema": SCHEMA_VERSION,
+                "kinds": list(EXPORT_KINDS),
+                "name_kinds": list(NAME_KINDS)
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": (
+                    "An unexpected error occurred: {exc}.\n"
+                    "You may try updating JEB or this plugin to the latest version to fix potential API changes."
+                ).format(exc=str(e)),
+                "traceback": traceback.format_exc()
+            }
+
+    def _index_export(self, dex_unit, kind):
+        generation = self.index_registry.generation(dex_unit) if kind in NAME_KINDS else None
+
+        def build(unit):
+            if kind == "classes":
+                rows = symbol_rows(unit.getClasses())
+            elif kind == "methods":
+                rows = symbol_rows(unit.getMethods())
+            elif kind == "fields":
+                rows = symbol_rows(unit.getFields())
+            elif kind == "calls":
+                rows = call_rows(self._get_call_graph(unit))
+            elif kind == "field_accesses":
+                rows = field_access_rows(self.index_registry.get(unit, FieldAccessIndex.NAME, FieldAccessIndex.build))
+            else:
+                literals = self.index_registry.get(unit, LiteralIndex.NAME, LiteralIndex.build)
+                rows = literal_rows(literals.strings if kind == "strings" else literals.constants)
+            return IndexExport(kind, rows, generation)
+
+        name = "index_export:" + kind
+        export = self.index_registry.get(dex_unit, name, build)
+        if export.generation != generation:
+            self.index_registry.invalidate(dex_unit, name)
+            export = self.index_registry.get(dex_unit, name, build)
+        return export
+
+    def export_index_rows(self, kind, offset=0, limit=5000):
+        """Page through the rows of one index kind, for the server-side persistent index store
+
+        Args:
+            kind (str): classes, methods, fields, calls, field_accesses, strings or constants
+
+        Returns:
+            dict: rows plus total/offset/limit/has_more, tagged with the APK hash and rename state
+        """
+        if kind not in EXPORT_KINDS:
+            return {"success": False, "error": "kind must be one of %s" % ", ".join(EXPORT_KINDS)}
+
+        try:
+            dexUnit, err = self.project_manager.get_current_dex_unit()
+            if err: return err
+            apk_hash, err = self.project_manager.get_current_artifact_hash()
+            if err: return err
+
+            export = self._index_export(dexUnit, kind)
+            rows, page_info = export.page(offset, limit)
+            if not page_info["has_more"]:
+                # 最后一页已发出，服务端已持久化，不再常驻内存（再次导出时重建）
+                self.index_registry.invalidate(dexUnit, "index_export:" + kind)
+            result = {
+                "success": True,
+                "apk_sha256": apk_hash,
+                "rename_state": self._rename_state(dexUnit, apk_hash),
+                "schema": SCHEMA_VERSION,
+                "kind": kind,
+                "rows": rows
+            }
+            result.update(page_info)
+            return result
+        except Exception as e:
+            return {
+                "success": False,
+                "error": (
+                    "An unexpected error occurred: {exc}.\n"
+                    "You may try updating JEB or this plugin to the latest version to fix potential API changes."
+                ).format(exc=str(e)),
+                "traceback": traceback.format_exc()
+            }
     
     def has_projects(self):
         """Check if there are any projects loaded in JEB"""
@@ -733,7 +2287,7 @@ class JebOperations(object):
 
             return {
                 "success": True,
-                "class_count": len(dexUnit.getClasses())
+                "class_count": len(self._get_class_snapshot(dexUnit))
             }
         except Exception as e:
             return {
@@ -745,12 +2299,13 @@ class JebOperations(object):
                 "traceback": traceback.format_exc()
             }
     
-    def get_class_by_index(self, index):
+    def get_class_by_index(self, index, fields=None):
         """Get class information by index
         
         Args:
             index (int): Index of the class to retrieve
-            
+            fields (set): Class attributes to compute, None for all
+
         Returns:
             dict: Contains class information or error details
         """
@@ -759,19 +2314,120 @@ class JebOperations(object):
             if err: return err
 
             index = int(index)
-            if index < 0 or index >= len(dexUnit.getClasses()):
+            if index < 0 or index >= len(self._get_class_snapshot(dexUnit)):
                 return {"success": False, "error": "Index out of range: %d" % index}
 
             dexClass = dexUnit.getClass(index)
             if dexClass is None: 
                 return {"success": False, "error": "Class not found, Index of range: %s" % index}
 
+            result = {"success": True}
+            result.update(select((
+                ("current_name", lambda: dexClass.getName(True)),
+                ("original_name", lambda: dexClass.getName(False)),
+                ("signature", lambda: dexClass.getSignature(True)),
+                ("renamed", lambda: dexClass.isRenamed()),
+            ), fields))
+            return result
+        except Exception as e:
+            return {
+                "success": False,
+                "error": (
+                    "An unexpected error occurred: {exc}.\n"
+                    "You may try updating JEB or this plugin to the latest version to fix potential API changes."
+                ).format(exc=str(e)),
+                "traceback": traceback.format_exc()
+            }
+
+    def _get_class_snapshot(self, dex_unit):
+        """类列表快照，名称版本变化时刷新当前签名"""
+        snapshot = self.index_registry.get(dex_unit, ClassSnapshot.NAME, ClassSnapshot.build)
+        snapshot.refresh(self.index_registry.generation(dex_unit))
+        return snapshot
+
+    def list_classes(self, offset=0, limit=100, package_prefix="", renamed_only=False, sort="index", cursor=""):
+        """List classes page by page from a cached snapshot
+
+        Args:
+            offset (int): Start position, ignored when cursor is given
+            limit (int): Page size
+            package_prefix (str): Only list classes under this package (current names)
+            renamed_only (bool): Only list renamed classes
+            sort (str): "index" (DEX order), "original" (original signature) or "name" (current signature)
+            cursor (str): next_cursor of the previous page; stays valid across renames
+
+        Returns:
+            dict: Page of classes, next_cursor and the name version of the snapshot
+        """
+        if sort not in SORT_KEYS:
+            return {"success": False, "error": "Invalid sort '%s', expected one of %s" % (sort, ", ".join(SORT_KEYS))}
+
+        try:
+            dexUnit, err = self.project_manager.get_current_dex_unit()
+            if err: return err
+
+            snapshot = self._get_class_snapshot(dexUnit)
+            prefix = convert_package_prefix(package_prefix)
+            positions, keys = snapshot.view(prefix, bool(renamed_only), sort)
+
+            if cursor:
+                try:
+                    offset = start_after(keys, decode_cursor(cursor, sort))
+                except ValueError as e:
+                    return {"success": False, "error": "Invalid cursor '%s': %s" % (cursor, str(e))}
+
+            page, page_info = paginate(positions, offset, limit)
+            result = {
+                "success": True,
+                "version": snapshot.generation,
+                "classes": [snapshot.entry(position) for position in page],
+                "next_cursor": encode_cursor(sort, snapshot.sort_key(page[-1], sort)) if page_info["has_more"] else None
+            }
+            result.update(page_info)
+            return result
+        except Exception as e:
+            return {
+                "success": False,
+                "error": (
+                    "An unexpected error occurred: {exc}.\n"
+                    "You may try updating JEB or this plugin to the latest version to fix potential API changes."
+                ).format(exc=str(e)),
+                "traceback": traceback.format_exc()
+            }
+
+    def _get_package_tree(self, dex_unit):
+        """包层次索引，跟随类快照的名称版本重新汇总"""
+        snapshot = self._get_class_snapshot(dex_unit)
+        tree = self.index_registry.get(dex_unit, PackageTree.NAME, lambda unit: PackageTree.build(snapshot))
+        tree.refresh()
+        return tree
+
+    def list_packages(self, prefix="", depth=1):
+        """List a package and its subpackages with class, member, size and rename statistics
+
+        Args:
+            prefix (str): Package to expand, e.g. "com.example"; empty for the root
+            depth (int): Number of subpackage levels to include
+
+        Returns:
+            dict: Package nodes in tree order, parent before children
+        """
+        try:
+            dexUnit, err = self.project_manager.get_current_dex_unit()
+            if err: return err
+
+            package = (prefix or "").strip().replace(".", "/").strip("/")
+            if package.startswith("L") and package.endswith(";"):
+                package = package[1:-1]
+            tree = self._get_package_tree(dexUnit)
+            nodes = tree.expand(package, max(int(depth), 0))
+            if nodes is None:
+                return {"success": False, "error": "Package not found: %s" % prefix}
+
             return {
-                "success": True, 
-                "current_name": dexClass.getName(True),
-                "original_name": dexClass.getName(False),
-                "signature": dexClass.getSignature(True),
-                "renamed": dexClass.isRenamed()
+                "success": True,
+                "version": tree.generation,
+                "packages": [format_package_node(name, level, node) for name, level, node in nodes]
             }
         except Exception as e:
             return {
@@ -782,7 +2438,7 @@ class JebOperations(object):
                 ).format(exc=str(e)),
                 "traceback": traceback.format_exc()
             }
-    
+
     def unload_projects(self):
         """Unload all projects from JEB"""
         return self.project_manager.unload_projects()
@@ -882,10 +2538,9 @@ class JebOperations(object):
         Check if the specified package_name is a package.
         """
         try:
-            dexUnit = self.project_manager.get_current_dex_unit()
-            if dexUnit is None:
-                return {"success": False, "error": "No DEX unit currently loaded in JEB"}
-            
+            dexUnit, err = self.project_manager.get_current_dex_unit()
+            if err: return err
+
             isPackage = False
             dexPackage = dexUnit.getPackage(package_name)
             if dexPackage is not None:
@@ -911,22 +2566,27 @@ class JebOperations(object):
             dexUnit, err = self.project_manager.get_current_dex_unit()
             if err: return err
 
-            dexMethod = self._find_method(dexUnit, class_signature, method_name)
-            if dexMethod is None:
-                return {"success": False, "error": "Method not found: %s" % method_name}
+            with self.rename_lock:
+                synced = self._renames_synced(dexUnit)
+                dexMethod = self._find_method(dexUnit, class_signature, method_name)
+                if dexMethod is None:
+                    return {"success": False, "error": "Method not found: %s" % method_name}
 
-            if index < 0:
-                return {"success": False, "error": "Parameter index cannot be negative: %d" % index}
-            
-            dexMethodParameterLength = len(dexMethod.getParameterTypes())
-            if index >= dexMethodParameterLength:
-                return {"success": False, "error": "Parameter index out of range: %d" % index}
-            
-            result = dexMethod.setParameterName(index, name, fail_on_conflict, notify)
-            if not result:
-                return {"success": False, "error": "Failed to set parameter name"}
-            
-            return {"success": True}
+                if index < 0:
+                    return {"success": False, "error": "Parameter index cannot be negative: %d" % index}
+
+                dexMethodParameterLength = len(dexMethod.getParameterTypes())
+                if index >= dexMethodParameterLength:
+                    return {"success": False, "error": "Parameter index out of range: %d" % index}
+
+                result = dexMethod.setParameterName(index, name, fail_on_conflict, notify)
+                if not result:
+                    return {"success": False, "error": "Failed to set parameter name"}
+                self.index_registry.bump_generation(dexUnit)
+                self._journal_renames([{"kind": "parameter", "target": dexMethod.getSignature(False),
+                                        "index": index, "new_name": name}], synced=synced)
+
+                return {"success": True}
         except Exception as e:
             return {
                 "success": False,
@@ -937,7 +2597,7 @@ class JebOperations(object):
                 "traceback": traceback.format_exc()
             }
     
-    def find_class(self, class_signature):
+    def find_class(self, class_signature, fields=None):
         """Find a class by its signature in the current project"""
         try: 
             dexUnit, err = self.project_manager.get_current_dex_unit()
@@ -947,13 +2607,14 @@ class JebOperations(object):
             if dexClass is None: 
                 return {"success": False, "error": "Class not found: %s" % class_signature}
 
-            return {
-                "success": True, 
-                "current_name": dexClass.getName(True),
-                "original_name": dexClass.getName(False),
-                "signature": dexClass.getSignature(True),
-                "renamed": dexClass.isRenamed()
-            }
+            result = {"success": True}
+            result.update(select((
+                ("current_name", lambda: dexClass.getName(True)),
+                ("original_name", lambda: dexClass.getName(False)),
+                ("signature", lambda: dexClass.getSignature(True)),
+                ("renamed", lambda: dexClass.isRenamed()),
+            ), fields))
+            return result
         except Exception as e:
             return {
                 "success": False,
@@ -965,7 +2626,7 @@ class JebOperations(object):
             }
         
     
-    def find_method(self, class_signature, method_name):
+    def find_method(self, class_signature, method_name, fields=None):
         """Find a method by its signature in the current project"""
         try: 
             dexUnit, err = self.project_manager.get_current_dex_unit()
@@ -975,16 +2636,19 @@ class JebOperations(object):
             if dexMethod is None: 
                 return {"success": False, "error": "Method not found: %s" % method_name}
             
-            dexResultType = "None" if dexMethod.getReturnType() is None else dexMethod.getReturnType().getSignature(True)
-
-            return {
-                "success": True, 
-                "current_name": dexMethod.getName(True),
-                "original_name": dexMethod.getName(False),
-                "signature": dexMethod.getSignature(True),
-                "result_type": dexResultType,
-                "renamed": dexMethod.isRenamed(),
-            }
+            def result_type():
+                return_type = dexMethod.getReturnType()
+                return "None" if return_type is None else return_type.getSignature(True)
+
+            result = {"success": True}
+            result.update(select((
+                ("current_name", lambda: dexMethod.getName(True)),
+                ("original_name", lambda: dexMethod.getName(False)),
+                ("signature", lambda: dexMethod.getSignature(True)),
+                ("result_type", result_type),
+                ("renamed", lambda: dexMethod.isRenamed()),
+            ), fields))
+            return result
 
         except Exception as e:
             return {
@@ -996,7 +2660,7 @@ class JebOperations(object):
                 "traceback": traceback.format_exc()
             }
 
-    def find_field(self, class_signature, field_name):
+    def find_field(self, class_signature, field_name, fields=None):
         """Find a field by its signature in the current project"""
         try: 
             dexUnit, err = self.project_manager.get_current_dex_unit()
@@ -1006,14 +2670,15 @@ class JebOperations(object):
             if dexField is None: 
                 return {"success": False, "error": "Field not found: %s" % field_name}
             
-            return {
-                "success": True, 
-                "current_name": dexField.getName(True),
-                "original_name": dexField.getName(False),
-                "signature": dexField.getSignature(True),
-                "class_type_signature": dexField.getClassTypeSignature(True),
-                "renamed": dexField.isRenamed(),
-            }
+            result = {"success": True}
+            result.update(select((
+                ("current_name", lambda: dexField.getName(True)),
+                ("original_name", lambda: dexField.getName(False)),
+                ("signature", lambda: dexField.getSignature(True)),
+                ("class_type_signature", lambda: dexField.getClassTypeSignature(True)),
+                ("renamed", lambda: dexField.isRenamed()),
+            ), fields))
+            return result
         except Exception as e:
             return {
                 "success": False,
@@ -1038,11 +2703,14 @@ class JebOperations(object):
                 "traceback": traceback.format_exc()
             }
     
-    def switch_active_artifact(self, artifact_id):
-        """切换活动 Artifact"""
+    def switch_active_artifact(self, artifact_id, warmup=True):
+        """切换活动 Artifact，warmup 为 True 时在后台预热其入口类"""
         try: 
             if self.project_manager.switch_active_artifact(artifact_id):
-                return {"success": True}
+                result = {"success": True}
+                if warmup:
+                    result["warmup_job_id"] = self._start_warmup(self.project_manager.active_artifact)
+                return result
             return {"success": False, "error": "Failed to switch active artifact"}
         except Exception as e:
             return {
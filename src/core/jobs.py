@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Background job module - long-running plugin tasks with progress, cancellation and status
+"""
+import threading
+import time
+import traceback
+from collections import OrderedDict
+
+
+class BackgroundJob(object):
+    """Base class for jobs running in a daemon thread; subclasses implement run()"""
+
+    KIND = "job"
+    MAX_REPORTED_FAILURES = 100
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.state = "pending"
+        self.total = 0
+        self.done = 0
+        self.skipped = 0
+        self.failures = []
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self._cancel = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run_wrapper, name=self.job_id)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run_wrapper(self):
+        self.state = "running"
+        self.started_at = time.time()
+        try:
+            self.run()
+            self.state = "cancelled" if self.cancelled else "finished"
+        except Exception as e:
+            self.state = "failed"
+            self.error = "%s\n%s" % (str(e), traceback.format_exc())
+        finally:
+            self.finished_at = time.time()
+
+    def run(self):
+        raise NotImplementedError
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def finished(self):
+        return self.state in ("finished", "cancelled", "failed")
+
+    def record_done(self):
+        with self._lock:
+            self.done += 1
+
+    def record_skipped(self):
+        with self._lock:
+            self.skipped += 1
+
+    def record_failure(self, item, reason):
+        with self._lock:
+            self.failures.append({"item": item, "reason": reason})
+
+    def status(self):
+        """任务状态快照"""
+        end = self.finished_at or time.time()
+        result = {
+            "job_id": self.job_id,
+            "kind": self.KIND,
+            "state": self.state,
+            "total": self.total,
+            "done": self.done,
+            "skipped": self.skipped,
+            "failed": len(self.failures),
+            "failures": self.failures[:self.MAX_REPORTED_FAILURES],
+            "elapsed_s": round(end - self.started_at, 1) if self.started_at else 0,
+        }
+        if self.error:
+            result["error"] = self.error
+        return result
+
+
+class JobManager(object):
+    """Keeps submitted jobs by id"""
+
+    def __init__(self):
+        self._jobs = OrderedDict()
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def submit(self, job_class, *args, **kwargs):
+        """创建 job_class 任务（id 为 KIND-序号）并启动"""
+        with self._lock:
+            self._counter += 1
+            job = job_class("%s-%d" % (job_class.KIND, self._counter), *args, **kwargs)
+            self._jobs[job.job_id] = job
+        job.start()
+        return job
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def running(self, kind=None):
+        return [job for job in self._jobs.values()
+                if not job.finished and (kind is None or job.KIND == kind)]
+
+    def list(self):
+        return [job.status() for job in self._jobs.values()]
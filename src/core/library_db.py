@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Library detection module - tags bundled third-party code using a local fingerprint database
+"""
+import codecs
+import json
+import os
+import re
+from collections import defaultdict
+
+from core.fingerprints import FINGERPRINT_VERSION
+
+
+DEFAULT_LIBRARY_DIR = os.path.join(os.path.expanduser("~"), ".jebmcp", "libraries")
+
+# 指令数少于此值的方法（getter、空构造等）在各处都会撞哈希，不参与匹配
+MIN_METHOD_SIZE = 4
+
+LIBRARY_NAME_PATTERN = re.compile(r"^[\w.\-]+$")
+
+
+def library_dir():
+    """指纹库目录，可用环境变量 JEBMCP_LIBRARY_DIR 覆盖"""
+    return os.environ.get("JEBMCP_LIBRARY_DIR") or DEFAULT_LIBRARY_DIR
+
+
+def class_package(class_signature):
+    path = class_signature[1:-1]
+    return path.rsplit("/", 1)[0] if "/" in path else ""
+
+
+class LibraryDatabase(object):
+    """
+    Fingerprints of known libraries, one JSON file per library:
+
+        {"name": "okhttp-4.12", "package": "okhttp3", "version": 2,
+         "class_hashes": [...], "method_hashes": [...]}
+
+    Hashes are StructuralFingerprints strict hashes, which do not depend on
+    names, so a library still matches after ProGuard renamed it. New
+    libraries are added by dropping files into the directory or with
+    export_fingerprints(). Files written by another FINGERPRINT_VERSION are
+    listed as stale and not matched; re-export them.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.libraries = []
+        self.class_hashes = {}
+        self.method_hashes = defaultdict(set)
+
+    @classmethod
+    def load(cls, directory):
+        db = cls(directory)
+        if not os.path.isdir(directory):
+            return db
+        for file_name in sorted(os.listdir(directory)):
+            if not file_name.endswith(".json"):
+                continue
+            with codecs.open(os.path.join(directory, file_name), "r", "utf-8") as f:
+                data = json.load(f)
+            name = data.get("name") or file_name[:-5]
+            library = {"name": name, "package": data.get("package", ""),
+                       "class_count": len(data.get("class_hashes", [])),
+                       "method_count": len(data.get("method_hashes", []))}
+            db.libraries.append(library)
+            if data.get("version", 1) != FINGERPRINT_VERSION:
+                library["stale"] = True
+                continue
+            for class_hash in data.get("class_hashes", []):
+                db.class_hashes.setdefault(class_hash, name)
+            for method_hash in data.get("method_hashes", []):
+                db.method_hashes[method_hash].add(name)
+        return db
+
+    def export_fingerprints(self, name, package, fingerprints, class_signatures):
+        """把 class_signatures（原始签名）的指纹写成一个库文件，返回 (路径, 类数, 方法数)"""
+        class_hashes = set()
+        method_hashes = set()
+        for class_sig in class_signatures:
+            class_hashes.add(fingerprints.class_strict[class_sig])
+            for index in fingerprints.class_methods.get(class_sig, ()):
+                if fingerprints.method_size.get(index, 0) >= MIN_METHOD_SIZE:
+                    method_hashes.add(fingerprints.method_strict[index])
+
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        path = os.path.join(self.directory, name + ".json")
+        with codecs.open(path, "w", "utf-8") as f:
+            json.dump({"name": name, "package": package, "version": FINGERPRINT_VERSION,
+                       "class_hashes": sorted(class_hashes), "method_hashes": sorted(method_hashes)}, f)
+        return path, len(class_hashes), len(method_hashes)
+
+
+class LibraryTags(object):
+    """
+    Library membership of the classes of one artifact.
+
+    A class is tagged when its class hash is in the database, or when at
+    least min_ratio of its non-trivial methods (and MIN_CLASS_METHODS of
+    them) belong to one library, which tolerates methods removed by
+    shrinking. A package is tagged with the library covering most of its
+    classes once that share reaches min_ratio.
+    """
+
+    NAME = "library_tags"
+    MIN_CLASS_METHODS = 2
+
+    def __init__(self):
+        self.classes = {}
+        self.packages = {}
+        self.method_class = {}
+
+    @classmethod
+    def detect(cls, fingerprints, db, min_ratio=0.5):
+        tags = cls()
+        tags.method_class = fingerprints.method_class
+        package_classes = defaultdict(int)
+        package_votes = defaultdict(lambda: defaultdict(int))
+
+        for class_sig, class_hash in fingerprints.class_strict.items():
+            package = class_package(class_sig)
+            package_classes[package] += 1
+
+            library, score = db.class_hashes.get(class_hash), 1.0
+            if library is None:
+                library, score = cls._vote(fingerprints, db, class_sig, min_ratio)
+            if library is None:
+                continue
+            tags.classes[class_sig] = (library, score)
+            package_votes[package][library] += 1
+
+        for package, votes in package_votes.items():
+            library, count = max(votes.items(), key=lambda item: item[1])
+            ratio = float(count) / package_classes[package]
+            if ratio >= min_ratio:
+                tags.packages[package] = {"library": library, "class_count": package_classes[package],
+                                          "tagged_classes": count, "ratio": round(ratio, 4)}
+        return tags
+
+    @classmethod
+    def _vote(cls, fingerprints, db, class_sig, min_ratio):
+        votes = defaultdict(int)
+        considered = 0
+        for index in fingerprints.class_methods.get(class_sig, ()):
+            if fingerprints.method_size.get(index, 0) < MIN_METHOD_SIZE:
+                continue
+            considered += 1
+            for library in db.method_hashes.get(fingerprints.method_strict[index], ()):
+                votes[library] += 1
+        if not votes:
+            return None, 0.0
+        library, count = max(votes.items(), key=lambda item: item[1])
+        score = float(count) / considered
+        if count < cls.MIN_CLASS_METHODS or score < min_ratio:
+            return None, 0.0
+        return library, round(score, 4)
+
+    def contains_class(self, class_signature):
+        return class_signature in self.classes
+
+    def contains_method(self, method_index):
+        return self.method_class.get(method_index) in self.classes
+
+    def summary(self):
+        by_library = defaultdict(int)
+        for library, _ in self.classes.values():
+            by_library[library] += 1
+        return {
+            "tagged_classes": len(self.classes),
+            "tagged_packages": len(self.packages),
+            "libraries": dict(by_library),
+        }
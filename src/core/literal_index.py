@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Literal index module - maps const-string values and numeric literals to the code using them
+"""
+import re
+
+from core.index_registry import iter_code_methods, pool_index
+from utils.literals import constant_candidates, format_hex, parse_int
+
+
+class LiteralIndex(object):
+    """One-pass index of string and numeric constants over every method's instructions"""
+
+    NAME = "literals"
+
+    # const/4 只能编码 -8..7，几乎全是布尔值和循环计数，不建索引
+    NUMERIC_MNEMONICS = (
+        "const/16", "const", "const/high16",
+        "const-wide/16", "const-wide/32", "const-wide", "const-wide/high16",
+    )
+    WIDE_PREFIX = "const-wide"
+    STRING_MNEMONICS = ("const-string", "const-string/jumbo")
+
+    def __init__(self):
+        # value -> [(method_index, offset), ...]
+        self.strings = {}
+        self.constants = {}
+        # 出现在 const-wide 指令中的值，十六进制按 64 位显示
+        self.wide = set()
+        self.method_count = 0
+
+    @classmethod
+    def build(cls, dex_unit):
+        """遍历所有方法的指令，收集字符串与数值常量的引用位置"""
+        index = cls()
+        string_cache = {}
+        for method, instructions in iter_code_methods(dex_unit):
+            index.method_count += 1
+            method_index = method.getIndex()
+            for ins in instructions:
+                if ins is None:
+                    continue
+                mnemonic = ins.getMnemonic()
+                if mnemonic in cls.STRING_MNEMONICS:
+                    string_index = pool_index(ins)
+                    if string_index is None:
+                        continue
+                    value = string_cache.get(string_index)
+                    if value is None:
+                        string_obj = dex_unit.getString(string_index)
+                        if string_obj is None or string_obj.getValue() is None:
+                            continue
+                        value = string_obj.getValue()
+                        string_cache[string_index] = value
+                    index.strings.setdefault(value, []).append((method_index, ins.getOffset()))
+                elif mnemonic in cls.NUMERIC_MNEMONICS:
+                    operand = ins.getOperand(1)
+                    if operand is None:
+                        continue
+                    value = operand.getValue()
+                    index.constants.setdefault(value, []).append((method_index, ins.getOffset()))
+                    if mnemonic.startswith(cls.WIDE_PREFIX):
+                        index.wide.add(value)
+        return index
+
+    def match_strings(self, query, regex=False):
+        """按子串或正则匹配字符串常量，返回排序后的 [(value, refs)]"""
+        if regex:
+            pattern = re.compile(query)
+            matched = [s for s in self.strings if pattern.search(s)]
+        else:
+            matched = [s for s in self.strings if query in s]
+        matched.sort()
+        return [(s, self.strings[s]) for s in matched]
+
+    def match_constants(self, query, regex=False):
+        """
+        匹配数值常量，返回排序后的 [(value, refs)]
+
+        非正则模式下 query 能解析为整数（十进制或 0x 十六进制）时精确匹配（含无符号查询对应的补码），
+        否则在十六进制表示（按指令宽度无符号）上做子串匹配；正则模式同时匹配十进制和十六进制表示。
+        """
+        if regex:
+            pattern = re.compile(query)
+            matched = [v for v in self.constants
+                       if pattern.search(str(v)) or pattern.search(self.hex(v))]
+        else:
+            value = parse_int(query)
+            if value is not None:
+                matched = [v for v in constant_candidates(value) if v in self.constants]
+            else:
+                needle = str(query).lower()
+                matched = [v for v in self.constants if needle in self.hex(v)]
+        matched.sort()
+        return [(v, self.constants[v]) for v in matched]
+
+    def hex(self, value):
+        """按指令宽度的无符号十六进制表示"""
+        return format_hex(value, 64 if value in self.wide else 32)
+
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Package tree module - package hierarchy with per-package class, member and size statistics
+"""
+import threading
+
+
+OBFUSCATED_NAME_MAX_LENGTH = 2
+
+
+def is_obfuscated_name(class_signature):
+    """简单类名（去掉外部类）不超过两个字符时视为混淆名，如 La/b/c; 或 La/b$a;"""
+    simple = class_signature[1:-1].rsplit("/", 1)[-1].rsplit("$", 1)[-1]
+    return len(simple) <= OBFUSCATED_NAME_MAX_LENGTH
+
+
+def class_package(class_signature):
+    """'Lcom/a/B;' -> 'com/a'，默认包返回空字符串"""
+    path = class_signature[1:-1]
+    return path.rsplit("/", 1)[0] if "/" in path else ""
+
+
+class PackageTree(object):
+    """
+    Package hierarchy over the class snapshot.
+
+    Per-class counts (methods, fields, instructions) and the obfuscated flag
+    come from the original names and bytecode and are read once; the tree
+    itself follows current names and is re-aggregated when the snapshot
+    generation changes, since renames can move classes between packages.
+    """
+
+    NAME = "package_tree"
+
+    def __init__(self, snapshot, class_stats):
+        """
+        Args:
+            snapshot: ClassSnapshot
+            class_stats: 与 snapshot 位置对应的 (method_count, field_count, instruction_count, obfuscated)
+        """
+        self.snapshot = snapshot
+        self.class_stats = class_stats
+        self.generation = None
+        self.nodes = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, snapshot):
+        stats = []
+        for clazz, original in zip(snapshot.classes, snapshot.original):
+            methods = clazz.getMethods() or []
+            instructions = 0
+            for method in methods:
+                code = method.getInstructions() if method is not None else None
+                if code:
+                    instructions += len(code)
+            stats.append((len(methods), len(clazz.getFields() or []), instructions, is_obfuscated_name(original)))
+        return cls(snapshot, stats)
+
+    def refresh(self):
+        """按 snapshot 当前的名称重新汇总（名称版本未变化时直接返回）"""
+        with self._lock:
+            if self.generation == self.snapshot.generation:
+                return
+            nodes = {"": _new_node()}
+            for position, signature in enumerate(self.snapshot.current):
+                package = class_package(signature)
+                methods, fields, instructions, obfuscated = self.class_stats[position]
+                renamed = self.snapshot.renamed[position]
+                self._ensure(nodes, package)["direct_classes"] += 1
+                while True:
+                    node = nodes[package]
+                    node["classes"] += 1
+                    node["methods"] += methods
+                    node["fields"] += fields
+                    node["instructions"] += instructions
+                    node["renamed"] += 1 if renamed else 0
+                    node["obfuscated"] += 1 if obfuscated else 0
+                    if not package:
+                        break
+                    package = package.rsplit("/", 1)[0] if "/" in package else ""
+            self.nodes = nodes
+            self.generation = self.snapshot.generation
+
+    def _ensure(self, nodes, package):
+        node = nodes.get(package)
+        if node is not None:
+            return node
+        node = nodes[package] = _new_node()
+        if package:
+            parent = package.rsplit("/", 1)[0] if "/" in package else ""
+            self._ensure(nodes, parent)["children"].add(package)
+        return node
+
+    def contains(self, package):
+        return package in self.nodes
+
+    def expand(self, package, depth=1):
+        """
+        返回 package 自身及 depth 层以内的子包，先父后子、同层按名称排序
+
+        Returns:
+            [(package, depth, node)]，package 不存在时返回 None
+        """
+        if package not in self.nodes:
+            return None
+        result = []
+        stack = [(package, 0)]
+        while stack:
+            current, level = stack.pop()
+            node = self.nodes[current]
+            result.append((current, level, node))
+            if level < depth:
+                for child in sorted(node["children"], reverse=True):
+                    stack.append((child, level + 1))
+        return result
+
+
+def _new_node():
+    return {
+        "direct_classes": 0,
+        "classes": 0,
+        "methods": 0,
+        "fields": 0,
+        "instructions": 0,
+        "renamed": 0,
+        "obfuscated": 0,
+        "children": set(),
+    }
+
+
+def format_package_node(package, depth, node):
+    """包节点转为响应中的字典"""
+    classes = node["classes"]
+    return {
+        "package": package.replace("/", "."),
+        "depth": depth,
+        "class_count": classes,
+        "direct_class_count": node["direct_classes"],
+        "method_count": node["methods"],
+        "field_count": node["fields"],
+        "instruction_count": node["instructions"],
+        "renamed_ratio": round(float(node["renamed"]) / classes, 4) if classes else 0.0,
+        "obfuscated_ratio": round(float(node["obfuscated"]) / classes, 4) if classes else 0.0,
+        "subpackage_count": len(node["children"]),
+    }
@@ -2,11 +2,13 @@
 """
 Project manager module - handles JEB project and unit management
 """
+import hashlib
 import os
 import re
 from com.pnfsoftware.jeb.core.units.code.android import IApkUnit, IDexUnit
 from com.pnfsoftware.jeb.core import ILiveArtifact, JebCoreService, ICoreContext, Artifact, RuntimeProjectUtil
 from com.pnfsoftware.jeb.core.input import FileInput
+import jarray
 from java.io import File
 from java.lang import Throwable
 
@@ -16,6 +18,8 @@ class ProjectManager(object):
     def __init__(self, ctx):
         self.ctx = ctx
         self.active_artifact = None
+        # 主 unit uid -> 输入文件 SHA-256
+        self._artifact_hashes = {}
     
     def _validate_ctx(self):
         if self.ctx is None:
@@ -51,6 +55,40 @@ class ProjectManager(object):
         self.active_artifact = auto_selected[0]
         return self.active_artifact, None
     
+    def find_live_artifact(self, name):
+        """按 Artifact 名称（加载时的文件名）查找 live artifact"""
+        for artifact in self.get_live_artifacts():
+            if artifact.getArtifact().getName() == name:
+                return artifact
+        return None
+
+    def get_artifact_hash(self, artifact):
+        """Artifact 输入文件的 SHA-256（十六进制），按主 unit 缓存"""
+        key = artifact.getMainUnit().getUid()
+        cached = self._artifact_hashes.get(key)
+        if cached is not None:
+            return cached
+
+        digest = hashlib.sha256()
+        stream = artifact.getArtifact().getInput().getStream()
+        try:
+            buf = jarray.zeros(1 << 20, 'b')
+            while True:
+                n = stream.read(buf)
+                if n < 0:
+                    break
+                digest.update(buf[:n].tostring())
+        finally:
+            stream.close()
+        self._artifact_hashes[key] = digest.hexdigest()
+        return self._artifact_hashes[key]
+
+    def get_current_artifact_hash(self):
+        """当前 Artifact 的 SHA-256，返回 (hash, err)"""
+        artifact, err = self.get_current_artifact()
+        if err: return None, err
+        return self.get_artifact_hash(artifact), None
+
     def get_current_apk_unit(self):
         """Get the current APK unit from JEB context (returns None for DEX-only artifacts)"""
         artifact, err = self.get_current_artifact()
@@ -73,7 +111,10 @@ class ProjectManager(object):
 
         if artifact is None:
             return None, {"success": False, "error": "No JEB artifact available"}
+        return self.get_artifact_dex_unit(artifact)
 
+    def get_artifact_dex_unit(self, artifact):
+        """Get the DEX unit of the given artifact, returns (unit, err)"""
         mainUnit = artifact.getMainUnit()
         if mainUnit is None:
             return None, {"success": False, "error": "No main unit available in artifact"}
@@ -88,6 +129,13 @@ class ProjectManager(object):
 
         return None, {"success": False, "error": "Unsupported artifact format: %s" % format_type}
 
+    def get_artifact_by_id(self, artifact_id):
+        """按 get_live_artifact_ids 返回的 ID 查找 artifact"""
+        for artifact in self.get_live_artifacts():
+            if artifact.getMainUnit().getName() == artifact_id:
+                return artifact
+        return None
+
     def find_apk_unit(self, project):
         """Find APK unit in the given project"""
         if project is None:
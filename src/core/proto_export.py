@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Proto export module - extracts every protobuf-lite message of the app into per-package .proto bundles
+"""
+import codecs
+import os
+
+from core.jobs import BackgroundJob
+
+
+DEFAULT_MESSAGE_BASE = "Lcom/google/protobuf/GeneratedMessageLite;"
+
+
+def message_package(class_signature):
+    """'Lcom/a/B;' -> 'com.a'，默认包返回空字符串"""
+    path = class_signature[1:-1]
+    if "/" not in path:
+        return ""
+    return path.rsplit("/", 1)[0].replace("/", ".")
+
+
+class ProtoExtractJob(BackgroundJob):
+    """
+    Parses a list of message classes with one shared ProtoParser, so every
+    message definition is decoded once for the whole run, and writes one
+    <package>.proto bundle per Java package. The parser lock is taken per
+    message, so parse_protobuf_class calls interleave with the run.
+    """
+
+    KIND = "protos"
+
+    def __init__(self, job_id, parser, output_dir, message_classes):
+        """
+        Args:
+            parser: ProtoParser，与 parse_protobuf_class 共用已解析消息缓存
+            message_classes: [IDexClass]，GeneratedMessageLite 的子类
+        """
+        BackgroundJob.__init__(self, job_id)
+        self.parser = parser
+        self.output_dir = output_dir
+        self.message_classes = message_classes
+        self.total = len(message_classes)
+        self.bundles = {}
+
+    def run(self):
+        for clazz in self.message_classes:
+            if self.cancelled:
+                break
+            signature = clazz.getSignature(True)
+            try:
+                text, _ = self.parser.parse_message(clazz)
+            except Exception as e:
+                self.record_failure(signature, str(e))
+                continue
+            self.bundles.setdefault(message_package(signature), []).append(text)
+            self.record_done()
+
+        if not os.path.isdir(self.output_dir):
+            os.makedirs(self.output_dir)
+        for package, messages in sorted(self.bundles.items()):
+            path = os.path.join(self.output_dir, (package or "_default") + ".proto")
+            with codecs.open(path, "w", "utf-8") as f:
+                if package:
+                    f.write(u"package %s;\n\n" % package)
+                f.write(u"".join(messages))
+
+    def status(self):
+        result = BackgroundJob.status(self)
+        result["output_dir"] = self.output_dir
+        result["bundle_count"] = len(self.bundles)
+        return result
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Reachability module - methods and classes reachable from the manifest entry points
+"""
+from collections import deque
+
+from com.pnfsoftware.jeb.core.units.code import ICodeItem
+
+from core.type_hierarchy import split_method_signature
+from utils.signature_utils import convert_class_signature
+
+
+class Reachability(object):
+    """
+    Slice of the program reachable from the components declared in the manifest.
+
+    Roots are every method of the Application class, activities, services,
+    receivers and providers (and their internal superclasses), since the
+    framework may call any of their callbacks. Reaching a class runs its
+    <clinit>; reaching a constructor marks the class as instantiated and keeps
+    all of its instance methods, because framework callbacks (listeners,
+    Runnable.run ...) are not visible as invoke edges.
+    """
+
+    NAME = "reachability"
+
+    def __init__(self):
+        self.entry_classes = []
+        self.methods = set()
+        self.classes = set()
+        self.total_methods = 0
+        self.total_classes = 0
+
+    @classmethod
+    def build(cls, dex_unit, apk_unit, call_graph):
+        """从 manifest 组件出发，在调用图上做可达性分析"""
+        reach = cls()
+
+        class_methods = {}
+        superclass = {}
+        method_class = {}
+        for clazz in dex_unit.getClasses():
+            class_sig = clazz.getSignature(False)
+            superclass[class_sig] = clazz.getSupertypeSignature(False)
+            indexes = []
+            for method in clazz.getMethods() or []:
+                indexes.append(method.getIndex())
+                method_class[method.getIndex()] = class_sig
+            class_methods[class_sig] = indexes
+            reach.total_methods += len(indexes)
+        reach.total_classes = len(class_methods)
+
+        names = [apk_unit.getApplicationName()]
+        for components in (apk_unit.getActivities(), apk_unit.getServices(),
+                           apk_unit.getReceivers(), apk_unit.getProviders()):
+            names.extend(components or [])
+
+        queue = deque()
+        instantiated = set()
+
+        def visit_method(method_index):
+            if method_index in reach.methods:
+                return
+            reach.methods.add(method_index)
+            queue.append(method_index)
+
+        def visit_class(class_sig):
+            if class_sig in reach.classes:
+                return
+            reach.classes.add(class_sig)
+            for method_index in class_methods.get(class_sig, ()):
+                if _method_name(dex_unit, method_index) == "<clinit>":
+                    visit_method(method_index)
+
+        for name in names:
+            if not name:
+                continue
+            class_sig = convert_class_signature(name)
+            if class_sig not in class_methods or class_sig in reach.entry_classes:
+                continue
+            reach.entry_classes.append(class_sig)
+            current = class_sig
+            while current in class_methods:
+                visit_class(current)
+                for method_index in class_methods[current]:
+                    visit_method(method_index)
+                current = superclass.get(current)
+
+        while queue:
+            method_index = queue.popleft()
+            class_sig = method_class.get(method_index)
+            if class_sig is not None:
+                visit_class(class_sig)
+                if class_sig not in instantiated and _method_name(dex_unit, method_index) == "<init>":
+                    instantiated.add(class_sig)
+                    for other in class_methods[class_sig]:
+                        method = dex_unit.getMethod(other)
+                        if method is not None and not method.getGenericFlags() & ICodeItem.FLAG_STATIC:
+                            visit_method(other)
+            for callee in call_graph.neighbors(method_index, True):
+                if callee in method_class:
+                    visit_method(callee)
+
+        return reach
+
+    def contains_method(self, method_index):
+        return method_index in self.methods
+
+    def contains_class(self, class_signature):
+        return class_signature in self.classes
+
+    def summary(self):
+        """可达性统计"""
+        return {
+            "entry_point_count": len(self.entry_classes),
+            "entry_points": self.entry_classes,
+            "reachable_methods": len(self.methods),
+            "reachable_classes": len(self.classes),
+            "total_methods": self.total_methods,
+            "total_classes": self.total_classes,
+            "method_ratio": round(float(len(self.methods)) / self.total_methods, 4) if self.total_methods else 0.0,
+            "class_ratio": round(float(len(self.classes)) / self.total_classes, 4) if self.total_classes else 0.0,
+        }
+
+
+def _method_name(dex_unit, method_index):
+    method = dex_unit.getMethod(method_index)
+    if method is None:
+        return None
+    return split_method_signature(method.getSignature(False))[1].split("(")[0]
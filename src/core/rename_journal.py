@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+Rename journal module - append-only log of renames per APK, compacted into a snapshot for replay
+"""
+import codecs
+import hashlib
+import json
+import os
+import threading
+
+from core.bulk_rename import set_item_name
+
+
+DEFAULT_JOURNAL_DIR = os.path.join(os.path.expanduser("~"), ".jebmcp", "journal")
+
+
+def journal_dir():
+    """日志目录，可用环境变量 JEBMCP_JOURNAL_DIR 覆盖"""
+    return os.environ.get("JEBMCP_JOURNAL_DIR") or DEFAULT_JOURNAL_DIR
+
+
+def compact_records(records):
+    """
+    合并重命名记录，每个目标只保留最终名称。
+
+    类/方法/字段按 (kind, target) 去重，参数按 (target, index) 去重；
+    局部变量按原始变量名去重，链式重命名 a->b、b->c 合并为 a->c。
+    """
+    names = {}
+    locals_by_method = {}
+    order = []
+    for record in records:
+        kind = record.get("kind")
+        target = record.get("target")
+        if kind == "local":
+            if target not in locals_by_method:
+                locals_by_method[target] = {}
+                order.append(("local", target))
+            variables = locals_by_method[target]
+            original = record.get("name")
+            for key, current in variables.items():
+                if current == original:
+                    original = key
+                    break
+            variables[original] = record.get("new_name")
+            continue
+        key = (kind, target, record.get("index"))
+        if key not in names:
+            order.append(key)
+        names[key] = record.get("new_name")
+
+    result = []
+    for key in order:
+        if key[0] == "local":
+            for original, new_name in sorted(locals_by_method[key[1]].items()):
+                if original != new_name:
+                    result.append({"kind": "local", "target": key[1], "name": original, "new_name": new_name})
+            continue
+        record = {"kind": key[0], "target": key[1], "new_name": names[key]}
+        if key[2] is not None:
+            record["index"] = key[2]
+        result.append(record)
+    return result
+
+
+class RenameJournal(object):
+    """
+    Renames of one APK (identified by its SHA-256), stored as an append-only
+    JSON-lines journal plus a compacted snapshot.
+
+    Records identify their target by original signature, so they replay onto a
+    fresh load of the same APK. Once the journal grows past COMPACT_THRESHOLD
+    records it is merged into the snapshot and truncated, which keeps replay
+    time proportional to the number of renamed items rather than to the
+    number of rename calls.
+    """
+
+    COMPACT_THRESHOLD = 1000
+
+    def __init__(self, directory, apk_hash):
+        self.directory = directory
+        self.apk_hash = apk_hash
+        self.journal_path = os.path.join(directory, apk_hash + ".journal")
+        self.snapshot_path = os.path.join(directory, apk_hash + ".snapshot.json")
+        self.pending = None
+        self._state = None
+        self._lock = threading.Lock()
+
+    def _read_journal(self):
+        records = []
+        if not os.path.exists(self.journal_path):
+            return records
+        with codecs.open(self.journal_path, "r", "utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # 写入中断留下的半行，忽略
+                    continue
+        return records
+
+    def _read_snapshot(self):
+        if not os.path.exists(self.snapshot_path):
+            return []
+        with codecs.open(self.snapshot_path, "r", "utf-8") as f:
+            return json.load(f).get("records", [])
+
+    def append(self, records):
+        """追加记录，超过阈值时自动压缩"""
+        with self._lock:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            with codecs.open(self.journal_path, "a", "utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + u"\n")
+            self._state = None
+            if self.pending is None:
+                self.pending = len(self._read_journal())
+            else:
+                self.pending += len(records)
+            if self.pending >= self.COMPACT_THRESHOLD:
+                self._compact()
+
+    def load(self):
+        """快照与日志合并后的记录"""
+        with self._lock:
+            return compact_records(self._read_snapshot() + self._read_journal())
+
+    def state(self):
+        """当前重命名状态的摘要（合并后记录的哈希），没有记录时为 "0"，追加记录后重新计算"""
+        with self._lock:
+            if self._state is None:
+                records = compact_records(self._read_snapshot() + self._read_journal())
+                text = json.dumps(records, sort_keys=True)
+                self._state = hashlib.sha1(text.encode("utf-8")).hexdigest()[:16] if records else "0"
+            return self._state
+
+    def compact(self):
+        with self._lock:
+            return self._compact()
+
+    def _compact(self):
+        records = compact_records(self._read_snapshot() + self._read_journal())
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        tmp_path = self.snapshot_path + ".tmp"
+        with codecs.open(tmp_path, "w", "utf-8") as f:
+            json.dump({"apk_sha256": self.apk_hash, "records": records}, f, ensure_ascii=False)
+        if os.path.exists(self.snapshot_path):
+            os.remove(self.snapshot_path)
+        os.rename(tmp_path, self.snapshot_path)
+        # 快照落盘后再清空日志；中途失败时记录重复出现，重放结果不变
+        open(self.journal_path, "w").close()
+        self.pending = 0
+        return records
+
+
+def replay_records(dex_unit, records):
+    """
+    按原始签名把记录应用到 dex_unit，单项不发通知，由调用方统一刷新。
+    局部变量名只存在于反编译结果中，重放 local 记录前先反编译所属方法（每个方法一次）
+
+    Returns:
+        (applied, failures) failures 为 [{"record", "error"}]
+    """
+    applied = 0
+    failures = []
+    decomp = None
+    decompiled = set()
+    for record in records:
+        kind = record.get("kind")
+        target = record.get("target")
+        try:
+            if kind == "class":
+                item = dex_unit.getClass(target)
+            elif kind == "field":
+                item = dex_unit.getField(target)
+            else:
+                item = dex_unit.getMethod(target)
+            if item is None:
+                failures.append({"record": record, "error": "Target not found"})
+                continue
+
+            if kind in ("class", "method", "field"):
+                ok = item.getName(True) == record["new_name"] or set_item_name(item, record["new_name"], False)
+            elif kind == "parameter":
+                ok = item.setParameterName(int(record["index"]), record["new_name"], False, False)
+            else:
+                if decomp is None:
+                    decomp = dex_unit.getDecompiler()
+                    if not decomp:
+                        raise Exception("Cannot acquire decompiler for unit")
+                if target not in decompiled:
+                    if not decomp.decompileMethod(item.getSignature(True)):
+                        failures.append({"record": record, "error": "Failed decompiling method"})
+                        continue
+                    decompiled.add(target)
+                ok = decomp.setIdentifierName(target, record["name"], record["new_name"])
+            if ok:
+                applied += 1
+            else:
+                failures.append({"record": record, "error": "JEB rejected the new name"})
+        except Exception as e:
+            failures.append({"record": record, "error": str(e)})
+    return applied, failures
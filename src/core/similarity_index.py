@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Similarity index module - MinHash signatures of opcode n-grams bucketed with LSH
+"""
+from collections import defaultdict
+
+from core.index_registry import iter_code_methods
+from core.fingerprints import normalize_opcode
+
+
+NGRAM = 3
+NUM_BINS = 64
+BANDS = 16
+ROWS = NUM_BINS // BANDS
+
+# 指令数少于此值的方法（getter、空构造等）彼此都很像，不进入索引
+MIN_OPCODES = 6
+
+# BANDS/ROWS 对应的 LSH 召回阈值约为 (1/BANDS)^(1/ROWS)，低于它时改为全量比较
+LSH_THRESHOLD = (1.0 / BANDS) ** (1.0 / ROWS)
+
+_MASK = 0xffffffff
+_EMPTY = _MASK + 1
+
+
+def _mix(value):
+    """32 位整数混淆（murmur3 finalizer），让 n-gram 哈希在各分箱间均匀分布"""
+    value &= _MASK
+    value ^= value >> 16
+    value = (value * 0x85ebca6b) & _MASK
+    value ^= value >> 13
+    value = (value * 0xc2b2ae35) & _MASK
+    value ^= value >> 16
+    return value
+
+
+def opcode_sequence(instructions, opcode_ids):
+    """指令 -> 规范化后的操作码编号序列，opcode_ids 在调用间共享"""
+    sequence = []
+    for ins in instructions or []:
+        if ins is None:
+            continue
+        mnemonic = normalize_opcode(ins.getMnemonic())
+        opcode_id = opcode_ids.get(mnemonic)
+        if opcode_id is None:
+            opcode_id = opcode_ids[mnemonic] = len(opcode_ids) + 1
+        sequence.append(opcode_id)
+    return sequence
+
+
+def minhash(sequence):
+    """
+    One-permutation MinHash of the opcode n-grams of sequence.
+
+    Each shingle hash picks one of NUM_BINS bins and competes for that bin's
+    minimum, so a signature costs one pass over the shingles instead of one
+    pass per hash function. Empty bins borrow the value of the next
+    non-empty bin (rotation densification), which keeps signatures of short
+    methods comparable.
+    """
+    bins = [_EMPTY] * NUM_BINS
+    for i in range(max(len(sequence) - NGRAM + 1, 1)):
+        value = 0
+        for opcode_id in sequence[i:i + NGRAM]:
+            value = (value * 0x01000193) ^ opcode_id
+        value = _mix(value)
+        position = value % NUM_BINS
+        value //= NUM_BINS
+        if value < bins[position]:
+            bins[position] = value
+
+    for position in range(NUM_BINS):
+        if bins[position] != _EMPTY:
+            continue
+        for offset in range(1, NUM_BINS):
+            donor = bins[(position + offset) % NUM_BINS]
+            if donor != _EMPTY and donor < _EMPTY:
+                bins[position] = donor + offset * _EMPTY
+                break
+    return tuple(bins)
+
+
+def estimate_similarity(left, right):
+    """两个签名的 Jaccard 相似度估计：相等分箱所占比例"""
+    return float(sum(1 for a, b in zip(left, right) if a == b)) / NUM_BINS
+
+
+class SimilarityIndex(object):
+    """
+    MinHash/LSH index of all methods with bytecode, built in one pass over
+    getInstructions().
+
+    Signatures are split into BANDS bands of ROWS values; methods sharing a
+    band land in the same bucket, so a query only compares against the
+    members of its buckets. Opcodes only (no names, strings or references)
+    enter the shingles, so renamed and slightly edited clones still match.
+    """
+
+    NAME = "similarity_index"
+
+    def __init__(self):
+        self.signatures = {}
+        self.sizes = {}
+        self.buckets = defaultdict(list)
+        self.opcode_ids = {}
+
+    @classmethod
+    def build(cls, dex_unit):
+        index = cls()
+        for method, instructions in iter_code_methods(dex_unit):
+            sequence = opcode_sequence(instructions, index.opcode_ids)
+            if len(sequence) < MIN_OPCODES:
+                continue
+            method_index = method.getIndex()
+            signature = minhash(sequence)
+            index.signatures[method_index] = signature
+            index.sizes[method_index] = len(sequence)
+            for band, key in enumerate(cls._band_keys(signature)):
+                index.buckets[(band, key)].append(method_index)
+        return index
+
+    @staticmethod
+    def _band_keys(signature):
+        return [signature[band * ROWS:(band + 1) * ROWS] for band in range(BANDS)]
+
+    def signature_of(self, method):
+        """已索引的方法直接取签名，否则现算；指令过少时返回 None"""
+        signature = self.signatures.get(method.getIndex())
+        if signature is not None:
+            return signature
+        sequence = opcode_sequence(method.getInstructions() if method.isInternal() else None, dict(self.opcode_ids))
+        if len(sequence) < MIN_OPCODES:
+            return None
+        return minhash(sequence)
+
+    def candidates(self, signature, threshold):
+        """LSH 候选集；阈值低于 LSH 召回阈值时返回全部方法"""
+        if threshold < LSH_THRESHOLD:
+            return self.signatures.keys()
+        found = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            found.update(self.buckets.get((band, key), ()))
+        return found
+
+    def query(self, method, threshold=0.7):
+        """
+        Returns:
+            [(method_index, similarity)] 按相似度降序；方法指令过少时返回 None
+        """
+        signature = self.signature_of(method)
+        if signature is None:
+            return None
+        own_index = method.getIndex()
+        matches = []
+        for method_index in self.candidates(signature, threshold):
+            if method_index == own_index:
+                continue
+            similarity = estimate_similarity(signature, self.signatures[method_index])
+            if similarity >= threshold:
+                matches.append((method_index, similarity))
+        matches.sort(key=lambda item: (-item[1], item[0]))
+        return matches
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Smali export module - structured instruction rows and a per-method formatting cache
+"""
+import threading
+from collections import OrderedDict
+
+from com.pnfsoftware.jeb.core.units.code.android.dex import IDalvikInstruction
+
+
+STRUCTURED_COLUMNS = ["offset", "mnemonic", "operands"]
+
+
+def _index_kind(mnemonic):
+    """根据助记符判断常量池索引操作数的类型"""
+    if mnemonic.startswith("const-string"):
+        return "string"
+    if mnemonic.startswith("invoke-custom"):
+        return "call_site"
+    if mnemonic.startswith("invoke-"):
+        return "method"
+    if mnemonic[:4] in ("iget", "iput", "sget", "sput"):
+        return "field"
+    if mnemonic.startswith("const-method-handle"):
+        return "method_handle"
+    if mnemonic.startswith("const-method-type"):
+        return "proto"
+    return "type"
+
+
+def _resolve_index(dex_unit, kind, value):
+    if kind == "string":
+        item = dex_unit.getString(value)
+        return item.getValue() if item else None
+    if kind == "method":
+        item = dex_unit.getMethod(value)
+    elif kind == "field":
+        item = dex_unit.getField(value)
+    elif kind == "type":
+        item = dex_unit.getType(value)
+    else:
+        return value
+    return item.getSignature(True) if item else None
+
+
+def instruction_row(dex_unit, ins):
+    """
+    将一条指令转为 [offset, mnemonic, operands]
+
+    寄存器为 "vN"，寄存器区间为 "vN..vM"，立即数为整数，分支为 {"branch": 相对偏移}，
+    常量池引用为 {kind: 解析后的值}（kind 为 string/type/field/method 等）
+    """
+    mnemonic = ins.getMnemonic()
+    operands = []
+    index_seen = False
+    for operand in ins.getOperands() or []:
+        if operand is None:
+            continue
+        op_type = operand.getType()
+        value = operand.getValue()
+        if op_type == IDalvikInstruction.TYPE_REG:
+            operands.append("v%d" % value)
+        elif op_type == IDalvikInstruction.TYPE_RGR:
+            first = value & 0xFFFFFFFF
+            count = value >> 32
+            operands.append("v%d..v%d" % (first, first + count - 1) if count else "v%d" % first)
+        elif op_type == IDalvikInstruction.TYPE_IDX:
+            # invoke-polymorphic 的第二个索引是 proto
+            kind = "proto" if index_seen else _index_kind(mnemonic)
+            index_seen = True
+            operands.append({kind: _resolve_index(dex_unit, kind, value)})
+        elif op_type == IDalvikInstruction.TYPE_BRA:
+            operands.append({"branch": value})
+        else:
+            operands.append(value)
+    return [ins.getOffset(), mnemonic, operands]
+
+
+class SmaliCache(object):
+    """LRU cache of per-method formatted output, dropped when the name generation changes"""
+
+    MAX_ENTRIES = 512
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, generation):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != generation:
+                del self._entries[key]
+                return None
+            # 移到末尾，标记为最近使用
+            del self._entries[key]
+            self._entries[key] = entry
+            return entry[1]
+
+    def put(self, key, generation, value):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (generation, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
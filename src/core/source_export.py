@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Source export module - decompiles classes in parallel and writes .java files to disk
+"""
+import codecs
+import os
+import time
+from collections import deque
+
+from java.util.concurrent import Callable, Executors, TimeUnit, TimeoutException, ExecutionException
+
+from core.jobs import BackgroundJob
+
+
+# 任务尚未开始执行时，等待结果的轮询间隔（秒）
+QUEUE_POLL_S = 0.5
+
+
+class _DecompileTask(Callable):
+    """在线程池中反编译单个类，返回源码文本（失败返回 None）；started 为开始执行的时间"""
+
+    def __init__(self, decomp, signature):
+        self.decomp = decomp
+        self.signature = signature
+        self.started = None
+
+    def call(self):
+        self.started = time.time()
+        if not self.decomp.decompileClass(self.signature):
+            return None
+        return self.decomp.getDecompiledClassText(self.signature)
+
+
+def class_source_path(output_dir, class_signature):
+    """'Lcom/a/B;' -> <output_dir>/com/a/B.java"""
+    relative = class_signature[1:-1].replace("/", os.sep) + ".java"
+    return os.path.join(output_dir, relative)
+
+
+class SourceExportJob(BackgroundJob):
+    """
+    Decompiles a list of classes with a bounded thread pool and a per-class timeout.
+
+    The timeout runs from the moment a worker starts the class, not from
+    submission. Cancelling a timed-out future does not stop JEB's decompiler,
+    so the pool is grown by one thread per timeout to replace the hung worker.
+
+    Every finished class is appended to a progress file in the output
+    directory; with resume enabled, classes already recorded as exported are
+    skipped, so an interrupted export can continue where it stopped. Failed
+    classes are retried on resume.
+    """
+
+    KIND = "export"
+    PROGRESS_FILE = ".jebmcp_export_progress"
+
+    def __init__(self, job_id, decomp, output_dir, classes, threads=2, timeout_s=60, resume=True):
+        """
+        Args:
+            decomp: IDexDecompilerUnit
+            output_dir: 输出目录
+            classes: [(original_signature, current_signature)]
+        """
+        BackgroundJob.__init__(self, job_id)
+        self.decomp = decomp
+        self.output_dir = output_dir
+        self.classes = classes
+        self.threads = max(int(threads), 1)
+        self.timeout_s = max(float(timeout_s), 1.0)
+        self.resume = resume
+        self.total = len(classes)
+
+    def _load_progress(self, progress_path):
+        exported = set()
+        if not os.path.exists(progress_path):
+            return exported
+        with codecs.open(progress_path, "r", "utf-8") as f:
+            for line in f:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) >= 2 and parts[0] == "ok":
+                    exported.add(parts[1])
+        return exported
+
+    def run(self):
+        if not os.path.isdir(self.output_dir):
+            os.makedirs(self.output_dir)
+        progress_path = os.path.join(self.output_dir, self.PROGRESS_FILE)
+        exported = self._load_progress(progress_path) if self.resume else set()
+
+        pending = deque()
+        for original, current in self.classes:
+            if original in exported:
+                self.record_skipped()
+            else:
+                pending.append((original, current))
+
+        executor = Executors.newFixedThreadPool(self.threads)
+        progress = codecs.open(progress_path, "a" if self.resume else "w", "utf-8")
+        try:
+            in_flight = deque()
+            while pending or in_flight:
+                while pending and len(in_flight) < self.threads and not self.cancelled:
+                    original, current = pending.popleft()
+                    task = _DecompileTask(self.decomp, current)
+                    in_flight.append((original, current, task, executor.submit(task)))
+                if not in_flight:
+                    break
+
+                original, current, task, future = in_flight[0]
+                # 排队时间不计入超时：任务开始执行后才按 started + timeout 等待
+                started = task.started
+                wait_s = QUEUE_POLL_S if started is None else started + self.timeout_s - time.time()
+                reason = None
+                try:
+                    text = future.get(int(max(wait_s, 0.001) * 1000), TimeUnit.MILLISECONDS)
+                    if text is None:
+                        reason = "decompiler returned no output"
+                    else:
+                        self._write_source(current, text)
+                except TimeoutException:
+                    if task.started is None or time.time() < task.started + self.timeout_s:
+                        continue
+                    future.cancel(True)
+                    self._replace_worker(executor)
+                    reason = "timeout after %ds" % self.timeout_s
+                except ExecutionException as e:
+                    reason = "decompilation error: %s" % str(e.getCause())
+                in_flight.popleft()
+
+                if reason is None:
+                    self.record_done()
+                    progress.write(u"ok\t%s\n" % original)
+                else:
+                    self.record_failure(current, reason)
+                    progress.write(u"fail\t%s\t%s\n" % (original, reason))
+                progress.flush()
+        finally:
+            progress.close()
+            executor.shutdownNow()
+
+    def _replace_worker(self, executor):
+        """超时的反编译线程无法被中断，为线程池补一个线程，避免后续类排在卡住的线程后面"""
+        size = executor.getCorePoolSize() + 1
+        executor.setMaximumPoolSize(size)
+        executor.setCorePoolSize(size)
+
+    def _write_source(self, class_signature, text):
+        path = class_source_path(self.output_dir, class_signature)
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        with codecs.open(path, "w", "utf-8") as f:
+            f.write(text)
+
+    def status(self):
+        result = BackgroundJob.status(self)
+        result["output_dir"] = self.output_dir
+        return result
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+Type hierarchy module - supertypes, subtypes, implementors and method overrides in one index
+"""
+from collections import deque
+
+from com.pnfsoftware.jeb.core.units.code import ICodeItem
+
+from core.package_tree import class_package
+
+
+# 不参与覆写的方法：构造器、静态初始化、静态方法和私有方法
+_NOT_VIRTUAL = ICodeItem.FLAG_STATIC | ICodeItem.FLAG_PRIVATE
+_VISIBLE = ICodeItem.FLAG_PUBLIC | ICodeItem.FLAG_PROTECTED
+
+
+def split_method_signature(signature):
+    """将 'Lcom/a/B;->foo(I)V' 拆分为 ('Lcom/a/B;', 'foo(I)V')"""
+    class_sig, _, sub_sig = signature.partition("->")
+    return class_sig, sub_sig
+
+
+class TypeHierarchy(object):
+    """
+    Whole-program type hierarchy keyed by original class signatures.
+
+    External types (framework, libraries not in the DEX) only appear as
+    supertypes; their own supertypes are unknown.
+    """
+
+    NAME = "type_hierarchy"
+
+    def __init__(self):
+        self.superclass = {}
+        self.interfaces = {}
+        self.subtypes = {}
+        self.interface_types = set()
+        # class_sig -> {sub_signature: method_index}
+        self.declared = {}
+        # method_index -> 访问标志
+        self.method_flags = {}
+
+    @classmethod
+    def build(cls, dex_unit):
+        """遍历所有类，记录父类、接口和声明的方法"""
+        hierarchy = cls()
+        for clazz in dex_unit.getClasses():
+            class_sig = clazz.getSignature(False)
+            if clazz.getGenericFlags() & ICodeItem.FLAG_INTERFACE:
+                hierarchy.interface_types.add(class_sig)
+            super_sig = clazz.getSupertypeSignature(False)
+            if super_sig:
+                hierarchy.superclass[class_sig] = super_sig
+                hierarchy.subtypes.setdefault(super_sig, []).append(class_sig)
+            interfaces = list(clazz.getInterfaceSignatures(False) or [])
+            hierarchy.interfaces[class_sig] = interfaces
+            for iface in interfaces:
+                hierarchy.subtypes.setdefault(iface, []).append(class_sig)
+            methods = {}
+            for method in clazz.getMethods() or []:
+                methods[split_method_signature(method.getSignature(False))[1]] = method.getIndex()
+                hierarchy.method_flags[method.getIndex()] = method.getGenericFlags()
+            hierarchy.declared[class_sig] = methods
+        return hierarchy
+
+    def is_internal(self, class_sig):
+        return class_sig in self.declared
+
+    def is_interface(self, class_sig):
+        return class_sig in self.interface_types
+
+    def direct_supertypes(self, class_sig):
+        """父类在前，接口在后"""
+        result = []
+        if class_sig in self.superclass:
+            result.append(self.superclass[class_sig])
+        result.extend(self.interfaces.get(class_sig, ()))
+        return result
+
+    def supertypes(self, class_sig):
+        """所有传递父类型，返回 [(signature, depth, child)]"""
+        return self._walk(class_sig, self.direct_supertypes)
+
+    def subtypes_of(self, class_sig):
+        """所有传递子类和实现类，返回 [(signature, depth, parent)]"""
+        return self._walk(class_sig, lambda sig: self.subtypes.get(sig, ()))
+
+    def implementors(self, class_sig):
+        """所有传递子类型中的非接口类"""
+        return [entry for entry in self.subtypes_of(class_sig) if not self.is_interface(entry[0])]
+
+    def _walk(self, class_sig, next_types):
+        seen = set([class_sig])
+        result = []
+        queue = deque([(class_sig, 0)])
+        while queue:
+            current, depth = queue.popleft()
+            for nxt in next_types(current):
+                if nxt in seen:
+                    continue
+                seen.add(nxt)
+                result.append((nxt, depth + 1, current))
+                queue.append((nxt, depth + 1))
+        return result
+
+    def resolve_method(self, class_sig, sub_sig):
+        """沿父类链查找方法定义，找不到返回 None"""
+        return self._resolve(class_sig, sub_sig)[1]
+
+    def _resolve(self, class_sig, sub_sig):
+        """沿父类链查找方法定义，返回 (声明类, method_index)，找不到返回 (None, None)"""
+        while class_sig is not None:
+            methods = self.declared.get(class_sig)
+            if methods is None:
+                return None, None
+            if sub_sig in methods:
+                return class_sig, methods[sub_sig]
+            class_sig = self.superclass.get(class_sig)
+        return None, None
+
+    def _is_virtual(self, sub_sig, method_index):
+        """可被覆写的方法；外部方法（method_index 为 None）视为可覆写"""
+        if sub_sig.startswith("<"):
+            return False
+        return method_index is None or not self.method_flags.get(method_index, 0) & _NOT_VIRTUAL
+
+    def _is_package_private(self, method_index):
+        return method_index is not None and not self.method_flags.get(method_index, 0) & _VISIBLE
+
+    def overriding_methods(self, class_sig, sub_sig):
+        """
+        子类型中覆写该方法的同签名方法。构造器、静态方法、私有方法没有覆写者；
+        包私有方法只能被同一个包中的子类覆写
+        """
+        owner, base = self._resolve(class_sig, sub_sig)
+        if not self._is_virtual(sub_sig, base):
+            return []
+        package = class_package(owner) if self._is_package_private(base) else None
+        found = []
+        for sub, _, _ in self.subtypes_of(class_sig):
+            method_index = self.declared.get(sub, {}).get(sub_sig)
+            if method_index is None or not self._is_virtual(sub_sig, method_index):
+                continue
+            if package is not None and class_package(sub) != package:
+                continue
+            found.append(method_index)
+        return found
+
+    def overridden_methods(self, class_sig, sub_sig):
+        """父类型中被该方法覆写的同签名方法，规则同 overriding_methods"""
+        if not self._is_virtual(sub_sig, self.declared.get(class_sig, {}).get(sub_sig)):
+            return []
+        found = []
+        for sup, _, _ in self.supertypes(class_sig):
+            method_index = self.declared.get(sup, {}).get(sub_sig)
+            if method_index is None or not self._is_virtual(sub_sig, method_index):
+                continue
+            if self._is_package_private(method_index) and class_package(sup) != class_package(class_sig):
+                continue
+            found.append(method_index)
+        return found
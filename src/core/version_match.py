@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Version match module - pairs classes, methods and fields of two builds by structural fingerprints
+"""
+from collections import defaultdict
+
+
+CLASS_STRICT = 1.0
+CLASS_LOOSE = 0.8
+CLASS_VOTES_BASE = 0.6
+CLASS_VOTES_WEIGHT = 0.3
+METHOD_LOOSE_FACTOR = 0.85
+METHOD_GLOBAL = 0.7
+FIELD_FACTOR = 0.9
+
+MIN_CLASS_VOTES = 2
+MIN_VOTE_RATIO = 0.5
+
+
+def unique_pairs(old_items, new_items, old_key, new_key):
+    """按哈希分桶，只返回两侧桶内都恰好一个元素的 (old, new) 对"""
+    buckets = defaultdict(lambda: ([], []))
+    for item in old_items:
+        buckets[old_key(item)][0].append(item)
+    for item in new_items:
+        buckets[new_key(item)][1].append(item)
+    return [(olds[0], news[0]) for olds, news in buckets.values() if len(olds) == 1 and len(news) == 1]
+
+
+class VersionMatch(object):
+    """
+    Correspondence between an old and a new build of the same app.
+
+    Matching runs in tiers, each one a dict bucketing pass, so the cost stays
+    near-linear in the number of items:
+      1. classes with a unique strict, then a unique loose class hash
+      2. methods inside matched class pairs by unique strict, then loose hash
+      3. methods of the remaining classes by globally unique strict hash; a
+         class whose methods mostly land in one old class is matched to it
+      4. fields inside matched class pairs by unique (type, static) shape
+    Confidences multiply down from the class match to its members.
+    """
+
+    def __init__(self, old, new):
+        """old/new: StructuralFingerprints"""
+        self.old = old
+        self.new = new
+        self.classes = {}
+        self.methods = {}
+        self.fields = {}
+        self._old_methods = set()
+
+    @classmethod
+    def build(cls, old, new):
+        match = cls(old, new)
+        match._match_classes()
+        for new_sig, (old_sig, confidence) in list(match.classes.items()):
+            match._match_members(old_sig, new_sig, confidence)
+        match._match_by_votes()
+        for new_sig, (old_sig, confidence) in match.classes.items():
+            match._match_fields(old_sig, new_sig, confidence)
+        return match
+
+    def _match_classes(self):
+        old, new = self.old, self.new
+        for hashes_old, hashes_new, confidence in ((old.class_strict, new.class_strict, CLASS_STRICT),
+                                                   (old.class_loose, new.class_loose, CLASS_LOOSE)):
+            matched_old = set(pair[0] for pair in self.classes.values())
+            pairs = unique_pairs([sig for sig in hashes_old if sig not in matched_old],
+                                 [sig for sig in hashes_new if sig not in self.classes],
+                                 hashes_old.get, hashes_new.get)
+            for old_sig, new_sig in pairs:
+                self.classes[new_sig] = (old_sig, confidence)
+
+    def _match_members(self, old_sig, new_sig, confidence):
+        old_methods = [m for m in self.old.class_methods.get(old_sig, ()) if m not in self._old_methods]
+        new_methods = [m for m in self.new.class_methods.get(new_sig, ()) if m not in self.methods]
+        for old_hashes, new_hashes, factor in ((self.old.method_strict, self.new.method_strict, 1.0),
+                                               (self.old.method_loose, self.new.method_loose, METHOD_LOOSE_FACTOR)):
+            for old_index, new_index in unique_pairs(old_methods, new_methods, old_hashes.get, new_hashes.get):
+                self._add_method(new_index, old_index, round(confidence * factor, 4))
+            old_methods = [m for m in old_methods if m not in self._old_methods]
+            new_methods = [m for m in new_methods if m not in self.methods]
+
+    def _add_method(self, new_index, old_index, confidence):
+        self.methods[new_index] = (old_index, confidence)
+        self._old_methods.add(old_index)
+
+    def _match_by_votes(self):
+        matched_old_classes = set(pair[0] for pair in self.classes.values())
+        old_methods = [m for m, sig in self.old.method_class.items() if sig not in matched_old_classes]
+        new_methods = [m for m, sig in self.new.method_class.items() if sig not in self.classes]
+        pairs = unique_pairs(old_methods, new_methods, self.old.method_strict.get, self.new.method_strict.get)
+
+        votes = defaultdict(lambda: defaultdict(int))
+        for old_index, new_index in pairs:
+            votes[self.new.method_class[new_index]][self.old.method_class[old_index]] += 1
+
+        claimed = defaultdict(list)
+        for new_sig, by_old in votes.items():
+            old_sig, count = max(by_old.items(), key=lambda item: item[1])
+            ratio = float(count) / max(len(self.new.class_methods.get(new_sig, ())), 1)
+            if count >= MIN_CLASS_VOTES and ratio >= MIN_VOTE_RATIO:
+                claimed[old_sig].append((new_sig, ratio))
+        for old_sig, candidates in claimed.items():
+            if len(candidates) == 1:
+                new_sig, ratio = candidates[0]
+                confidence = round(CLASS_VOTES_BASE + CLASS_VOTES_WEIGHT * ratio, 4)
+                self.classes[new_sig] = (old_sig, confidence)
+                self._match_members(old_sig, new_sig, confidence)
+
+        for old_index, new_index in pairs:
+            if new_index not in self.methods and old_index not in self._old_methods:
+                self._add_method(new_index, old_index, METHOD_GLOBAL)
+
+    def _match_fields(self, old_sig, new_sig, confidence):
+        shape = lambda field: (field[1], field[2])
+        pairs = unique_pairs(self.old.class_fields.get(old_sig, ()), self.new.class_fields.get(new_sig, ()),
+                             shape, shape)
+        for old_field, new_field in pairs:
+            self.fields[new_field[0]] = (old_field[0], round(confidence * FIELD_FACTOR, 4))
+
+    def summary(self):
+        return {
+            "matched_classes": len(self.classes),
+            "matched_methods": len(self.methods),
+            "matched_fields": len(self.fields),
+            "new_classes": len(self.new.class_strict),
+            "new_methods": len(self.new.method_strict),
+        }
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+Warm-up module - decompiles the manifest entry classes in the background after a project is opened
+"""
+import xml.etree.ElementTree as ET
+
+from java.lang import Thread
+
+from core.jobs import BackgroundJob
+from utils.signature_utils import convert_class_signature
+
+
+ANDROID_NS = "{http://schemas.android.com/apk/res/android}"
+
+COMPONENT_TAGS = ("activity", "activity-alias", "service", "receiver", "provider")
+
+# 预热只覆盖最先被查看的入口类，组件很多的应用不全部预热
+MAX_WARMUP_CLASSES = 32
+
+
+def _full_name(package_name, name):
+    """'.Main' / 'Main' -> 'com.example.Main'"""
+    if not name:
+        return None
+    if name.startswith("."):
+        return (package_name or "") + name
+    if "." not in name and package_name:
+        return package_name + "." + name
+    return name
+
+
+def _is_launcher(elem):
+    for intent_filter in elem.findall("intent-filter"):
+        actions = [a.get(ANDROID_NS + "name") for a in intent_filter.findall("action")]
+        categories = [c.get(ANDROID_NS + "name") for c in intent_filter.findall("category")]
+        if "android.intent.action.MAIN" in actions and "android.intent.category.LAUNCHER" in categories:
+            return True
+    return False
+
+
+def _is_exported(elem):
+    """显式 android:exported，未声明时带 intent-filter 的组件视为导出（targetSdk < 31 的默认行为）"""
+    exported = elem.get(ANDROID_NS + "exported")
+    if exported is not None:
+        return exported == "true"
+    return elem.find("intent-filter") is not None
+
+
+def warmup_classes(manifest_text, package_name, limit=MAX_WARMUP_CLASSES):
+    """
+    预热顺序：Application、启动 Activity、其余导出组件（按 manifest 中的顺序）
+
+    Returns:
+        [类签名]，如 ['Lcom/example/App;', ...]
+    """
+    root = ET.fromstring(manifest_text.encode("utf-8"))
+    package_name = root.get("package") or package_name
+    app = root.find("application")
+    if app is None:
+        return []
+
+    launchers, exported = [], []
+    for elem in app:
+        if elem.tag not in COMPONENT_TAGS:
+            continue
+        name = elem.get(ANDROID_NS + ("targetActivity" if elem.tag == "activity-alias" else "name"))
+        if elem.tag in ("activity", "activity-alias") and _is_launcher(elem):
+            launchers.append(name)
+        elif _is_exported(elem):
+            exported.append(name)
+
+    classes = []
+    for name in [app.get(ANDROID_NS + "name")] + launchers + exported:
+        name = _full_name(package_name, name)
+        if not name:
+            continue
+        signature = convert_class_signature(name)
+        if signature not in classes:
+            classes.append(signature)
+    return classes[:limit]
+
+
+class WarmupJob(BackgroundJob):
+    """
+    Decompiles a short list of classes at minimum thread priority so the
+    first requests of a session hit warm decompiler and disk caches.
+
+    The job is cancelled as soon as a real request arrives; the class being
+    decompiled at that moment is finished, the rest are skipped.
+    """
+
+    KIND = "warmup"
+
+    def __init__(self, job_id, decompile, classes):
+        """
+        Args:
+            decompile: decompile(class_signature) -> True 表示命中缓存，失败时抛出异常
+            classes: [类签名]
+        """
+        BackgroundJob.__init__(self, job_id)
+        self.decompile = decompile
+        self.classes = classes
+        self.total = len(classes)
+
+    def run(self):
+        Thread.currentThread().setPriority(Thread.MIN_PRIORITY)
+        for class_signature in self.classes:
+            if self.cancelled:
+                break
+            try:
+                if self.decompile(class_signature):
+                    self.record_skipped()
+                else:
+                    self.record_done()
+            except Exception as e:
+                self.record_failure(class_signature, str(e))
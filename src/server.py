@@ -3,19 +3,27 @@
 JEBMCP Server - MCP server with GZIP compression support for JSON-RPC
 """
 import os
+import re
 import sys
 import gzip
 import json
 import uuid
 import argparse
 import socket
+import sqlite3
 import http.client
 import threading
+import time
+from typing import List
 from fastmcp import FastMCP
 from utils.manifest_parser import (
     parse_manifest_root, android_attr, extract_attrs,
     extract_intent_filters, extract_meta_data,
 )
+from utils.index_store import IndexStore, KINDS as INDEX_STORE_KINDS, NAME_KINDS, SCHEMA_VERSION
+from utils.literals import constant_candidates, parse_int
+from utils.projection import project
+from utils.rpc_response import splice_result
 
 mcp = FastMCP()
 
@@ -49,7 +57,8 @@ def make_jsonrpc_request(
     jeb_port: int = 16161,
     jeb_path: str = "/mcp",
     timeout: int = 30,
-    use_compression: bool = True
+    use_compression: bool = True,
+    fields: List[str] = None
 ) -> str:
     """
     转发到本地 JEB 插件的 JSON-RPC 接口 (默认 http://127.0.0.1:16161/mcp)
@@ -57,28 +66,27 @@ def make_jsonrpc_request(
 
     Args:
         use_compression: 是否对大请求/响应使用 gzip 压缩
+        fields: 属性投影，随请求发送，由插件只计算并返回这些属性
     """
     try:
         # 验证方法名
         if not isinstance(method, str) or not method.strip():
             return json.dumps({"error": "Invalid method name"})
 
-        # 验证参数是否可序列化
-        json_params = list(params)
-        try:
-            json.dumps(json_params)
-        except (TypeError, ValueError) as e:
-            return json.dumps({"error": f"Parameter validation failed: {str(e)}"})
-
         request = {
             "jsonrpc": "2.0",
             "method": method,
-            "params": json_params,
+            "params": list(params),
             "id": str(uuid.uuid4()),
         }
+        if fields:
+            request["fields"] = list(fields)
 
-        request_body = json.dumps(request)
-        request_bytes = request_body.encode("utf-8")
+        # 序列化一次，同时验证参数是否可序列化
+        try:
+            request_bytes = json.dumps(request).encode("utf-8")
+        except (TypeError, ValueError) as e:
+            return json.dumps({"error": f"Parameter validation failed: {str(e)}"})
 
         # 从连接池获取连接
         conn = _connection_pool.get_connection(jeb_host, jeb_port, timeout=timeout)
@@ -115,6 +123,11 @@ def make_jsonrpc_request(
             if encoding and "gzip" in encoding.lower():
                 raw_data = gzip.decompress(raw_data)
 
+            # 成功响应直接拼接 result 的原始 JSON，不做解析和重新序列化
+            spliced = splice_result(raw_data, request["id"])
+            if spliced is not None:
+                return spliced
+
             # 解析响应
             try:
                 data = json.loads(raw_data.decode("UTF-8"))
@@ -152,63 +165,244 @@ def make_jsonrpc_request(
         return json.dumps({"error": f"Unexpected error: {str(e)}"})
 
 
-def _jeb_call(method, *params) -> str:
+def _jeb_call(method, *params, fields: List[str] = None) -> str:
     """统一的 JEB 调用函数，确保始终返回字符串"""
     return make_jsonrpc_request(
         method, *params,
         jeb_host=os.environ.get("JEB_HOST", "127.0.0.1"),
         jeb_port=int(os.environ.get("JEB_PORT", "16161")),
         jeb_path=os.environ.get("JEB_PATH", "/mcp"),
+        fields=fields,
     )
 
+
+def _result_json(result, fields: List[str] = None) -> str:
+    """服务端自行计算的工具结果，按 fields 投影后序列化"""
+    return json.dumps({"result": project(result, fields)})
+
 def _get_manifest_root():
     """调用 JEB 获取 manifest XML 并解析为 ElementTree root"""
     return parse_manifest_root(_jeb_call('get_app_manifest'))
 
+
+def _jeb_result(method, *params):
+    """调用 JEB 并取出成功的 result 字典，返回 (result, None) 或 (None, error_json_str)"""
+    raw = _jeb_call(method, *params)
+    try:
+        result = json.loads(raw).get("result")
+    except json.JSONDecodeError:
+        return None, json.dumps({"result": {"success": False, "error": "Failed to parse JEB response"}})
+    if not isinstance(result, dict) or not result.get("success"):
+        return None, raw
+    return result, None
+
+
+# 持久化索引库：按 APK SHA-256 打开的 IndexStore，以及当前 artifact 的哈希（切换项目时清空）
+_index_stores = {}
+_index_lock = threading.Lock()
+_active_index = {"apk_sha256": None}
+
+# 每次从插件拉取的行数
+INDEX_EXPORT_PAGE = 20000
+
+
+def _open_index_store(apk_sha256: str) -> IndexStore:
+    with _index_lock:
+        store = _index_stores.get(apk_sha256)
+        if store is None:
+            store = _index_stores[apk_sha256] = IndexStore(apk_sha256)
+        return store
+
+
+def _forget_active_index():
+    _active_index["apk_sha256"] = None
+
+
+def _current_index_store(apk_sha256: str = ""):
+    """
+    查询用的索引库：优先用参数指定的 APK，其次用上次同步/查询时记录的当前 APK，
+    都没有时向 JEB 询问一次当前 artifact 的哈希。返回 (store, None) 或 (None, error_json_str)
+    """
+    apk_sha256 = apk_sha256 or _active_index["apk_sha256"]
+    if not apk_sha256:
+        info, err = _jeb_result('get_index_info')
+        if err:
+            return None, err
+        apk_sha256 = _active_index["apk_sha256"] = info["apk_sha256"]
+    try:
+        store = _open_index_store(apk_sha256)
+    except (ValueError, OSError, sqlite3.Error) as e:
+        return None, json.dumps({"result": {"success": False, "error": f"Cannot open index store: {e}"}})
+    if not store.kind_status():
+        return None, json.dumps({"result": {"success": False,
+            "error": "Index store is empty for this APK, call sync_index_store first"}})
+    return store, None
+
+
+def _export_pages(kind: str, errors: list):
+    """逐页从插件拉取一个种类的行；出错时记录到 errors 并抛出异常，使事务回滚"""
+    offset = 0
+    while True:
+        page, err = _jeb_result('export_index_rows', kind, offset, INDEX_EXPORT_PAGE)
+        if err:
+            errors.append(err)
+            raise RuntimeError(f"export of {kind} failed")
+        yield page["rows"]
+        if not page.get("has_more"):
+            return
+        offset += len(page["rows"])
+
 # -----------------------------
 #       MCP 工具定义
 # -----------------------------
 
 @mcp.tool()
-def load_jeb_project(apk_or_dex_path: str):
-    """Open an APK or DEX file as a new project in JEB."""
-    return _jeb_call('load_project', apk_or_dex_path)
+def load_jeb_project(apk_or_dex_path: str, replay_renames: bool = True, warmup: bool = True, fields: List[str] = None):
+    """
+    Open an APK or DEX file as a new project in JEB.
+
+    @param replay_renames: Re-apply the renames journaled for this file (matched by SHA-256)
+    @param warmup: Decompile the Application class, launcher activity and exported components
+                   in the background; stops as soon as another request arrives
+    """
+    _forget_active_index()
+    return _jeb_call('load_project', apk_or_dex_path, replay_renames, warmup, fields=fields)
 
 
 @mcp.tool()
-def has_projects():
+def has_projects(fields: List[str] = None):
     """Check if there are any projects currently loaded in JEB."""
-    return _jeb_call('has_projects')
+    return _jeb_call('has_projects', fields=fields)
 
 
 @mcp.tool()
-def get_projects():
+def get_projects(fields: List[str] = None):
     """Retrieve a list of all projects currently loaded in JEB."""
-    return _jeb_call('get_projects')
+    return _jeb_call('get_projects', fields=fields)
 
 
 @mcp.tool()
-def get_class_count():
+def get_class_count(fields: List[str] = None):
     """Get the number of classes in the current project."""
-    return _jeb_call('get_class_count')
+    return _jeb_call('get_class_count', fields=fields)
 
 
 @mcp.tool()
-def get_class_by_index(index: str):
+def get_class_by_index(index: str, fields: List[str] = None):
     """Get class information by index."""
-    return _jeb_call('get_class_by_index', index)
+    return _jeb_call('get_class_by_index', index, fields=fields)
+
+
+@mcp.tool()
+def list_classes(offset: int = 0, limit: int = 100, package_prefix: str = "", renamed_only: bool = False,
+                 sort: str = "index", cursor: str = "", fields: List[str] = None):
+    """
+    List classes page by page with their current/original signatures and renamed flag.
+    Prefer this over calling get_class_by_index in a loop.
+
+    @param package_prefix: Only list classes under this package, e.g. "com.example"
+    @param renamed_only: Only list classes that were renamed
+    @param sort: "index" (DEX order), "original" (original signature) or "name" (current signature)
+    @param cursor: next_cursor from the previous page; stays valid while classes are renamed
+    """
+    return _jeb_call('list_classes', offset, limit, package_prefix, renamed_only, sort, cursor, fields=fields)
 
 
 @mcp.tool()
-def get_current_project_info():
+def get_current_project_info(fields: List[str] = None):
     """Retrieve detailed information about the current JEB session and loaded projects."""
-    return _jeb_call('get_current_project_info')
+    return _jeb_call('get_current_project_info', fields=fields)
+
+
+@mcp.tool()
+def get_method_smali_code(class_signature: str, method_name: str, structured: bool = False,
+                          start: int = 0, count: int = 0, fields: List[str] = None):
+    """
+    Get the Smali instructions of a specific method.
+
+    @param structured: Return compact [offset, mnemonic, operands] rows (registers "vN", literals,
+                       {"string"|"type"|"field"|"method": ...} references) instead of text lines
+    @param start: Index of the first instruction to return (for huge methods)
+    @param count: Number of instructions to return, 0 for all
+    """
+    return _jeb_call('get_method_smali', class_signature, method_name, structured, start, count, fields=fields)
+
+
+@mcp.tool()
+def search_strings(query: str, regex: bool = False, offset: int = 0, limit: int = 100,
+                   reachable_only: bool = False, skip_libraries: bool = False, fields: List[str] = None):
+    """
+    Search const-string literals in all methods (URLs, keys, SQL ...) and list where they are used.
+
+    @param query: Substring to look for, or a regular expression when regex is true
+    @param regex: Treat query as a regular expression
+    @param offset: Index of the first matching string to return
+    @param limit: Maximum number of matching strings to return
+    @param reachable_only: Only keep uses inside methods reachable from manifest entry points
+    @param skip_libraries: Drop uses inside classes detected as known third-party libraries
+    """
+    return _jeb_call('search_strings', query, regex, offset, limit, reachable_only, skip_libraries, fields=fields)
+
+
+@mcp.tool()
+def search_constants(query: str, regex: bool = False, offset: int = 0, limit: int = 100,
+                     reachable_only: bool = False, skip_libraries: bool = False, fields: List[str] = None):
+    """
+    Search numeric literals (int/long constants) in all methods and list where they are used.
+
+    @param query: Decimal or 0x-hex value for an exact match, other text matches the hex form as substring
+    @param regex: Treat query as a regular expression over decimal and hex forms
+    @param offset: Index of the first matching constant to return
+    @param limit: Maximum number of matching constants to return
+    @param reachable_only: Only keep uses inside methods reachable from manifest entry points
+    @param skip_libraries: Drop uses inside classes detected as known third-party libraries
+    """
+    return _jeb_call('search_constants', query, regex, offset, limit, reachable_only, skip_libraries, fields=fields)
+
+
+@mcp.tool()
+def compute_reachability(rebuild: bool = False, fields: List[str] = None):
+    """
+    Compute the methods and classes reachable from the manifest entry points
+    (Application, activities, services, receivers, providers) and return counts.
+
+    @param rebuild: Recompute instead of returning the cached result
+    """
+    return _jeb_call('compute_reachability', rebuild, fields=fields)
+
+
+@mcp.tool()
+def detect_libraries(min_ratio: float = 0.5, offset: int = 0, limit: int = 100, fields: List[str] = None):
+    """
+    Detect bundled third-party libraries (even when renamed by ProGuard) by matching class
+    fingerprints against the local library database, and list the library packages.
+    Tagged classes can then be skipped with skip_libraries in search and export tools.
+
+    @param min_ratio: Share of a class's methods, and of a package's classes, that must match one library
+    """
+    return _jeb_call('detect_libraries', min_ratio, offset, limit, fields=fields)
 
 
 @mcp.tool()
-def get_method_smali_code(class_signature: str, method_name: str):
-    """Get all Smali instructions for a specific method."""
-    return _jeb_call('get_method_smali', class_signature, method_name)
+def add_library_fingerprints(name: str, package_prefix: str, fields: List[str] = None):
+    """
+    Add a library to the fingerprint database from the active artifact.
+    Load an unobfuscated build of the library (jar/dex/apk) in JEB and make it active first.
+
+    @param name: Library name, e.g. "okhttp-4.12"
+    @param package_prefix: Root package of the library, e.g. "okhttp3"
+    """
+    return _jeb_call('add_library_fingerprints', name, package_prefix, fields=fields)
+
+
+@mcp.tool()
+def get_reachable_classes(package_prefix: str = "", offset: int = 0, limit: int = 100, fields: List[str] = None):
+    """
+    List classes reachable from the manifest entry points, skipping dead and unreferenced code.
+
+    @param package_prefix: Only list classes under this package, e.g. "com.example"
+    """
+    return _jeb_call('get_reachable_classes', package_prefix, offset, limit, fields=fields)
 
 
 @mcp.tool()
@@ -218,7 +412,7 @@ def ping():
 
 
 @mcp.tool()
-def get_current_app_manifest(info_type: str):
+def get_current_app_manifest(info_type: str, fields: List[str] = None):
     """
     Get manifest information of the currently loaded APK project in JEB.
 
@@ -245,19 +439,19 @@ def get_current_app_manifest(info_type: str):
     if info_type in ("activity", "service", "receiver", "provider"):
         app = root.find("application")
         if app is None:
-            return json.dumps({"result": {"success": True, "component_type": info_type, "count": 0, "components": []}})
+            return _result_json({"success": True, "component_type": info_type, "count": 0, "components": []}, fields)
         components = []
         for elem in app.findall(info_type):
             comp = extract_attrs(elem)
             comp["intent_filters"] = extract_intent_filters(elem)
             comp["meta_data"] = extract_meta_data(elem)
             components.append(comp)
-        return json.dumps({"result": {
+        return _result_json({
             "success": True,
             "component_type": info_type,
             "count": len(components),
             "components": components,
-        }})
+        }, fields)
 
     # ---------- 权限 ----------
     if info_type == "permission":
@@ -283,13 +477,13 @@ def get_current_app_manifest(info_type: str):
         for elem in root.findall("permission-tree"):
             permission_trees.append(extract_attrs(elem))
 
-        return json.dumps({"result": {
+        return _result_json({
             "success": True,
             "uses_permissions": uses_permissions,
             "custom_permissions": custom_permissions,
             "permission_groups": permission_groups,
             "permission_trees": permission_trees,
-        }})
+        }, fields)
 
     # ---------- 基本信息 ----------
     # info_type == "info"
@@ -316,7 +510,7 @@ def get_current_app_manifest(info_type: str):
     if app is not None:
         libraries = [extract_attrs(e) for e in app.findall("uses-library")]
 
-    return json.dumps({"result": {
+    return _result_json({
         "success": True,
         "package": package,
         "versionCode": version_code,
@@ -325,165 +519,608 @@ def get_current_app_manifest(info_type: str):
         "application": application,
         "features": features,
         "libraries": libraries,
-    }})
+    }, fields)
+
+
+@mcp.tool()
+def get_method_decompiled_code(class_name: str, method_name: str, fields: List[str] = None):
+    """
+    Get the decompiled code of the given method.
+    The method is cut out of its class's decompiled text (kept in memory, see get_class_decompiled_code),
+    so asking for several methods of one class decompiles the class only once.
+    """
+    return _jeb_call('get_method_decompiled_code', class_name, method_name, fields=fields)
+
+
+@mcp.tool()
+def get_methods_decompiled_code(class_signature: str, methods: List[str], fields: List[str] = None):
+    """
+    Get the decompiled code of several methods of one class from a single class decompilation.
+
+    @param class_signature: Class signature, e.g. "Lcom/example/Main;"
+    @param methods: Method names (every overload is returned) or full signatures for one overload,
+                    e.g. ["onCreate", "Lcom/example/Main;->a(I)V"]
+    """
+    return _jeb_call('get_methods_decompiled_code', class_signature, methods, fields=fields)
+
+
+@mcp.tool()
+def get_class_decompiled_code(class_signature: str, fields: List[str] = None):
+    """
+    Get the decompiled code of a class.
+    Results are kept in an on-disk cache keyed by APK hash and rename state, and by a hash of
+    the class bytecode and displayed names, so reopening the same APK or meeting an identical
+    class (e.g. the same SDK) in another APK does not decompile it again ("cached": true).
+    The APK-hash key is only used for APKs opened with load_project; APKs opened in the JEB UI
+    or restored from a .jdb2 may carry renames outside the rename journal and use the content
+    key alone.
+    """
+    return _jeb_call('get_class_decompiled_code', class_signature, fields=fields)
+
+
+@mcp.tool()
+def get_decompile_cache_stats(fields: List[str] = None):
+    """
+    Get entry count, size and hit/miss counters of the on-disk decompilation cache.
+    "apk_key_skipped" counts lookups that could not use the per-APK key (see get_class_decompiled_code).
+    """
+    return _jeb_call('get_decompile_cache_stats', fields=fields)
+
+
+@mcp.tool()
+def export_sources(output_dir: str, package_filter: str = "", reachable_only: bool = False,
+                   threads: int = 2, timeout_s: int = 60, resume: bool = True, skip_libraries: bool = False,
+                   fields: List[str] = None):
+    """
+    Decompile the whole app (or a package) to .java files on disk as a background job in JEB.
+    Returns a job id; poll get_job_status for progress and per-class failures.
+
+    @param output_dir: Directory (on the JEB machine) receiving the source tree
+    @param package_filter: Only export classes under this package, e.g. "com.example"
+    @param reachable_only: Only export classes reachable from manifest entry points
+    @param threads: Number of classes decompiled in parallel
+    @param timeout_s: Per-class decompilation timeout in seconds
+    @param resume: Skip classes already exported into output_dir by an earlier run
+    @param skip_libraries: Skip classes detected as known third-party libraries (see detect_libraries)
+    """
+    return _jeb_call('export_sources', output_dir, package_filter, reachable_only, threads, timeout_s, resume,
+                     skip_libraries, fields=fields)
+
+
+@mcp.tool()
+def get_job_status(job_id: str = "", fields: List[str] = None):
+    """Get progress of a background job (export, ...), or of all jobs when job_id is empty."""
+    return _jeb_call('get_job_status', job_id, fields=fields)
+
+
+@mcp.tool()
+def cancel_job(job_id: str, fields: List[str] = None):
+    """Cancel a running background job."""
+    return _jeb_call('cancel_job', job_id, fields=fields)
+
+
+@mcp.tool()
+def get_method_callers(class_name: str, method_name: str, fields: List[str] = None):
+    """
+    Get all callers of the specified method.
+
+    "callers" keeps the [call-site address, "invoke" | "dispatch"] pairs; "caller_methods" lists
+    the same call sites as {method, address, dispatch} records, including virtual-dispatch callers.
+    """
+    return _jeb_call('get_method_callers', class_name, method_name, fields=fields)
 
 
 @mcp.tool()
-def get_method_decompiled_code(class_name: str, method_name: str):
-    """Get the decompiled code of the given method."""
-    return _jeb_call('get_method_decompiled_code', class_name, method_name)
+def get_method_callees(class_name: str, method_name: str, fields: List[str] = None):
+    """Get all methods called by the specified method, including virtual-dispatch targets."""
+    return _jeb_call('get_method_callees', class_name, method_name, fields=fields)
 
 
 @mcp.tool()
-def get_class_decompiled_code(class_signature: str):
-    """Get the decompiled code of a class."""
-    return _jeb_call('get_class_decompiled_code', class_signature)
+def get_transitive_calls(class_name: str, method_name: str, direction: str = "callers",
+                         max_depth: int = 3, max_nodes: int = 500, fields: List[str] = None):
+    """
+    Get transitive callers or callees of a method from the precomputed call graph.
+
+    @param direction: "callers" (who reaches this method) or "callees" (what this method reaches)
+    @param max_depth: Maximum number of call levels to follow
+    @param max_nodes: Maximum number of methods to return
+    """
+    return _jeb_call('get_transitive_calls', class_name, method_name, direction, max_depth, max_nodes, fields=fields)
 
 
 @mcp.tool()
-def get_method_callers(class_name: str, method_name: str):
-    """Get all callers of the specified method."""
-    return _jeb_call('get_method_callers', class_name, method_name)
+def find_call_paths(source: str, sink: str, max_depth: int = 6, max_paths: int = 20, fields: List[str] = None):
+    """
+    Find call chains from a source method to a sink method in one call (e.g. how input reaches a sink).
+
+    @param source: Full method signature, e.g. "Lcom/example/Main;->onCreate(Landroid/os/Bundle;)V"
+    @param sink: Full method signature of the target method
+    @param max_depth: Maximum number of calls in a path
+    @param max_paths: Maximum number of paths to return (shortest first)
+    """
+    return _jeb_call('find_call_paths', source, sink, max_depth, max_paths, fields=fields)
+
+
+@mcp.tool()
+def get_method_overrides(method_signature: str, offset: int = 0, limit: int = 100, fields: List[str] = None):
+    """
+    Get the methods overriding the given method and the methods it overrides.
+
+    "overrides" is a paged list of [overriding method signature, "override"] pairs; "overridden"
+    lists the supertype methods it overrides. Constructors, static and private methods have no
+    overrides, and package-private methods are only overridden within their package.
+    """
+    return _jeb_call('get_method_overrides', method_signature, offset, limit, fields=fields)
 
 
 @mcp.tool()
-def get_method_overrides(method_signature: str):
-    """Get the overrides of the given method."""
-    return _jeb_call('get_method_overrides', method_signature)
+def find_similar_methods(method_signature: str, threshold: float = 0.7, limit: int = 20, fields: List[str] = None):
+    """
+    Find methods structurally similar to the given one (e.g. cloned decryption routines),
+    comparing opcode n-grams with a MinHash/LSH index, so renamed or slightly edited copies match.
+
+    @param method_signature: e.g. "Lcom/example/Util;->decrypt(Ljava/lang/String;)Ljava/lang/String;"
+    @param threshold: Minimum estimated similarity (0..1)
+    @param limit: Maximum number of results
+    """
+    return _jeb_call('find_similar_methods', method_signature, threshold, limit, fields=fields)
 
 
 @mcp.tool()
-def get_field_callers(class_name: str, field_name: str):
+def get_field_callers(class_name: str, field_name: str, fields: List[str] = None):
     """Get the callers/references of the given field."""
-    return _jeb_call('get_field_callers', class_name, field_name)
+    return _jeb_call('get_field_callers', class_name, field_name, fields=fields)
 
 
 @mcp.tool()
-def rename_class_name(class_name: str, new_name: str, ignore: bool = True):
+def get_field_accesses(field_signatures: List[str], kind: str = "both", fields: List[str] = None):
+    """
+    Get the methods that read and/or write each field (from iget/iput/sget/sput), in one batch.
+
+    @param field_signatures: Field signatures, e.g. ["Lcom/example/Config;->a", "Lcom/example/Config;->b:Z"]
+    @param kind: "read", "write" or "both"
+    """
+    return _jeb_call('get_field_accesses', field_signatures, kind, fields=fields)
+
+
+@mcp.tool()
+def rename_class_name(class_name: str, new_name: str, ignore: bool = True, fields: List[str] = None):
     """Rename a class in the current APK project."""
-    return _jeb_call('rename_class_name', class_name, new_name, ignore)
+    return _jeb_call('rename_class_name', class_name, new_name, ignore, fields=fields)
 
 
 @mcp.tool()
-def rename_method_name(class_name: str, method_name: str, new_name: str, ignore: bool = True):
+def rename_method_name(class_name: str, method_name: str, new_name: str, ignore: bool = True, fields: List[str] = None):
     """Rename a method in the specified class."""
-    return _jeb_call('rename_method_name', class_name, method_name, new_name, ignore)
+    return _jeb_call('rename_method_name', class_name, method_name, new_name, ignore, fields=fields)
 
 
 @mcp.tool()
-def rename_field_name(class_name: str, field_name: str, new_name: str, ignore: bool = True):
+def rename_field_name(class_name: str, field_name: str, new_name: str, ignore: bool = True, fields: List[str] = None):
     """Rename a field in the specified class."""
-    return _jeb_call('rename_field_name', class_name, field_name, new_name, ignore)
+    return _jeb_call('rename_field_name', class_name, field_name, new_name, ignore, fields=fields)
 
 
 @mcp.tool()
-def rename_local_variable(class_name: str, method_name: str, old_var_name: str, new_var_name: str):
+def rename_local_variable(class_name: str, method_name: str, old_var_name: str, new_var_name: str,
+                          fields: List[str] = None):
     """Rename a local variable in the specified method."""
-    return _jeb_call('rename_local_variable', class_name, method_name, old_var_name, new_var_name)
+    return _jeb_call('rename_local_variable', class_name, method_name, old_var_name, new_var_name, fields=fields)
+
+
+@mcp.tool()
+def bulk_rename(entries: List[dict], dry_run: bool = False, atomic: bool = True, fields: List[str] = None):
+    """
+    Rename many items in one call. All entries are checked for conflicts first; with atomic=True
+    nothing is renamed if any entry fails, and a failed rename rolls back the ones already applied.
+    Parameter and local names conflict with the method's other parameters and the names in its
+    decompiled body.
+
+    @param entries: Rename entries, each a dict with "kind", "class_signature" and "new_name":
+        class:     {"kind": "class", "class_signature": "Lcom/a/b;", "new_name": "LoginManager"}
+        method:    {"kind": "method", "class_signature": ..., "name": "a", "new_name": "login"}
+        field:     {"kind": "field", "class_signature": ..., "name": "b", "new_name": "token"}
+        parameter: {"kind": "parameter", "class_signature": ..., "method": "login", "index": 0, "new_name": "user"}
+        local:     {"kind": "local", "class_signature": ..., "method": "login", "name": "v1", "new_name": "session"}
+    @param dry_run: Only check the entries and report conflicts
+    @param atomic: Apply nothing if any entry fails the check
+    """
+    return _jeb_call('bulk_rename', entries, dry_run, atomic, fields=fields)
 
 
 @mcp.tool()
-def get_class_type_tree(class_signature: str, max_node_count: int = 16):
+def replay_rename_journal(fields: List[str] = None):
+    """
+    Re-apply every rename journaled for the current APK (matched by SHA-256).
+    Use after reopening an APK in JEB without a saved project database.
+    """
+    return _jeb_call('replay_rename_journal', fields=fields)
+
+
+@mcp.tool()
+def transfer_renames(source_artifact_id: str, target_artifact_id: str = "", min_confidence: float = 0.8,
+                     dry_run: bool = False, offset: int = 0, limit: int = 100, fields: List[str] = None):
+    """
+    Transfer class/method/field renames from an older build to a newer build of the same app.
+    Both artifacts must be loaded (see get_live_artifact_ids). Items are matched structurally
+    (opcodes, strings, external calls, hierarchy), so it works across re-obfuscation.
+    Renames are checked for name conflicts first and applied like bulk_rename: entries that
+    fail the check are skipped, and a failure while applying rolls back the whole batch.
+
+    @param source_artifact_id: Artifact holding the renames (old build)
+    @param target_artifact_id: Artifact to rename (new build); defaults to the active artifact
+    @param min_confidence: Only transfer matches at or above this confidence (0-1)
+    @param dry_run: Only report the renames that would be applied
+    """
+    return _jeb_call('transfer_renames', source_artifact_id, target_artifact_id, min_confidence,
+                     dry_run, offset, limit, fields=fields)
+
+
+@mcp.tool()
+def get_class_type_tree(class_signature: str, max_node_count: int = 16, fields: List[str] = None):
     """Build a hierarchical type tree for a class."""
-    return _jeb_call('get_class_type_tree', class_signature, max_node_count)
+    return _jeb_call('get_class_type_tree', class_signature, max_node_count, fields=fields)
+
+
+@mcp.tool()
+def get_class_subtypes(class_signature: str, implementors_only: bool = False, offset: int = 0, limit: int = 100,
+                       fields: List[str] = None):
+    """
+    Get all transitive subclasses / implementors of a class or interface as a flat, paged list.
+
+    @param implementors_only: Only return concrete classes (skip sub-interfaces)
+    """
+    return _jeb_call('get_class_subtypes', class_signature, implementors_only, offset, limit, fields=fields)
+
+
+@mcp.tool()
+def get_class_supertypes(class_signature: str, fields: List[str] = None):
+    """Get all transitive superclasses and interfaces of a class as a flat list."""
+    return _jeb_call('get_class_supertypes', class_signature, fields=fields)
 
 
 @mcp.tool()
-def get_class_superclass(class_signature: str):
+def get_class_superclass(class_signature: str, fields: List[str] = None):
     """Get the direct superclass of a specified class."""
-    return _jeb_call('get_class_superclass', class_signature)
+    return _jeb_call('get_class_superclass', class_signature, fields=fields)
 
 
 @mcp.tool()
-def get_class_interfaces(class_signature: str):
+def get_class_interfaces(class_signature: str, fields: List[str] = None):
     """Get all interfaces implemented by a specified class."""
-    return _jeb_call('get_class_interfaces', class_signature)
+    return _jeb_call('get_class_interfaces', class_signature, fields=fields)
 
 
 @mcp.tool()
-def parse_protobuf_class(class_signature: str):
+def parse_protobuf_class(class_signature: str, fields: List[str] = None):
     """Parse protobuf definition for a specific class."""
-    return _jeb_call('parse_protobuf_class', class_signature)
+    return _jeb_call('parse_protobuf_class', class_signature, fields=fields)
+
+
+@mcp.tool()
+def extract_all_protos(output_dir: str, base_class: str = "Lcom/google/protobuf/GeneratedMessageLite;",
+                       package_filter: str = "", fields: List[str] = None):
+    """
+    Extract every protobuf-lite message class into one .proto bundle per package, as a background job.
+    Returns a job id; poll get_job_status for progress.
+
+    @param output_dir: Directory (on the JEB machine) receiving the .proto files
+    @param base_class: Message base class; pass the renamed class when protobuf-lite is obfuscated
+    @param package_filter: Only extract messages under this package
+    """
+    return _jeb_call('extract_all_protos', output_dir, base_class, package_filter, fields=fields)
+
+
+@mcp.tool()
+def get_class_methods(class_signature: str, fields: List[str] = None):
+    """
+    Get all methods of a specified class.
+
+    @param fields: Only compute these method attributes, e.g. ["name", "signature"]
+                   (others: "return_type", "parameters", "access_flags"). Every tool accepts fields.
+    """
+    return _jeb_call('get_class_methods', class_signature, fields=fields)
 
 
 @mcp.tool()
-def get_class_methods(class_signature: str):
-    """Get all methods of a specified class."""
-    return _jeb_call('get_class_methods', class_signature)
+def get_class_fields(class_signature: str, fields: List[str] = None):
+    """
+    Get all fields of a specified class.
+
+    @param fields: Only compute these field attributes, e.g. ["name", "type"]
+                   (others: "signature", "access_flags", "initial_value")
+    """
+    return _jeb_call('get_class_fields', class_signature, fields=fields)
 
 
 @mcp.tool()
-def get_class_fields(class_signature: str):
-    """Get all fields of a specified class."""
-    return _jeb_call('get_class_fields', class_signature)
+def get_class_outline(class_signature: str, fields: List[str] = None):
+    """
+    Get a compact outline of a class straight from DEX metadata, without decompiling:
+    modifiers, supertype, interfaces, fields ("<modifiers> name:Type"), methods
+    ("<modifiers> name(Params)Ret #<instruction count>") and directly nested classes.
+    Use it instead of get_class_decompiled_code when only the shape of a class is needed.
+    """
+    return _jeb_call('get_class_outline', class_signature, fields=fields)
 
 
 @mcp.tool()
-def is_class_renamed(class_signature: str):
+def get_class_outlines(class_signatures: List[str], fields: List[str] = None):
+    """
+    Get the outlines of several classes in one call (at most 200), see get_class_outline.
+
+    @param class_signatures: Class signatures, e.g. ["Lcom/example/Main;", "Lcom/example/Main$a;"]
+    """
+    return _jeb_call('get_class_outlines', class_signatures, fields=fields)
+
+
+@mcp.tool()
+def is_class_renamed(class_signature: str, fields: List[str] = None):
     """Check if the specified class has been renamed."""
-    return _jeb_call('is_class_renamed', class_signature)
+    return _jeb_call('is_class_renamed', class_signature, fields=fields)
 
 
 @mcp.tool()
-def is_method_renamed(class_signature: str, method_name: str):
+def is_method_renamed(class_signature: str, method_name: str, fields: List[str] = None):
     """Check if the specified method has been renamed."""
-    return _jeb_call('is_method_renamed', class_signature, method_name)
+    return _jeb_call('is_method_renamed', class_signature, method_name, fields=fields)
 
 
 @mcp.tool()
-def is_field_renamed(class_signature: str, field_name: str):
+def is_field_renamed(class_signature: str, field_name: str, fields: List[str] = None):
     """Check if the specified field has been renamed."""
-    return _jeb_call('is_field_renamed', class_signature, field_name)
+    return _jeb_call('is_field_renamed', class_signature, field_name, fields=fields)
 
 
 @mcp.tool()
-def is_package(package_name: str):
+def is_package(package_name: str, fields: List[str] = None):
     """Check if the specified package exists."""
-    return _jeb_call('is_package', package_name)
+    return _jeb_call('is_package', package_name, fields=fields)
+
+
+@mcp.tool()
+def list_packages(prefix: str = "", depth: int = 1, fields: List[str] = None):
+    """
+    List a package and its subpackages with class/method/field counts, instruction count,
+    renamed and obfuscated ratios. Expand the tree lazily by calling again with a subpackage.
+
+    @param prefix: Package to expand, e.g. "com.example"; empty for the root
+    @param depth: Number of subpackage levels to include
+    """
+    return _jeb_call('list_packages', prefix, depth, fields=fields)
 
 
 @mcp.tool()
 def set_parameter_name(class_signature: str, method_name: str, index: int, name: str,
-                       fail_on_conflict: bool = True, notify: bool = True):
+                       fail_on_conflict: bool = True, notify: bool = True, fields: List[str] = None):
     """Set a custom name for a parameter in the specified method."""
     return _jeb_call('set_parameter_name', class_signature, method_name, index, name,
-                     fail_on_conflict, notify)
+                     fail_on_conflict, notify, fields=fields)
 
 
 @mcp.tool()
-def reset_parameter_name(class_signature: str, method_name: str, index: int, notify: bool = True):
+def reset_parameter_name(class_signature: str, method_name: str, index: int, notify: bool = True,
+                         fields: List[str] = None):
     """Reset a parameter name to its default value."""
-    return _jeb_call('reset_parameter_name', class_signature, method_name, index, notify)
+    return _jeb_call('reset_parameter_name', class_signature, method_name, index, notify, fields=fields)
 
 
 @mcp.tool()
-def find_class(class_signature: str):
+def find_class(class_signature: str, fields: List[str] = None):
     """Find a class in the currently loaded APK project."""
-    return _jeb_call('find_class', class_signature)
+    return _jeb_call('find_class', class_signature, fields=fields)
 
 
 @mcp.tool()
-def find_method(class_signature: str, method_name: str):
+def find_method(class_signature: str, method_name: str, fields: List[str] = None):
     """Find a method in the currently loaded APK project."""
-    return _jeb_call('find_method', class_signature, method_name)
+    return _jeb_call('find_method', class_signature, method_name, fields=fields)
 
 
 @mcp.tool()
-def find_field(class_signature: str, field_name: str):
+def find_field(class_signature: str, field_name: str, fields: List[str] = None):
     """Find a field in the currently loaded APK project."""
-    return _jeb_call('find_field', class_signature, field_name)
+    return _jeb_call('find_field', class_signature, field_name, fields=fields)
 
 
 @mcp.tool()
-def get_live_artifact_ids():
+def get_live_artifact_ids(fields: List[str] = None):
     """Get a list of live artifact IDs currently loaded in JEB Pro."""
-    return _jeb_call('get_live_artifact_ids')
+    return _jeb_call('get_live_artifact_ids', fields=fields)
+
+
+@mcp.tool()
+def switch_active_artifact(artifact_id, warmup: bool = True, fields: List[str] = None):
+    """
+    Switch the active artifact in JEB Pro.
+
+    @param warmup: Decompile the new artifact's manifest entry classes in the background
+    """
+    _forget_active_index()
+    return _jeb_call('switch_active_artifact', artifact_id, warmup, fields=fields)
+
+
+@mcp.tool()
+def sync_index_store(force: bool = False, fields: List[str] = None):
+    """
+    Stream the symbol, call, field access and literal indexes of the active artifact from JEB
+    into the persistent index store (SQLite per APK SHA-256, ~/.jebmcp/index or JEBMCP_INDEX_DIR).
+    Only missing kinds, and symbol names after renames, are pulled again; later sessions can
+    query the store with search_symbols / get_stored_xrefs / search_stored_literals without JEB.
+
+    @param force: Re-export every kind even if the store is up to date
+    """
+    info, err = _jeb_result('get_index_info')
+    if err:
+        return err
+    if info.get("schema") != SCHEMA_VERSION:
+        return json.dumps({"result": {"success": False,
+            "error": f"Plugin index schema {info.get('schema')} does not match server schema {SCHEMA_VERSION}"}})
+
+    apk_sha256 = info["apk_sha256"]
+    _active_index["apk_sha256"] = apk_sha256
+    try:
+        store = _open_index_store(apk_sha256)
+        synced = {}
+        for kind in INDEX_STORE_KINDS:
+            if not force and not store.needs_sync(kind, info["rename_state"]):
+                continue
+            errors = []
+            start = time.time()
+            try:
+                rows = store.replace_kind(kind, _export_pages(kind, errors), info["rename_state"], time.time())
+            except RuntimeError:
+                if errors:
+                    return errors[0]
+                raise
+            synced[kind] = {"rows": rows, "time_ms": int((time.time() - start) * 1000)}
+        return _result_json({
+            "success": True,
+            "apk_sha256": apk_sha256,
+            "path": store.path,
+            "rename_state": info["rename_state"],
+            "synced": synced,
+            "kinds": store.kind_status(),
+        }, fields)
+    except (ValueError, OSError, sqlite3.Error) as e:
+        return json.dumps({"result": {"success": False, "error": f"Index store error: {e}"}})
+
+
+@mcp.tool()
+def get_index_store_status(apk_sha256: str = "", fields: List[str] = None):
+    """
+    Show which index kinds are stored for the active artifact (or the given APK SHA-256),
+    with row counts and the rename state they were exported under.
+    """
+    store, err = _current_index_store(apk_sha256)
+    if err:
+        return err
+    return _result_json({
+        "success": True,
+        "apk_sha256": store.apk_sha256,
+        "path": store.path,
+        "schema": SCHEMA_VERSION,
+        "kinds": store.kind_status(),
+    }, fields)
 
 
 @mcp.tool()
-def switch_active_artifact(artifact_id):
-    """Switch the active artifact in JEB Pro."""
-    return _jeb_call('switch_active_artifact', artifact_id)
+def search_symbols(query: str, kind: str = "", regex: bool = False, offset: int = 0, limit: int = 100,
+                   apk_sha256: str = "", fields: List[str] = None):
+    """
+    Search classes, methods and fields by current or original name in the persistent index store.
+    Names are as of the last sync_index_store; answered from disk without JEB.
+
+    @param kind: "classes", "methods", "fields" or "" for all
+    @param regex: Treat query as a regular expression instead of a case-insensitive substring
+    @param apk_sha256: Query the store of this APK instead of the active artifact
+    """
+    if kind and kind not in NAME_KINDS:
+        return json.dumps({"result": {"success": False, "error": f"kind must be one of {NAME_KINDS} or empty"}})
+    if regex:
+        try:
+            re.compile(query)
+        except re.error as e:
+            return json.dumps({"result": {"success": False, "error": f"Invalid regex: {e}"}})
+    store, err = _current_index_store(apk_sha256)
+    if err:
+        return err
+    limit = max(1, min(int(limit), 1000))
+    offset = max(int(offset), 0)
+    try:
+        symbols, total = store.search_symbols(query, kind, regex, offset, limit)
+    except sqlite3.Error as e:
+        return json.dumps({"result": {"success": False, "error": f"Search failed: {e}"}})
+    return _result_json({
+        "success": True,
+        "symbols": symbols,
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "has_more": offset + len(symbols) < total,
+    }, fields)
+
+
+@mcp.tool()
+def get_stored_xrefs(signature: str, direction: str = "callers", apk_sha256: str = "", fields: List[str] = None):
+    """
+    Get cross-references from the persistent index store, without JEB.
+    For a method signature, returns its callers or callees; for a field signature
+    ("Lcom/a/B;->f:I"), returns the methods reading and writing it.
+
+    @param direction: "callers" or "callees" (methods only)
+    @param apk_sha256: Query the store of this APK instead of the active artifact
+    """
+    if direction not in ("callers", "callees"):
+        return json.dumps({"result": {"success": False, "error": "direction must be 'callers' or 'callees'"}})
+    store, err = _current_index_store(apk_sha256)
+    if err:
+        return err
+
+    method = store.resolve("methods", signature) if "(" in signature else None
+    if method is not None:
+        refs = store.method_xrefs(method[0], direction)
+        return _result_json({
+            "success": True,
+            "method_signature": method[2],
+            "direction": direction,
+            "count": len(refs),
+            "references": [{"method": name, "offset": offset, "dispatch": bool(kind)} for name, offset, kind in refs],
+        }, fields)
+    field = store.resolve("fields", signature)
+    if field is not None:
+        refs = store.field_xrefs(field[0])
+        return _result_json({
+            "success": True,
+            "field_signature": field[2],
+            "count": len(refs),
+            "references": [{"method": name, "offset": offset, "access": access} for name, offset, access in refs],
+        }, fields)
+    return json.dumps({"result": {"success": False, "error": f"Symbol not found in index store: {signature}"}})
+
+
+@mcp.tool()
+def search_stored_literals(query: str, kind: str = "strings", regex: bool = False, offset: int = 0,
+                           limit: int = 100, apk_sha256: str = "", fields: List[str] = None):
+    """
+    Find string constants (substring or regex) or numeric constants (exact, decimal or 0x hex)
+    and the methods using them, from the persistent index store without JEB.
+
+    @param kind: "strings" or "constants"
+    @param apk_sha256: Query the store of this APK instead of the active artifact
+    """
+    if kind not in ("strings", "constants"):
+        return json.dumps({"result": {"success": False, "error": "kind must be 'strings' or 'constants'"}})
+    value = query
+    if kind == "constants":
+        number = parse_int(query)
+        if number is None:
+            return json.dumps({"result": {"success": False, "error": f"Not an integer: {query}"}})
+        # 存储的是符号扩展后的值，无符号查询（如 0xefcdab89）同时查补码
+        value = constant_candidates(number)
+    if regex:
+        try:
+            re.compile(query)
+        except re.error as e:
+            return json.dumps({"result": {"success": False, "error": f"Invalid regex: {e}"}})
+    store, err = _current_index_store(apk_sha256)
+    if err:
+        return err
+    limit = max(1, min(int(limit), 1000))
+    offset = max(int(offset), 0)
+    try:
+        matches, total = store.search_literals(value, kind, regex and kind == "strings", offset, limit)
+    except sqlite3.Error as e:
+        return json.dumps({"result": {"success": False, "error": f"Search failed: {e}"}})
+    return _result_json({
+        "success": True,
+        "matches": matches,
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "has_more": offset + len(matches) < total,
+    }, fields)
 
 
 def main():
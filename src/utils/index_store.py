@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""持久化索引库：按 APK SHA-256 把插件导出的符号、调用、字段访问和字面量索引存入 SQLite"""
+
+import os
+import re
+import sqlite3
+import threading
+
+# 与插件 core/index_export.py 的 SCHEMA_VERSION 对应
+SCHEMA_VERSION = 1
+
+NAME_KINDS = ("classes", "methods", "fields")
+INDEX_KINDS = ("calls", "field_accesses", "strings", "constants")
+KINDS = NAME_KINDS + INDEX_KINDS
+
+SYMBOL_LABELS = {"classes": "class", "methods": "method", "fields": "field"}
+
+DEFAULT_INDEX_DIR = os.path.join(os.path.expanduser("~"), ".jebmcp", "index")
+
+_TABLES = {
+    "classes": "idx INTEGER PRIMARY KEY, original TEXT, current TEXT",
+    "methods": "idx INTEGER PRIMARY KEY, original TEXT, current TEXT",
+    "fields": "idx INTEGER PRIMARY KEY, original TEXT, current TEXT",
+    "calls": "caller INTEGER, callee INTEGER, offset INTEGER, kind INTEGER",
+    "field_accesses": "field INTEGER, method INTEGER, offset INTEGER, write INTEGER",
+    "strings": "value TEXT, method INTEGER, offset INTEGER",
+    "constants": "value INTEGER, method INTEGER, offset INTEGER",
+}
+
+_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS classes_current ON classes(current)",
+    "CREATE INDEX IF NOT EXISTS classes_original ON classes(original)",
+    "CREATE INDEX IF NOT EXISTS methods_current ON methods(current)",
+    "CREATE INDEX IF NOT EXISTS methods_original ON methods(original)",
+    "CREATE INDEX IF NOT EXISTS fields_current ON fields(current)",
+    "CREATE INDEX IF NOT EXISTS fields_original ON fields(original)",
+    "CREATE INDEX IF NOT EXISTS calls_caller ON calls(caller)",
+    "CREATE INDEX IF NOT EXISTS calls_callee ON calls(callee)",
+    "CREATE INDEX IF NOT EXISTS field_accesses_field ON field_accesses(field)",
+    "CREATE INDEX IF NOT EXISTS strings_value ON strings(value)",
+    "CREATE INDEX IF NOT EXISTS constants_value ON constants(value)",
+)
+
+_SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def index_dir():
+    """索引库目录，可用环境变量 JEBMCP_INDEX_DIR 覆盖"""
+    return os.environ.get("JEBMCP_INDEX_DIR") or DEFAULT_INDEX_DIR
+
+
+def _regexp(pattern, value):
+    return value is not None and re.search(pattern, value) is not None
+
+
+class IndexStore:
+    """
+    一个 APK 的持久化索引（<index_dir>/<sha256>.sqlite）。
+
+    每个种类单独记录行数和导出时的重命名状态：符号表（classes/methods/fields）含当前名称，
+    重命名状态变化后需要重新同步；调用、字段访问和字面量只含常量池索引，同步一次即可。
+    schema 版本不一致时整个库会被清空重建。
+    """
+
+    def __init__(self, apk_sha256: str, directory: str = None):
+        if not _SHA256_PATTERN.match(apk_sha256 or ""):
+            raise ValueError(f"Invalid APK SHA-256: {apk_sha256}")
+        self.apk_sha256 = apk_sha256
+        directory = directory or index_dir()
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, apk_sha256 + ".sqlite")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.create_function("REGEXP", 2, _regexp)
+        self._init_schema()
+
+    def _init_schema(self):
+        with self._lock, self._conn:
+            conn = self._conn
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            row = conn.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+            if row is not None and row[0] != str(SCHEMA_VERSION):
+                for table in list(_TABLES) + ["kinds"]:
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('schema', ?)", (str(SCHEMA_VERSION),))
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('apk_sha256', ?)", (self.apk_sha256,))
+            conn.execute("CREATE TABLE IF NOT EXISTS kinds "
+                         "(kind TEXT PRIMARY KEY, rows INTEGER, rename_state TEXT, synced_at REAL)")
+            for table, columns in _TABLES.items():
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns})")
+            for statement in _INDEXES:
+                conn.execute(statement)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ---------- 同步 ----------
+
+    def kind_status(self):
+        """{kind: {"rows", "rename_state", "synced_at"}}，未同步的种类不出现"""
+        with self._lock:
+            rows = self._conn.execute("SELECT kind, rows, rename_state, synced_at FROM kinds").fetchall()
+        return {kind: {"rows": count, "rename_state": state, "synced_at": synced_at}
+                for kind, count, state, synced_at in rows}
+
+    def needs_sync(self, kind: str, rename_state: str) -> bool:
+        status = self.kind_status().get(kind)
+        if status is None:
+            return True
+        return kind in NAME_KINDS and status["rename_state"] != rename_state
+
+    def replace_kind(self, kind: str, pages, rename_state: str, synced_at: float) -> int:
+        """
+        用 pages（行列表的迭代器）整体替换一个种类的数据，在同一事务中完成，
+        中途失败时保留旧数据
+
+        @return: 写入的行数
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Unknown index kind: {kind}")
+        placeholders = ", ".join("?" * len(_TABLES[kind].split(",")))
+        count = 0
+        with self._lock, self._conn:
+            conn = self._conn
+            conn.execute(f"DELETE FROM {kind}")
+            for rows in pages:
+                conn.executemany(f"INSERT INTO {kind} VALUES ({placeholders})", rows)
+                count += len(rows)
+            conn.execute("INSERT OR REPLACE INTO kinds (kind, rows, rename_state, synced_at) VALUES (?, ?, ?, ?)",
+                         (kind, count, rename_state, synced_at))
+        return count
+
+    # ---------- 查询 ----------
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def resolve(self, kind: str, signature: str):
+        """按当前或原始签名查找符号，返回 (index, original, current) 或 None"""
+        rows = self._query(f"SELECT idx, original, current FROM {kind} WHERE current = ? OR original = ? LIMIT 1",
+                           (signature, signature))
+        return rows[0] if rows else None
+
+    def search_symbols(self, query: str, kind: str = "", regex: bool = False, offset: int = 0, limit: int = 100):
+        """按子串（不区分大小写）或正则在当前名和原始名中查找类/方法/字段"""
+        kinds = [kind] if kind else list(NAME_KINDS)
+        if regex:
+            condition, params = "(current REGEXP ? OR original REGEXP ?)", (query, query)
+        else:
+            like = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            condition, params = "(current LIKE ? ESCAPE '\\' OR original LIKE ? ESCAPE '\\')", (like, like)
+        union = " UNION ALL ".join(
+            f"SELECT '{SYMBOL_LABELS[k]}', idx, original, current FROM {k} WHERE {condition}"
+            for k in kinds)
+        all_params = params * len(kinds)
+        total = self._query(f"SELECT COUNT(*) FROM ({union})", all_params)[0][0]
+        rows = self._query(f"{union} LIMIT ? OFFSET ?", all_params + (limit, offset))
+        return [{"kind": k, "index": idx, "signature": current, "original_signature": original}
+                for k, idx, original, current in rows], total
+
+    def _method_names(self, indexes):
+        if not indexes:
+            return {}
+        names = {}
+        indexes = list(indexes)
+        for start in range(0, len(indexes), 500):
+            chunk = indexes[start:start + 500]
+            marks = ", ".join("?" * len(chunk))
+            for idx, current in self._query(f"SELECT idx, current FROM methods WHERE idx IN ({marks})", chunk):
+                names[idx] = current
+        return names
+
+    def method_xrefs(self, method_index: int, direction: str = "callers"):
+        """[(方法签名, offset, kind)]：callers 为调用方与其调用点，callees 为被调方与本方法内的调用点"""
+        if direction == "callers":
+            rows = self._query("SELECT caller, offset, kind FROM calls WHERE callee = ? ORDER BY caller, offset",
+                               (method_index,))
+        else:
+            rows = self._query("SELECT callee, offset, kind FROM calls WHERE caller = ? ORDER BY offset, callee",
+                               (method_index,))
+        names = self._method_names(set(row[0] for row in rows))
+        return [(names.get(other, "<unknown>"), offset, kind) for other, offset, kind in rows]
+
+    def field_xrefs(self, field_index: int):
+        """[(方法签名, offset, "read"|"write")]"""
+        rows = self._query("SELECT method, offset, write FROM field_accesses WHERE field = ? ORDER BY method, offset",
+                           (field_index,))
+        names = self._method_names(set(row[0] for row in rows))
+        return [(names.get(method, "<unknown>"), offset, "write" if write else "read")
+                for method, offset, write in rows]
+
+    def search_literals(self, query, kind: str = "strings", regex: bool = False, offset: int = 0, limit: int = 100):
+        """
+        按值查找字面量引用；字符串为子串或正则匹配，数值常量为精确匹配（query 可为候选值列表）
+
+        @return: ([{"value", "references": [{"method", "offset"}]}], total)，按值分页
+        """
+        params = (query,)
+        if kind == "strings":
+            condition = "value REGEXP ?" if regex else "instr(value, ?) > 0"
+        elif isinstance(query, (list, tuple)):
+            params = tuple(query)
+            condition = "value IN (%s)" % ", ".join("?" * len(params))
+        else:
+            condition = "value = ?"
+        total = self._query(f"SELECT COUNT(DISTINCT value) FROM {kind} WHERE {condition}", params)[0][0]
+        values = [row[0] for row in self._query(
+            f"SELECT DISTINCT value FROM {kind} WHERE {condition} ORDER BY value LIMIT ? OFFSET ?",
+            params + (limit, offset))]
+        results = []
+        for value in values:
+            refs = self._query(f"SELECT method, offset FROM {kind} WHERE value = ? ORDER BY method, offset", (value,))
+            names = self._method_names(set(ref[0] for ref in refs))
+            results.append({"value": value, "references": [{"method": names.get(method, "<unknown>"), "offset": off}
+                                                            for method, off in refs]})
+        return results, total
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+Literal utilities - integer parsing and hex rendering of Dalvik numeric constants, shared by the plugin and server.py
+"""
+
+try:
+    _INTEGER_TYPES = (int, long)
+except NameError:
+    _INTEGER_TYPES = (int,)
+
+
+def parse_int(text):
+    """解析十进制或 0x 开头的十六进制整数，失败返回 None"""
+    if isinstance(text, _INTEGER_TYPES) and not isinstance(text, bool):
+        return text
+    try:
+        text = str(text).strip().lower()
+        if text.startswith("-0x"):
+            return -int(text[3:], 16)
+        if text.startswith("0x"):
+            return int(text[2:], 16)
+        return int(text)
+    except ValueError:
+        return None
+
+
+def constant_candidates(value):
+    """
+    查询值可能对应的存储值。JEB 给出的 const/const-wide 操作数按指令宽度符号扩展，
+    0xefcdab89 这类超出有符号范围的 32/64 位查询还要查它的补码（负数）
+    """
+    candidates = [value]
+    if (1 << 31) <= value < (1 << 32):
+        candidates.append(value - (1 << 32))
+    elif (1 << 63) <= value < (1 << 64):
+        candidates.append(value - (1 << 64))
+    return candidates
+
+
+def format_hex(value, bits=32):
+    """整数按指令宽度（32 或 64 位）转为无符号小写十六进制文本，超出宽度的负数带符号"""
+    if value < 0 and value >= -(1 << (bits - 1)):
+        value += 1 << bits
+    if value < 0:
+        return "-0x%x" % -value
+    return "0x%x" % value
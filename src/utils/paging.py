@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Paging utilities - slices large result lists for JSON-RPC responses
+"""
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+def paginate(items, offset=0, limit=DEFAULT_LIMIT):
+    """
+    对结果列表分页
+
+    Args:
+        items: 完整结果列表
+        offset: 起始位置
+        limit: 每页数量（上限 MAX_LIMIT）
+
+    Returns:
+        (page, info) 元组，info 包含 total/offset/limit/has_more
+    """
+    offset = max(int(offset or 0), 0)
+    limit = int(limit or DEFAULT_LIMIT)
+    limit = max(1, min(limit, MAX_LIMIT))
+    page = items[offset:offset + limit]
+    return page, {
+        "total": len(items),
+        "offset": offset,
+        "limit": limit,
+        "has_more": offset + len(page) < len(items),
+    }
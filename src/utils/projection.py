@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Projection utilities - keeps only the requested attributes of JSON-RPC results
+"""
+
+# 状态与分页信息始终保留，调用方据此判断成败和继续翻页
+ALWAYS_KEYS = frozenset(("success", "error", "traceback", "total", "offset", "limit", "has_more", "next_cursor"))
+
+
+def normalize_fields(fields):
+    """
+    ['name', 'signature'] 或 'name,signature' -> frozenset，未指定时返回 None
+    """
+    if not fields:
+        return None
+    if isinstance(fields, (list, tuple, set, frozenset)):
+        names = fields
+    else:
+        names = str(fields).split(",")
+    names = frozenset(name.strip() for name in names if name and name.strip())
+    return names or None
+
+
+def wants(fields, name):
+    """未指定投影，或投影中包含 name"""
+    return fields is None or name in fields
+
+
+def select(getters, fields):
+    """
+    只对被请求的属性调用取值函数
+
+    Args:
+        getters: [(属性名, 无参取值函数)]，按输出顺序
+    """
+    return dict((name, getter()) for name, getter in getters if wants(fields, name))
+
+
+def record_fields(fields, container):
+    """
+    容器内记录需要计算的属性：请求了容器键本身（如 'methods'）时计算全部属性，
+    否则只计算被请求的属性
+    """
+    if fields is None or container in fields:
+        return None
+    return fields
+
+
+def project(value, fields):
+    """
+    按属性名投影结果，属性名在任意层级生效。
+
+    字典中保留被请求的键和 ALWAYS_KEYS；未被请求但值为字典或字典列表的键继续向下投影，
+    投影后为空则去掉。被请求的键整体保留，例如 fields=['methods'] 返回完整的 methods 列表，
+    fields=['name'] 只返回每个方法的 name。
+    """
+    fields = normalize_fields(fields)
+    if fields is None:
+        return value
+    return _project(value, fields)
+
+
+def _project(value, fields):
+    if isinstance(value, dict):
+        projected = {}
+        for key, item in value.items():
+            if key in fields or key in ALWAYS_KEYS:
+                projected[key] = item
+            elif _is_record(item):
+                item = _project(item, fields)
+                if item and (not isinstance(item, list) or any(item)):
+                    projected[key] = item
+        return projected
+    if isinstance(value, list):
+        return [_project(item, fields) if _is_record(item) else item for item in value]
+    return value
+
+
+def _is_record(value):
+    if isinstance(value, dict):
+        return True
+    return isinstance(value, list) and any(isinstance(item, dict) for item in value)
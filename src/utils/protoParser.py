@@ -5,10 +5,11 @@ Uses PBDecoder.jar for decoding (must be provided separately)
 """
 
 from com.pnfsoftware.jeb.core.units.code.android import IDexUnit
-from com.pnfsoftware.jeb.core.units.code.android.dex import IDexCodeItem
+from com.pnfsoftware.jeb.core.units.code.android.dex import IDexCodeItem, IDalvikInstruction
 from java.lang import System
 import sys
 import os
+import threading
 
 # 获取当前脚本所在的目录
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -45,11 +46,28 @@ from com.wwb.proto import PBMain
 
 
 class ProtoParser(object):
-    """独立的 protobuf 解析器，用于 MCP 集成"""
+    """
+    独立的 protobuf 解析器，用于 MCP 集成。
+
+    同一实例由 RPC 线程（parse_protobuf_class）和 ProtoExtractJob 后台线程共用，
+    解析和清空缓存都持有 lock（可重入），缓存不会被并发修改
+    """
 
     def __init__(self, dex_unit):
         self.dex_unit = dex_unit
-        self.parsed_class = []
+        self.lock = threading.RLock()
+        # 原始类签名 -> (消息定义文本, 引用的嵌套消息类)，跨多次解析复用
+        self.messages = {}
+        # 原始类签名 -> PBDecoder 解码后的字段定义
+        self.decoded = {}
+        # 原始类签名 -> 调用 newMessageInfo 的方法索引，见 _message_info_sites
+        self.info_sites = None
+
+    def clear_cache(self):
+        """清空已解析消息缓存（类/字段重命名后需要重新生成文本）"""
+        with self.lock:
+            self.messages = {}
+            self.decoded = {}
 
     def parse_class(self, class_signature):
         """解析指定类的 protobuf 定义"""
@@ -67,10 +85,8 @@ class ProtoParser(object):
             if clazz is None:
                 return {"success": False, "error": "Class not found: %s" % class_signature}
 
-            # 重置已解析类列表
-            self.parsed_class = []
-
-            proto_result = self._parse_cls(clazz)
+            with self.lock:
+                proto_result = self._parse_cls(clazz)
             return {
                 "success": True,
                 "class_signature": class_signature,
@@ -82,12 +98,39 @@ class ProtoParser(object):
             return {"success": False, "error": "Failed to parse protobuf: %s" % str(e)}
 
     def _parse_cls(self, cls):
-        """内部方法：解析类"""
-        self.parsed_class.append(cls.getName())
+        """内部方法：解析类及其引用的所有嵌套消息（迭代深度优先，先父后子）"""
+        output = []
+        visited = set()
+        stack = [cls]
+        while stack:
+            current = stack.pop()
+            if current is None:
+                # 无法解析的嵌套类型（外部类等），字段已输出，跳过
+                continue
+            signature = current.getSignature(False)
+            if signature in visited:
+                continue
+            visited.add(signature)
+            text, nested = self.parse_message(current)
+            output.append(text)
+            stack.extend(reversed(nested))
+        return "".join(output)
+
+    def parse_message(self, cls):
+        """解析单个消息类，返回 (定义文本, 引用的嵌套消息类列表)，结果缓存"""
+        with self.lock:
+            return self._parse_message(cls)
+
+    def _parse_message(self, cls):
+        signature = cls.getSignature(False)
+        cached = self.messages.get(signature)
+        if cached is not None:
+            return cached
+
         current_proto = self._parse_proto(cls)
 
         cresultstr = "message " + cls.getName() + " {\n"
-        subresult = ""
+        nested = []
         for fields in current_proto.split("\n"):
             if not len(fields) > 0:
                 continue
@@ -102,9 +145,7 @@ class ProtoParser(object):
                     if clsField.getName(True) == field[2] or clsField.getName(False) == field[2]:
                         mtype = clsField.getFieldType()
                         cresultstr += "\t" + fields.replace(mfieldType, mtype.getName()) + "\n"
-                        if mtype.getName() in self.parsed_class:
-                            continue
-                        subresult += self._parse_cls(mtype.getImplementingClass())
+                        nested.append(mtype.getImplementingClass())
                 continue
 
             if mfieldType == "enum":
@@ -114,14 +155,11 @@ class ProtoParser(object):
             cresultstr += "\t" + fields + "\n"
 
             if not self._is_base_type(mfieldType):
-                if "/" in mfieldType:
-                    if mfieldType.split("/")[1] in self.parsed_class:
-                        continue
-                if mfieldType in self.parsed_class:
-                    continue
-                subresult += self._parse_cls(self.dex_unit.getClass("L" + mfieldType + ";"))
+                nested.append(self.dex_unit.getClass("L" + mfieldType + ";"))
 
-        return cresultstr + "}\n\n" + subresult
+        result = (cresultstr + "}\n\n", nested)
+        self.messages[signature] = result
+        return result
 
     def _is_base_type(self, mtype):
         """检查是否为基本类型"""
@@ -135,156 +173,216 @@ class ProtoParser(object):
         if cls is None:
             raise Exception("Class is None")
 
+        signature = cls.getSignature(False)
+        cached = self.decoded.get(signature)
+        if cached is not None:
+            return cached
+
         methods = cls.getMethods()
         if methods is None:
             raise Exception("No methods found in class")
 
-        for method in methods:
-            if method is None:
-                continue
+        # 先扫描已知调用 newMessageInfo 的方法（通常是 dynamicMethod），找不到再回退到逐个扫描
+        sites = self._message_info_sites().get(signature, ())
+        candidates = [m for m in methods if m is not None and m.getIndex() in sites]
+        candidates += [m for m in methods if m is not None and m.getIndex() not in sites]
+
+        scanned = None
+        for method in candidates:
             if method.getName() == "<init>" or method.getName() == "<clinit>":
                 continue
+            scanned = self._scan_method(method)
+            if scanned is not None and len(scanned[0]) >= 2:
+                break
+        if scanned is None or len(scanned[0]) < 2:
+            raise Exception("Unexpected messageinfo!")
 
-            method_data = method.getData()
-            if method_data is None:
-                continue
-            codeItem = method_data.getCodeItem()
-
-            objs = {}
-            messageinfo = ""
-            objkeys = []
-            aputobjs = {}
-            constRegs = {}
-            constRegsComplete = False
-            if isinstance(codeItem, IDexCodeItem):
-                instructions = codeItem.getInstructions()
-                if instructions is None:
+        messageinfo, objs, objkeys, aputobjs = scanned
+        if len(objs) < 1:
+            result = ""
+        else:
+            if aputobjs:
+                objs = aputobjs
+                objkeys = sorted(aputobjs.keys())
+            result = PBMain.forJeb(self._to_unicode_escape(messageinfo), ''.join(objs[key] + "," for key in objkeys if key in objs))
+        self.decoded[signature] = result
+        return result
+
+    def _message_info_sites(self):
+        """
+        原始类签名 -> 调用 newMessageInfo 的方法索引集合，首次使用时扫描一遍字节码构建。
+        只依赖方法索引，重命名后仍然有效；newMessageInfo 被混淆时为空，解析回退到逐个扫描
+        """
+        if self.info_sites is not None:
+            return self.info_sites
+
+        targets = set()
+        for method in self.dex_unit.getMethods():
+            if method is not None and method.getName(False) == "newMessageInfo":
+                targets.add(method.getIndex())
+
+        sites = {}
+        if targets:
+            for method in self.dex_unit.getMethods():
+                if method is None or not method.isInternal():
                     continue
-                for firststr, ins in enumerate(instructions):
-                    if ins is None:
-                        continue
-                    if ins.getMnemonic() == "const/4":
-                        if not constRegsComplete:
-                            operand0 = ins.getOperand(0)
-                            operand1 = ins.getOperand(1)
-                            if operand0 is not None and operand1 is not None:
-                                constRegs[operand0.getValue()] = operand1.getValue()
+                instructions = method.getInstructions()
+                if not instructions:
+                    continue
+                for ins in instructions:
+                    if ins is None or not ins.getMnemonic().startswith("invoke-static"):
                         continue
-                    if "if-eq" == ins.getMnemonic():
-                        operand1 = ins.getOperand(1)
-                        if operand1 is not None:
-                            try:
-                                if constRegs.get(ins.getOperand(0).getValue(), 0) == 2:
-                                    constRegsComplete = True
-                                    continue
-                            except:
-                                continue
-                    if ins.getMnemonic() == "const-string":
+                    if self._invoked_index(ins) in targets:
+                        class_sig = method.getSignature(False).split("->")[0]
+                        sites.setdefault(class_sig, set()).add(method.getIndex())
                         break
-
-                if firststr == len(instructions) - 1:
-                    continue  # incorrect method!
-                objcomplete = False
-                while True:
-                    if firststr >= len(instructions):
-                        break
-                    ins = instructions[firststr]
-                    firststr += 1
-                    if ins is None:
-                        continue
-                    if ins.getMnemonic() == "const-string":
-                        string_index = ins.getOperand(1)
-                        if string_index is not None:
-                            string_obj = self.dex_unit.getString(string_index.getValue())
-                            if string_obj is not None:
-                                conststr = string_obj.getValue()
-                                if conststr is not None:
-                                    if "\x01" in conststr or "\x02" in conststr or "\x03" in conststr or "\x00" in conststr:
-                                        messageinfo = conststr
-                                    else:
-                                        if not objcomplete:
-                                            operand0 = ins.getOperand(0)
-                                            if operand0 is not None:
-                                                objs[operand0.getValue()] = conststr
-                        continue
-                    if ins.getMnemonic() == "const-class":
-                        if not objcomplete:
-                            type_index = ins.getOperand(1)
-                            if type_index is not None:
-                                type_obj = self.dex_unit.getType(type_index.getValue())
-                                if type_obj is not None and type_obj.getAddress() is not None:
-                                    address = type_obj.getAddress()
-                                    if len(address) > 2:  # Ensure valid address format
-                                        objs[ins.getOperand(0).getValue()] = address[1:-1]
-                        continue
-                    if "const/" in ins.getMnemonic():
+        self.info_sites = sites
+        return sites
+
+    def _invoked_index(self, ins):
+        for operand in ins.getOperands() or []:
+            if operand is not None and operand.getType() == IDalvikInstruction.TYPE_IDX:
+                return operand.getValue()
+        return None
+
+    def _scan_method(self, method):
+        """
+        在方法中查找 newMessageInfo 的参数模式（const/4、aput-object、const-string 等），
+        返回 (messageinfo, objs, objkeys, aputobjs)，不是目标方法时返回 None
+        """
+        method_data = method.getData()
+        if method_data is None:
+            return None
+        codeItem = method_data.getCodeItem()
+
+        objs = {}
+        messageinfo = ""
+        objkeys = []
+        aputobjs = {}
+        constRegs = {}
+        constRegsComplete = False
+        if isinstance(codeItem, IDexCodeItem):
+            instructions = codeItem.getInstructions()
+            if instructions is None:
+                return None
+            for firststr, ins in enumerate(instructions):
+                if ins is None:
+                    continue
+                if ins.getMnemonic() == "const/4":
+                    if not constRegsComplete:
                         operand0 = ins.getOperand(0)
                         operand1 = ins.getOperand(1)
                         if operand0 is not None and operand1 is not None:
-                            objs[operand0.getValue()] = operand1.getValue()
-                        continue
-                    if ins.getMnemonic() == "sget-object":
-                        if not objcomplete:
-                            operand0 = ins.getOperand(0)
-                            if operand0 is not None:
-                                objs[operand0.getValue()] = "enum.type"
-                        continue
-                    if "move-object" in ins.getMnemonic():
-                        if not objcomplete:
-                            operand0 = ins.getOperand(0)
-                            operand1 = ins.getOperand(1)
-                            if operand0 is not None and operand1 is not None:
-                                src_val = operand1.getValue()
-                                if src_val in objs:
-                                    objs[operand0.getValue()] = objs[src_val]
-                        continue
-                    if "filled-new-array" in ins.getMnemonic():
-                        if "range" in ins.getMnemonic():
-                            objkeys = sorted(objs.keys())
-                        else:
-                            operands = ins.getOperands()
-                            if operands:
-                                objkeys = [item.getValue() for item in operands[1:] if item is not None]
-                        objcomplete = True
-                        continue
-                    if "aput-object" == ins.getMnemonic():
-                        operand0 = ins.getOperand(0)
-                        operand2 = ins.getOperand(2)
-                        if operand0 is not None and operand2 is not None:
-                            key = operand2.getValue()
-                            if key in objs:
-                                key = objs[key]
-                            elif key in constRegs:
-                                key = constRegs[key]
-                            else:
+                            constRegs[operand0.getValue()] = operand1.getValue()
+                    continue
+                if "if-eq" == ins.getMnemonic():
+                    operand1 = ins.getOperand(1)
+                    if operand1 is not None:
+                        try:
+                            if constRegs.get(ins.getOperand(0).getValue(), 0) == 2:
+                                constRegsComplete = True
                                 continue
-                            src_val = operand0.getValue()
-                            if src_val in objs:
-                                aputobjs[key] = objs[src_val]
-                        continue
-                    if "move-result" in ins.getMnemonic():
+                        except:
+                            continue
+                if ins.getMnemonic() == "const-string":
+                    break
+
+            if firststr == len(instructions) - 1:
+                return None  # incorrect method!
+            objcomplete = False
+            while True:
+                if firststr >= len(instructions):
+                    break
+                ins = instructions[firststr]
+                firststr += 1
+                if ins is None:
+                    continue
+                if ins.getMnemonic() == "const-string":
+                    string_index = ins.getOperand(1)
+                    if string_index is not None:
+                        string_obj = self.dex_unit.getString(string_index.getValue())
+                        if string_obj is not None:
+                            conststr = string_obj.getValue()
+                            if conststr is not None:
+                                if "\x01" in conststr or "\x02" in conststr or "\x03" in conststr or "\x00" in conststr:
+                                    messageinfo = conststr
+                                else:
+                                    if not objcomplete:
+                                        operand0 = ins.getOperand(0)
+                                        if operand0 is not None:
+                                            objs[operand0.getValue()] = conststr
+                    continue
+                if ins.getMnemonic() == "const-class":
+                    if not objcomplete:
+                        type_index = ins.getOperand(1)
+                        if type_index is not None:
+                            type_obj = self.dex_unit.getType(type_index.getValue())
+                            if type_obj is not None and type_obj.getAddress() is not None:
+                                address = type_obj.getAddress()
+                                if len(address) > 2:  # Ensure valid address format
+                                    objs[ins.getOperand(0).getValue()] = address[1:-1]
+                    continue
+                if "const/" in ins.getMnemonic():
+                    operand0 = ins.getOperand(0)
+                    operand1 = ins.getOperand(1)
+                    if operand0 is not None and operand1 is not None:
+                        objs[operand0.getValue()] = operand1.getValue()
+                    continue
+                if ins.getMnemonic() == "sget-object":
+                    if not objcomplete:
                         operand0 = ins.getOperand(0)
                         if operand0 is not None:
                             objs[operand0.getValue()] = "enum.type"
-                        continue
-                    if firststr >= len(instructions) - 1:
-                        break
-                if len(messageinfo) < 2:
                     continue
-                else:
+                if "move-object" in ins.getMnemonic():
+                    if not objcomplete:
+                        operand0 = ins.getOperand(0)
+                        operand1 = ins.getOperand(1)
+                        if operand0 is not None and operand1 is not None:
+                            src_val = operand1.getValue()
+                            if src_val in objs:
+                                objs[operand0.getValue()] = objs[src_val]
+                    continue
+                if "filled-new-array" in ins.getMnemonic():
+                    if "range" in ins.getMnemonic():
+                        objkeys = sorted(objs.keys())
+                    else:
+                        operands = ins.getOperands()
+                        if operands:
+                            objkeys = [item.getValue() for item in operands[1:] if item is not None]
+                    objcomplete = True
+                    continue
+                if "aput-object" == ins.getMnemonic():
+                    operand0 = ins.getOperand(0)
+                    operand2 = ins.getOperand(2)
+                    if operand0 is not None and operand2 is not None:
+                        key = operand2.getValue()
+                        if key in objs:
+                            key = objs[key]
+                        elif key in constRegs:
+                            key = constRegs[key]
+                        else:
+                            continue
+                        src_val = operand0.getValue()
+                        if src_val in objs:
+                            aputobjs[key] = objs[src_val]
+                    continue
+                if "move-result" in ins.getMnemonic():
+                    operand0 = ins.getOperand(0)
+                    if operand0 is not None:
+                        objs[operand0.getValue()] = "enum.type"
+                    continue
+                if firststr >= len(instructions) - 1:
                     break
-        if len(messageinfo) < 2:
-            raise Exception("Unexpected messageinfo!")
-        if len(objs) < 1:
-            return ""
-        if aputobjs:
-            objs = aputobjs
-            objkeys = sorted(aputobjs.keys())
-        return PBMain.forJeb(self._to_unicode_escape(messageinfo), ''.join(objs[key] + "," for key in objkeys if key in objs))
+        return messageinfo, objs, objkeys, aputobjs
 
     def _to_unicode_escape(self, s):
         """转换为 Unicode 转义序列"""
-        return ''.join('\\u%04X' % ord(c) if ord(c) <= 0xFFFF else '\\u%08X' % ord(c) for c in s)
+        codes = [ord(c) for c in s]
+        if codes and max(codes) <= 0xFFFF:
+            # 常见情况：一次格式化整个字符串
+            return ('\\u%04X' * len(codes)) % tuple(codes)
+        return ''.join('\\u%04X' % c if c <= 0xFFFF else '\\u%08X' % c for c in codes)
 
 
 # 保持原有的 JEB 脚本接口以向后兼容
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""JSON-RPC 响应直通：插件把 result 放在响应末尾，服务端直接截取其原始 JSON，不做整体解析与重新序列化"""
+
+import json
+import re
+
+# 与插件 MCP.py 中 encode_result_response 的输出格式对应
+_RESULT_ENVELOPE = re.compile(
+    rb'\{"jsonrpc": "2\.0", "id": ("(?:[^"\\]|\\.)*"|null|-?\d+), "result_bytes": (\d+), "result": ')
+
+_WHITESPACE = b" \t\r\n"
+
+
+def splice_result(raw_data: bytes, request_id) -> str:
+    """
+    把响应中 result 的原始 JSON 拼成工具输出 '{"result": ...}'。
+
+    只检查信封（前缀中的版本号、id 和 result 字节数，result 之后紧跟的 '}'），不解析 result 本身；
+    插件保证 result 是 json.dumps 的输出，字节数对得上即说明响应完整（截断的响应不会被拼接）。
+    信封不符合预期（旧版插件、错误响应、截断）或 result 为 null 时返回 None，调用方回退到完整解析。
+    """
+    match = _RESULT_ENVELOPE.match(raw_data)
+    if match is None or json.loads(match.group(1)) != request_id:
+        return None
+    start = match.end()
+    end = start + int(match.group(2))
+    if end >= len(raw_data) or raw_data[end:end + 1] != b"}" or raw_data[end + 1:].strip(_WHITESPACE):
+        return None
+    body = raw_data[start:end]
+    if len(body) <= 8 and body.strip() in (b"", b"null"):
+        return None
+    try:
+        return '{"result": ' + body.decode("utf-8") + '}'
+    except UnicodeDecodeError:
+        return None
@@ -29,6 +29,22 @@ def convert_class_signature(class_name):
     else:
         return 'L' + class_name.replace('.', '/') + ';'
 
+def convert_package_prefix(package_name):
+    """
+    将包名转换为类签名前缀，以 '/' 结尾，保证只匹配该包及其子包
+    'com.example' -> 'Lcom/example/'（不会匹配 'Lcom/examples/...'）
+
+    Args:
+        package_name: 包名，可以是 'com.example'、'com/example/' 或 'Lcom/example;'
+
+    Returns:
+        类签名前缀，包名为空时返回 None
+    """
+    if not package_name:
+        return None
+    signature = convert_class_signature(package_name)
+    return signature[:-1].rstrip('/') + '/'
+
 def normalize_method_signature(method_signature):
     """
     标准化方法签名，确保格式正确
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+JSON-RPC 响应处理基准：完整解析 + 重新序列化 与 直通拼接（utils/rpc_response.py）对比
+
+无需 JEB，直接运行:
+    python test/bench_rpc_response.py
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from utils.rpc_response import splice_result  # noqa: E402
+
+REQUEST_ID = "5f0c6b52-9d7e-4d61-a1f4-0c1f2f5e8a90"
+ROUNDS = 5
+
+
+def _decompiled_class(size):
+    """模拟反编译出的大类：带缩进、引号和非 ASCII 字符串的 Java 文本"""
+    method = (
+        "    public void m%d(String s, int[] a) {\n"
+        "        if (s != null && a.length > %d) {\n"
+        "            Log.d(\"TAG\", \"value=\\\"\" + s + \"\\\" 长度\");\n"
+        "        }\n"
+        "    }\n\n"
+    )
+    parts, total, i = ["package com.example;\n\npublic class Big {\n"], 0, 0
+    while total < size:
+        chunk = method % (i, i)
+        parts.append(chunk)
+        total += len(chunk)
+        i += 1
+    parts.append("}\n")
+    return {"success": True, "decompiled_code": "".join(parts), "class_signature": "Lcom/example/Big;"}
+
+
+def _method_list(count):
+    """模拟 get_class_methods 一类的大量小记录"""
+    return {"success": True, "class_signature": "Lcom/example/Big;", "method_count": count, "methods": [
+        {"name": "m%d" % i, "signature": "Lcom/example/Big;->m%d(Ljava/lang/String;[I)V" % i,
+         "return_type": "V", "parameters": ["Ljava/lang/String;", "[I"],
+         "access_flags": {"value": 1, "flags": ["PUBLIC"]}}
+        for i in range(count)]}
+
+
+def _plugin_body(result):
+    """与插件 MCP.encode_result_response 相同的响应格式"""
+    body = json.dumps(result)
+    return ('{"jsonrpc": "2.0", "id": %s, "result_bytes": %d, "result": %s}'
+            % (json.dumps(REQUEST_ID), len(body), body)).encode("utf-8")
+
+
+def _reparse(raw_data):
+    """改动前 make_jsonrpc_request 的处理方式"""
+    data = json.loads(raw_data.decode("UTF-8"))
+    return json.dumps({"result": data.get("result")})
+
+
+def _best_of(func, raw_data):
+    best = None
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        func(raw_data)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    cases = [
+        ("decompiled class 1 MB", _decompiled_class(1 << 20)),
+        ("decompiled class 8 MB", _decompiled_class(8 << 20)),
+        ("method list 20k records", _method_list(20000)),
+    ]
+    print("%-26s %10s %12s %12s %8s" % ("payload", "size", "reparse ms", "splice ms", "speedup"))
+    for name, result in cases:
+        raw_data = _plugin_body(result)
+        spliced = splice_result(raw_data, REQUEST_ID)
+        assert spliced is not None and json.loads(spliced) == json.loads(_reparse(raw_data))
+        reparse = _best_of(_reparse, raw_data)
+        splice = _best_of(lambda data: splice_result(data, REQUEST_ID), raw_data)
+        print("%-26s %9.1fM %12.2f %12.2f %7.0fx" % (name, len(raw_data) / 1048576.0, reparse * 1000,
+                                                       splice * 1000, reparse / splice))
+
+
+if __name__ == "__main__":
+    main()
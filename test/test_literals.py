@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+数值常量解析与显示（utils/literals.py）及索引库常量查询单元测试，无需 JEB
+
+运行:
+    pytest test/test_literals.py -v
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from utils.index_store import IndexStore  # noqa: E402
+from utils.literals import constant_candidates, format_hex, parse_int  # noqa: E402
+
+# MD5/SHA-1 初始值中超出 32 位有符号范围的常量，JEB 按符号扩展给出
+SIGNED_CONSTANTS = {0xefcdab89: -0x10325477, 0x98badcfe: -0x67452302, 0xc3d2e1f0: -0x3c2d1e10}
+
+
+def test_parse_int():
+    assert parse_int("0xEFCDAB89") == 0xefcdab89
+    assert parse_int(" -0x10 ") == -16
+    assert parse_int("1732584193") == 0x67452301
+    assert parse_int("md5") is None
+    assert parse_int(True) is None
+
+
+def test_unsigned_query_includes_twos_complement():
+    for unsigned, signed in SIGNED_CONSTANTS.items():
+        assert constant_candidates(unsigned) == [unsigned, signed]
+    assert constant_candidates(0x67452301) == [0x67452301]
+    assert constant_candidates(0xffffffffffffffff) == [0xffffffffffffffff, -1]
+    assert constant_candidates(-5) == [-5]
+
+
+def test_format_hex_is_unsigned_for_width():
+    assert format_hex(-0x10325477) == "0xefcdab89"
+    assert format_hex(-1) == "0xffffffff"
+    assert format_hex(-1, 64) == "0xffffffffffffffff"
+    assert format_hex(0x67452301) == "0x67452301"
+    assert format_hex(-(1 << 40)) == "-0x10000000000"
+
+
+def test_index_store_matches_signed_constants():
+    directory = tempfile.mkdtemp()
+    store = IndexStore("a" * 64, directory)
+    store.replace_kind("constants", iter([[[signed, 7, 0x10] for signed in SIGNED_CONSTANTS.values()]]), "0", 0)
+    for unsigned, signed in SIGNED_CONSTANTS.items():
+        matches, total = store.search_literals(constant_candidates(unsigned), "constants")
+        assert total == 1
+        assert matches[0]["value"] == signed
+        assert matches[0]["references"][0]["offset"] == 0x10
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+返回字段投影（utils/projection.py）单元测试，无需 JEB
+
+运行:
+    pytest test/test_projection.py -v
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from utils.projection import normalize_fields, project, record_fields, select  # noqa: E402
+
+METHODS_RESULT = {
+    "success": True,
+    "class_signature": "Lcom/example/Main;",
+    "method_count": 2,
+    "methods": [
+        {"name": "a", "signature": "Lcom/example/Main;->a()V", "access_flags": {"value": 1, "flags": ["PUBLIC"]}},
+        {"name": "b", "signature": "Lcom/example/Main;->b(I)V", "access_flags": {"value": 8, "flags": ["STATIC"]}},
+    ],
+}
+
+
+def _get_class_methods(fields):
+    """按 get_class_methods 的方式构建记录，返回 (投影后的结果, 被调用的取值函数)"""
+    fields = normalize_fields(fields)
+    called = []
+
+    def getter(name, value):
+        def get():
+            called.append(name)
+            return value
+        return get
+
+    method_fields = record_fields(fields, "methods")
+    methods = [select((
+        ("name", getter("name", m["name"])),
+        ("signature", getter("signature", m["signature"])),
+        ("access_flags", getter("access_flags", m["access_flags"])),
+    ), method_fields) for m in METHODS_RESULT["methods"]]
+    result = {"success": True, "class_signature": METHODS_RESULT["class_signature"],
+              "method_count": len(methods), "methods": methods}
+    return project(result, fields), called
+
+
+class TestProjection:
+    """fields 投影"""
+
+    def test_no_fields(self):
+        assert project(METHODS_RESULT, None) == METHODS_RESULT
+        assert project(METHODS_RESULT, []) == METHODS_RESULT
+
+    def test_record_attribute(self):
+        result, called = _get_class_methods(["name"])
+        assert result == {"success": True, "methods": [{"name": "a"}, {"name": "b"}]}
+        assert set(called) == {"name"}
+
+    def test_container_key_returns_full_records(self):
+        result, called = _get_class_methods(["methods"])
+        assert result == {"success": True, "methods": METHODS_RESULT["methods"]}
+        assert set(called) == {"name", "signature", "access_flags"}
+
+    def test_top_level_key(self):
+        result, _ = _get_class_methods("method_count")
+        assert result == {"success": True, "method_count": 2}
+
+    def test_comma_separated_fields(self):
+        result, _ = _get_class_methods("name, signature")
+        assert result["methods"][0] == {"name": "a", "signature": "Lcom/example/Main;->a()V"}
+
+    def test_errors_and_paging_kept(self):
+        result = {"success": False, "error": "Class not found", "total": 3, "has_more": False, "other": 1}
+        assert project(result, ["name"]) == {"success": False, "error": "Class not found", "total": 3,
+                                             "has_more": False}
+
+    def test_nested_dicts(self):
+        result = {"success": True, "kinds": {"calls": {"rows": 1, "rename_state": "x"}}, "path": "p"}
+        assert project(result, ["rows"]) == {"success": True, "kinds": {"calls": {"rows": 1}}}
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+JSON-RPC 响应直通（utils/rpc_response.py）单元测试，无需 JEB
+
+运行:
+    pytest test/test_rpc_response.py -v
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from utils.rpc_response import splice_result  # noqa: E402
+
+REQUEST_ID = "5f0c6b52-9d7e-4d61-a1f4-0c1f2f5e8a90"
+
+
+def _plugin_body(result, request_id=REQUEST_ID):
+    """与插件 MCP.encode_result_response 相同的响应格式"""
+    body = json.dumps(result)
+    return ('{"jsonrpc": "2.0", "id": %s, "result_bytes": %d, "result": %s}'
+            % (json.dumps(request_id), len(body), body)).encode("utf-8")
+
+
+def test_splice_success():
+    result = {"success": True, "decompiled_code": "class A {\n    String s = \"}\";\n}\n", "nested": {"a": [1, {}]}}
+    spliced = splice_result(_plugin_body(result), REQUEST_ID)
+    assert json.loads(spliced) == {"result": result}
+
+
+def test_splice_non_ascii_and_list_result():
+    result = [{"name": "长度"}, "é"]
+    spliced = splice_result(_plugin_body(result), REQUEST_ID)
+    assert json.loads(spliced) == {"result": result}
+
+
+def test_splice_trailing_whitespace():
+    raw = _plugin_body({"a": 1}) + b"\r\n"
+    assert json.loads(splice_result(raw, REQUEST_ID)) == {"result": {"a": 1}}
+
+
+def test_error_response_falls_back():
+    raw = json.dumps({"jsonrpc": "2.0", "id": REQUEST_ID,
+                      "error": {"code": -32601, "message": "Method not found"}}).encode("utf-8")
+    assert splice_result(raw, REQUEST_ID) is None
+
+
+def test_null_result_falls_back():
+    assert splice_result(_plugin_body(None), REQUEST_ID) is None
+
+
+def test_id_mismatch_falls_back():
+    assert splice_result(_plugin_body({"a": 1}, "other-id"), REQUEST_ID) is None
+    assert splice_result(_plugin_body({"a": 1}, None), REQUEST_ID) is None
+
+
+def test_old_plugin_format_falls_back():
+    raw = ('{"jsonrpc": "2.0", "id": %s, "result": {"a": 1}}' % json.dumps(REQUEST_ID)).encode("utf-8")
+    assert splice_result(raw, REQUEST_ID) is None
+
+
+def test_truncated_response_falls_back():
+    raw = _plugin_body({"a": {"b": 1}, "c": [1, 2]})
+    # 每个截断位置都不能拼出结果，包括恰好停在内层 '}' 之后的情况
+    for cut in range(len(raw)):
+        assert splice_result(raw[:cut], REQUEST_ID) is None
+
+
+def test_trailing_garbage_falls_back():
+    assert splice_result(_plugin_body({"a": 1}) + b"}", REQUEST_ID) is None
+    assert splice_result(_plugin_body({"a": 1})[:-1] + b"]", REQUEST_ID) is None
@@ -21,8 +21,8 @@ JEB_PORT = 16161
 JEB_PATH = "/mcp"
 
 
-def send_jsonrpc_request(method: str, params: dict = None) -> dict:
-    """发送 JSON-RPC 请求到 JEB 插件"""
+def send_jsonrpc_request(method: str, params: dict = None, fields: list = None) -> dict:
+    """发送 JSON-RPC 请求到 JEB 插件，fields 为返回属性投影"""
     url = f"http://{JEB_HOST}:{JEB_PORT}{JEB_PATH}"
     payload = {
         "jsonrpc": "2.0",
@@ -30,6 +30,8 @@ def send_jsonrpc_request(method: str, params: dict = None) -> dict:
         "params": params or {},
         "id": 1
     }
+    if fields:
+        payload["fields"] = fields
 
     data = json.dumps(payload).encode("utf-8")
     req = urllib.request.Request(
@@ -95,6 +97,20 @@ class TestCodeRetrieval:
         print(f"get_class_decompiled_code 响应: {result}")
         assert "result" in result or "error" in result
 
+    def test_get_methods_decompiled_code(self):
+        """从同一次类反编译中批量获取方法代码"""
+        result = send_jsonrpc_request("get_methods_decompiled_code", [
+            "Landroid/app/Activity;", ["onCreate", "Landroid/app/Activity;->finish()V"]
+        ])
+        print(f"get_methods_decompiled_code 响应: {result}")
+        assert "result" in result or "error" in result
+
+    def test_get_decompile_cache_stats(self):
+        """获取反编译磁盘缓存统计"""
+        result = send_jsonrpc_request("get_decompile_cache_stats")
+        print(f"get_decompile_cache_stats 响应: {result}")
+        assert "result" in result or "error" in result
+
     def test_get_current_app_manifest(self):
         """获取 AndroidManifest.xml"""
         result = send_jsonrpc_request("get_current_app_manifest")
@@ -117,6 +133,54 @@ class TestClassAnalysis:
         print(f"get_class_by_index 响应: {result}")
         assert "result" in result or "error" in result
 
+    def test_list_classes(self):
+        """分页列出类，使用游标翻页"""
+        result = send_jsonrpc_request("list_classes", {"limit": 10, "sort": "original"})
+        print(f"list_classes 响应: {result}")
+        assert "result" in result or "error" in result
+        cursor = (result.get("result") or {}).get("next_cursor")
+        if cursor:
+            result = send_jsonrpc_request("list_classes", {"limit": 10, "sort": "original", "cursor": cursor})
+            print(f"list_classes 第二页: {result}")
+            assert "result" in result or "error" in result
+
+    def test_list_packages(self):
+        """列出包层次结构"""
+        result = send_jsonrpc_request("list_packages", {"prefix": "", "depth": 2})
+        print(f"list_packages 响应: {result}")
+        assert "result" in result or "error" in result
+
+    def test_bulk_rename_dry_run(self):
+        """批量重命名预检查（不修改名称）"""
+        result = send_jsonrpc_request("bulk_rename", {
+            "entries": [
+                {"kind": "class", "class_signature": "Landroid/app/Activity;", "new_name": "Activity"},
+                {"kind": "method", "class_signature": "Landroid/app/Activity;", "name": "onCreate", "new_name": "onCreate"},
+            ],
+            "dry_run": True
+        })
+        print(f"bulk_rename 响应: {result}")
+        assert "result" in result or "error" in result
+
+    def test_replay_rename_journal(self):
+        """重放当前 APK 的重命名日志"""
+        result = send_jsonrpc_request("replay_rename_journal")
+        print(f"replay_rename_journal 响应: {result}")
+        assert "result" in result or "error" in result
+
+    def test_transfer_renames_dry_run(self):
+        """跨版本重命名迁移（仅预览）"""
+        ids = (send_jsonrpc_request("get_live_artifact_ids").get("result") or {}).get("artifact_ids") or []
+        if len(ids) < 2:
+            return
+        result = send_jsonrpc_request("transfer_renames", {
+            "source_artifact_id": ids[0],
+            "target_artifact_id": ids[1],
+            "dry_run": True
+        })
+        print(f"transfer_renames 响应: {result}")
+        assert "result" in result or "error" in result
+
     def test_find_class(self):
         """查找类"""
         result = send_jsonrpc_request("find_class", {
@@ -125,6 +189,212 @@ class TestClassAnalysis:
         print(f"find_class 响应: {result}")
         assert "result" in result or "error" in result
 
+    def test_get_class_outline(self):
+        """不反编译获取类概要"""
+        result = send_jsonrpc_request("get_class_outline", {
+            "class_signature": "Landroid/app/Activity;"
+        })
+        print(f"get_class_outline 响应: {result}")
+        assert "result" in result or "error" in result
+
+    def test_get_class_outlines(self):
+        """批量获取类概要"""
+        result = send_jsonrpc_request("get_class_outlines", [
+            ["Landroid/app/Activity;", "Landroid/app/Application;"]
+        ])
+        print(f"get_class_outlines 响应: {result}")
+        assert "result" in result or "error" in result
+
+    def test_get_class_methods_projected(self):
+        """只返回方法名和签名"""
+        result = send_jsonrpc_request("get_class_methods", ["Landroid/app/Activity;"],
+                                      fields=["name", "signature"])
+        print(f"get_class_methods(fields) 响应: {result}")
+        assert "result" in result or "error" in result
+        if isinstance(result.get("result"), dict) and result["result"].get("success"):
+            assert set(result["result"]) == {"success", "methods"}
+            assert all(set(m) == {"name", "signature"} for m in result["result"]["methods"])
+
+    def test_get_class_methods_container_projected(self):
+        """请求容器键 methods 时返回完整的方法记录"""
+        result = send_jsonrpc_request("get_class_methods", ["Landroid/app/Activity;"], fields=["methods"])
+        print(f"get_class_methods(fields=methods) 响应: {result}")
+        assert "result" in result or "error" in result
+        if isinstance(result.get("result"), dict) and result["result"].get("success"):
+            methods = result["result"]["methods"]
+            assert methods and all(
+                set(m) == {"name", "signature", "return_type", "parameters", "access_flags"} for m in methods)
+
+    def test_get_method_smali_structured(self):
+        """获取结构化 smali 指令（指定范围）"""
+        result = send_jsonrpc_request("get_method_smali",
+                                      ["Landroid/app/Activity;", "onCreate", True, 0, 50])
+        print(f"get_method_smali(structured) 响应: {result}")
+        assert "result" in result or "error" in result
+
+
+class TestIndexSearch:
+    """索引检索测试"""
+
+    def test_search_strings(self):
+        """按子串检索字符串常量"""
+        result = send_jsonrpc_request("search_strings", ["http", False, 0, 20])
+        print(f"search_strings 响应: {result}")
+        assert "result" in result or "error" in result
+
+    def test_search_strings_regex(self):
+        """按正则检索字符串常量"""
+        result = send_jsonrpc_request("search_strings", [r"https?://", True, 0, 20])
+        print(f"search_strings(regex) 响应: {result}")
+        assert "result" in result or "error" in result
+
+    def test_search_constants(self):
+        """检索数值常量"""
+        result = send_jsonrpc_request("search_constants", ["0x67452301", False, 0, 20])
+        print(f"search_constants 响应: {result}")
+        assert "result" in result or "error" in result
+
+    def test_export_index_rows(self):
+        """导出索引行，供服务端持久化索引库使用"""
+        result = send_jsonrpc_request("get_index_info")
+        print(f"get_index_info 响应: {result}")
+        assert "result" in result or "error" in result
+        result = send_jsonrpc_request("export_index_rows", ["methods", 0, 100])
+        print(f"export_index_rows 响应: {result}")
+        assert "result" in result or "error" in result
+
+    def test_detect_libraries(self):
+        """第三方库识别，并在检索时跳过库代码"""
+        result = send_jsonrpc_request("detect_libraries", {"min_ratio": 0.5, "limit": 20})
+        print(f"detect_libraries 响应: {result}")
+        assert "result" in result or "error" in result
+        result = send_jsonrpc_request("search_strings", {"query": "http", "limit": 20, "skip_libraries": True})
+        print(f"search_strings(skip_libraries) 响应: {result}")
+        assert "result" in result or "error" in result
+
+
+class TestCallGraph:
+    """调用图测试"""
+
+    def test_get_method_callers(self):
+        """获取方法调用者"""
+        result = send_jsonrpc_request("get_method_callers", ["Landroid/app/Activity;", "onCreate"])
+        print(f"get_method_callers 响应: {result}")
+        assert "result" in result or "error" in result
+
+    def test_get_method_callees(self):
+        """获取方法调用的目标"""
+        result = send_jsonrpc_request("get_method_callees", ["Landroid/app/Activity;", "onCreate"])
+        print(f"get_method_callees 响应: {result}")
+        assert "result" in result or "error" in result
+
+    def test_get_transitive_calls(self):
+        """获取传递调用者"""
+        result = send_jsonrpc_request("get_transitive_calls",
+                                      ["Landroid/app/Activity;", "onCreate", "callers", 3, 100])
+        print(f"get_transitive_calls 响应: {result}")
+        assert "result" in result or "error" in result
+
+    def test_find_call_paths(self):
+        """查找两个方法之间的调用路径"""
+        result = send_jsonrpc_request("find_call_paths", [
+            "Landroid/app/Activity;->onCreate(Landroid/os/Bundle;)V",
+            "Landroid/app/Activity;->setContentView(I)V",
+            6, 10
+        ])
+        print(f"find_call_paths 响应: {result}")
+        assert "result" in result or "error" in result
+
+
+
+class TestReachability:
+    """入口可达性测试"""
+
+    def test_compute_reachability(self):
+        """计算入口可达的方法和类"""
+        result = send_jsonrpc_request("compute_reachability", [False])
+        print(f"compute_reachability 响应: {result}")
+        assert "result" in result or "error" in result
+
+    def test_get_reachable_classes(self):
+        """分页列出可达类"""
+        result = send_jsonrpc_request("get_reachable_classes", ["", 0, 20])
+        print(f"get_reachable_classes 响应: {result}")
+        assert "result" in result or "error" in result
+
+    def test_search_strings_reachable_only(self):
+        """只在可达方法中检索字符串"""
+        result = send_jsonrpc_request("search_strings", ["http", False, 0, 20, True])
+        print(f"search_strings(reachable_only) 响应: {result}")
+        assert "result" in result or "error" in result
+
+
+class TestFieldAccess:
+    """字段读写索引测试"""
+
+    def test_get_field_accesses(self):
+        """批量查询字段读写位置"""
+        result = send_jsonrpc_request("get_field_accesses", [
+            ["Landroid/app/Activity;->mTitle", "Landroid/app/Activity;->mFinished:Z"], "both"
+        ])
+        print(f"get_field_accesses 响应: {result}")
+        assert "result" in result or "error" in result
+
+    def test_get_field_writers(self):
+        """只查询字段写入位置"""
+        result = send_jsonrpc_request("get_field_accesses", ["Landroid/app/Activity;->mTitle", "write"])
+        print(f"get_field_accesses(write) 响应: {result}")
+        assert "result" in result or "error" in result
+
+
+class TestTypeHierarchy:
+    """类型层次索引测试"""
+
+    def test_get_class_subtypes(self):
+        """获取接口的所有实现类"""
+        result = send_jsonrpc_request("get_class_subtypes", ["Ljava/lang/Runnable;", True, 0, 50])
+        print(f"get_class_subtypes 响应: {result}")
+        assert "result" in result or "error" in result
+
+    def test_get_class_supertypes(self):
+        """获取类的所有父类型"""
+        result = send_jsonrpc_request("get_class_supertypes", ["Landroid/app/Activity;"])
+        print(f"get_class_supertypes 响应: {result}")
+        assert "result" in result or "error" in result
+
+    def test_get_method_overrides(self):
+        """获取方法的覆写关系"""
+        result = send_jsonrpc_request("get_method_overrides", ["Ljava/lang/Runnable;->run()V"])
+        print(f"get_method_overrides 响应: {result}")
+        assert "result" in result or "error" in result
+
+    def test_find_similar_methods(self):
+        """查找结构相似的方法"""
+        result = send_jsonrpc_request("find_similar_methods", ["Lcom/example/Util;->decrypt", 0.7, 20])
+        print(f"find_similar_methods 响应: {result}")
+        assert "result" in result or "error" in result
+
+
+class TestJobs:
+    """后台任务测试"""
+
+    def test_export_sources(self):
+        """启动源码导出任务"""
+        result = send_jsonrpc_request("export_sources", ["/tmp/jebmcp_export", "com.example", False, 2, 60, True])
+        print(f"export_sources 响应: {result}")
+        assert "result" in result or "error" in result
+
+    def test_get_job_status(self):
+        """获取所有任务状态"""
+        result = send_jsonrpc_request("get_job_status", [""])
+        print(f"get_job_status 响应: {result}")
+        assert "result" in result or "error" in result
+
+    def test_extract_all_protos(self):
+        """启动 protobuf 批量提取任务"""
+        result = send_jsonrpc_request("extract_all_protos", ["/tmp/jebmcp_protos"])
+        print(f"extract_all_protos 响应: {result}")
+        assert "result" in result or "error" in result
 
 def run_all_tests():
     """运行所有测试"""
@@ -133,6 +403,12 @@ def run_all_tests():
         TestProjectOperations,
         TestCodeRetrieval,
         TestClassAnalysis,
+        TestIndexSearch,
+        TestCallGraph,
+        TestReachability,
+        TestFieldAccess,
+        TestTypeHierarchy,
+        TestJobs,
     ]
 
     for test_class in test_classes: